@@ -1,6 +1,16 @@
-from src.app import OpenWhisperApp
+import multiprocessing
+import sys
 
 if __name__ == "__main__":
+    # Necessaire pour les processus de transcription dans l'executable PyInstaller
+    multiprocessing.freeze_support()
+
+    if "--server" in sys.argv[1:]:
+        # Serveur de transcription local, sans icone ni hotkey
+        from src.server import main as server_main
+        sys.exit(server_main(sys.argv[1:]))
+
+    from src.app import OpenWhisperApp
     app = OpenWhisperApp()
     app.create_tray_icon()
     app.run()
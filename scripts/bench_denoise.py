@@ -0,0 +1,91 @@
+"""
+bench_denoise.py - Effet de la reduction de bruit sur le decodage
+
+Transcrit chaque fichier WAV sans puis avec le gate spectral et compare la
+duree de decodage, la part d'audio conservee par la VAD de faster-whisper
+et le texte obtenu. --noise ajoute un bruit de ventilation synthetique
+(bruit rose filtre) au rapport signal/bruit donne, en dB.
+
+Utilisation (depuis la racine du projet) :
+    python scripts/bench_denoise.py enregistrement.wav [--model base] [--noise 10]
+"""
+import argparse
+import os
+import sys
+import wave
+
+import numpy as np
+
+# Se placer a la racine du projet
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.config import SAMPLE_RATE  # noqa: E402
+from src.denoise import SpectralGate  # noqa: E402
+from src.resampler import StreamingResampler, downmix  # noqa: E402
+from src.settings import Settings  # noqa: E402
+from src.transcriber import Transcriber  # noqa: E402
+
+
+def load_wav(path: str) -> np.ndarray:
+    """WAV PCM 16 bits -> float32 mono 16 kHz"""
+    with wave.open(path, "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"{path}: seul le PCM 16 bits est supporte")
+        frames = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+        audio = downmix(frames.reshape(-1, wav.getnchannels()))
+        rate = wav.getframerate()
+    if rate != SAMPLE_RATE:
+        resampler = StreamingResampler(rate, SAMPLE_RATE)
+        audio = np.concatenate((resampler.process(audio), resampler.flush()))
+    return audio
+
+
+def fan_noise(length: int, snr_db: float, reference: np.ndarray) -> np.ndarray:
+    """Bruit rose passe-bas (ventilation) au rapport signal/bruit demande"""
+    rng = np.random.default_rng(0)
+    spectrum = np.fft.rfft(rng.standard_normal(length))
+    freqs = np.fft.rfftfreq(length, 1 / SAMPLE_RATE)
+    spectrum /= np.sqrt(np.maximum(freqs, 20.0))
+    spectrum[freqs > 4000] *= 0.1
+    noise = np.fft.irfft(spectrum, length).astype(np.float32)
+    signal_power = np.mean(reference ** 2)
+    noise *= np.sqrt(signal_power / (np.mean(noise ** 2) * 10 ** (snr_db / 10)))
+    return noise
+
+
+def run(transcriber: Transcriber, audio: np.ndarray, label: str):
+    text = " ".join(transcriber.iter_segments(audio)).strip()
+    duration, elapsed, vad_ratio = transcriber.last_stats
+    kept = f"{vad_ratio * 100:5.1f}%" if vad_ratio is not None else "  n/a"
+    print(f"  {label:<12} decodage {elapsed:6.2f}s  VAD conservee {kept}  | {text[:80]}")
+    return elapsed, vad_ratio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--model", default="base")
+    parser.add_argument("--noise", type=float, default=None, help="SNR du bruit ajoute (dB)")
+    args = parser.parse_args()
+
+    settings = Settings()
+    settings.set("whisper_model", args.model)
+    transcriber = Transcriber(settings)
+    gate = SpectralGate()
+
+    for path in args.files:
+        audio = load_wav(path)
+        if args.noise is not None:
+            audio = audio + fan_noise(len(audio), args.noise, audio)
+        print(f"{path} ({len(audio) / SAMPLE_RATE:.1f}s)")
+        raw_time, raw_vad = run(transcriber, audio, "brut")
+        clean_time, clean_vad = run(transcriber, gate.process(audio), "debruite")
+        delta_vad = ""
+        if raw_vad is not None and clean_vad is not None:
+            delta_vad = f", VAD conservee {(clean_vad - raw_vad) * 100:+.1f} pts"
+        print(f"  delta: decodage {clean_time - raw_time:+.2f}s{delta_vad}")
+
+
+if __name__ == "__main__":
+    main()
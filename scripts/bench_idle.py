@@ -0,0 +1,129 @@
+"""
+bench_idle.py - Reveils au repos et latence "modele pret" : sondage vs evenements
+
+Reproduit les deux boucles de l'ancienne application (thread principal en
+time.sleep(0.1), chargement qui sonde is_ready() toutes les 100 ms) et les
+compare a la boucle d'evenements. Mesure, pour chacune :
+  - les reveils du processus au repos (changements de contexte volontaires,
+    Linux : /proc/self/status, sinon psutil si installe) ;
+  - le delai entre la fin du chargement et sa prise en compte.
+
+Utilisation (depuis la racine du projet) :
+    python scripts/bench_idle.py [secondes_repos] [chargements]
+"""
+import os
+import sys
+import threading
+import time
+
+# Se placer a la racine du projet
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.event_loop import EventLoop, MODEL_READY, QUIT  # noqa: E402
+
+POLL_INTERVAL = 0.1  # Periode des anciennes boucles
+
+
+def context_switches():
+    """Changements de contexte volontaires du processus (None si non mesurable)"""
+    try:
+        total = 0
+        for task in os.listdir("/proc/self/task"):
+            with open(f"/proc/self/task/{task}/status") as f:
+                for line in f:
+                    if line.startswith("voluntary_ctxt_switches"):
+                        total += int(line.split()[1])
+        return total
+    except OSError:
+        pass
+    try:
+        import psutil
+        return psutil.Process().num_ctx_switches().voluntary
+    except Exception:
+        return None
+
+
+class _TimedEvent(threading.Event):
+    """Evenement horodate au moment de set() (fin simulee du chargement)"""
+
+    set_at = None
+
+    def set(self):
+        self.set_at = time.perf_counter()
+        super().set()
+
+
+def idle_polling(seconds: float) -> int:
+    """Ancien thread principal : while is_running: time.sleep(0.1)"""
+    stop = time.perf_counter() + seconds
+    wakeups = 0
+    while time.perf_counter() < stop:
+        time.sleep(POLL_INTERVAL)
+        wakeups += 1
+    return wakeups
+
+
+def idle_events(seconds: float) -> int:
+    """Boucle d'evenements sans evenement : bloquee sur la file"""
+    loop = EventLoop()
+    threading.Timer(seconds, loop.post, args=(QUIT,)).start()
+    loop.run()
+    return loop.stats()["idle_wakeups"]
+
+
+def ready_polling(load_time: float) -> float:
+    """Ancien _loading_loop : is_ready() verifie toutes les 100 ms"""
+    ready = _TimedEvent()
+    threading.Timer(load_time, ready.set).start()
+    while True:
+        time.sleep(POLL_INTERVAL)
+        if ready.is_set():
+            return time.perf_counter() - ready.set_at
+
+
+def ready_events(load_time: float) -> float:
+    """Thread bloque sur l'evenement du modele, MODEL_READY poste a la boucle"""
+    ready = _TimedEvent()
+    loop = EventLoop()
+    result = []
+
+    def on_ready():
+        result.append(time.perf_counter() - ready.set_at)
+        loop.post(QUIT)
+
+    def wait_ready():
+        ready.wait()
+        loop.post(MODEL_READY)
+
+    loop.on(MODEL_READY, on_ready)
+    threading.Thread(target=wait_ready, daemon=True).start()
+    threading.Timer(load_time, ready.set).start()
+    loop.run()
+    return result[0]
+
+
+def measure_idle(name: str, run, seconds: float):
+    before = context_switches()
+    wakeups = run(seconds)
+    after = context_switches()
+    switches = f", {(after - before) / seconds:6.1f} changements de contexte/s" if before is not None else ""
+    print(f"  {name:<12} {wakeups / seconds:6.1f} reveils/s{switches}")
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    loads = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    print(f"Repos pendant {seconds:.0f}s :")
+    measure_idle("sondage", idle_polling, seconds)
+    measure_idle("evenements", idle_events, seconds)
+
+    print(f"Delai de prise en compte du modele pret ({loads} chargements) :")
+    for name, run in (("sondage", ready_polling), ("evenements", ready_events)):
+        delays = [run(0.05 + 0.037 * i) * 1000 for i in range(loads)]
+        print(f"  {name:<12} moy {sum(delays) / loads:7.2f} ms, max {max(delays):7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
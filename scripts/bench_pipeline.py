@@ -0,0 +1,83 @@
+"""
+bench_pipeline.py - Chaine complete sans micro : capture -> VAD -> transcription
+
+Rejoue une source audio (fichier, stdin ou generateur) dans AudioRecorder
+comme le ferait le micro, puis transcrit le resultat avec le Transcriber de
+l'application. Aucune injection de texte : utilisable sur une machine sans
+peripherique audio ni affichage (integration continue, tests de charge).
+
+Utilisation (depuis la racine du projet) :
+    python scripts/bench_pipeline.py file-fast:dictee.wav [--model base] [--runs 5]
+    python scripts/bench_pipeline.py synthetic:speech --seconds 10
+    arecord -f S16_LE -r 16000 -c 1 | python scripts/bench_pipeline.py stdin --seconds 5
+"""
+import argparse
+import os
+import sys
+import time
+
+# Se placer a la racine du projet
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.audio_recorder import AudioRecorder  # noqa: E402
+from src.audio_sources import FileSource, create_source  # noqa: E402
+from src.config import SAMPLE_RATE  # noqa: E402
+from src.settings import Settings  # noqa: E402
+from src.transcriber import Transcriber  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("source", help="device, file:..., file-fast:..., stdin, synthetic:...")
+    parser.add_argument("--model", default="base")
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--seconds", type=float, default=None,
+                        help="Duree d'enregistrement (par defaut : jusqu'a la fin de la source)")
+    parser.add_argument("--vad", default="energy", choices=("off", "energy", "silero"))
+    args = parser.parse_args()
+
+    source = create_source(args.source)
+    if args.seconds is None and not source.finite:
+        parser.error("--seconds est requis pour une source sans fin")
+
+    settings = Settings()
+    settings.set("whisper_model", args.model)
+    transcriber = Transcriber(settings)
+    recorder = AudioRecorder(source=source, vad_mode=args.vad, spill_threshold=0)
+    while not transcriber.is_ready():
+        time.sleep(0.1)
+    if transcriber.has_error():
+        print(f"[!] Modele non disponible: {transcriber.get_error()}")
+        return 1
+
+    totals = []
+    for run in range(1, args.runs + 1):
+        if isinstance(source, FileSource):
+            source.rewind()
+        source.finished.clear()
+
+        start = time.perf_counter()
+        if not recorder.start():
+            return 1
+        source.finished.wait(args.seconds)
+        captured = time.perf_counter()
+        audio = recorder.stop()
+        stopped = time.perf_counter()
+
+        text = " ".join(transcriber.iter_segments(audio)) if audio is not None else ""
+        done = time.perf_counter()
+
+        seconds = len(audio) / SAMPLE_RATE if audio is not None else 0.0
+        totals.append(done - stopped)
+        print(f"[{run}/{args.runs}] capture {captured - start:.2f}s, arret {(stopped - captured) * 1000:.0f} ms, "
+              f"{seconds:.1f}s transcrites en {done - stopped:.2f}s | {text.strip()[:80]}")
+
+    if len(totals) > 1:
+        totals.sort()
+        print(f"Arret -> texte : median {totals[len(totals) // 2]:.2f}s, max {totals[-1]:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""
+bench_resample.py - Cout du downmix + reechantillonnage en flux
+
+Simule un peripherique qui livre des blocs au taux natif et mesure le temps
+passe par seconde d'audio (doit rester une petite fraction du temps reel).
+
+Utilisation (depuis la racine du projet) :
+    python scripts/bench_resample.py [secondes] [taille_bloc]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+# Se placer a la racine du projet
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.config import SAMPLE_RATE  # noqa: E402
+from src.resampler import StreamingResampler, downmix  # noqa: E402
+
+FORMATS = [(48000, 1), (48000, 2), (44100, 2), (96000, 2), (16000, 1)]
+
+
+def bench(rate: int, channels: int, seconds: float, blocksize: int) -> float:
+    rng = np.random.default_rng(0)
+    audio = (rng.standard_normal((int(rate * seconds), channels)) * 0.1).astype(np.float32)
+    resampler = StreamingResampler(rate, SAMPLE_RATE)
+
+    produced = 0
+    start = time.perf_counter()
+    for i in range(0, len(audio), blocksize):
+        produced += len(resampler.process(downmix(audio[i:i + blocksize])))
+    produced += len(resampler.flush())
+    elapsed = time.perf_counter() - start
+
+    expected = int(seconds * SAMPLE_RATE)
+    ratio = elapsed / seconds
+    print(f"  {rate:>6} Hz x{channels}  {elapsed * 1000:8.1f} ms  "
+          f"{ratio * 100:6.2f}% du temps reel  ({produced}/{expected} echantillons)")
+    return ratio
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 60.0
+    blocksize = int(sys.argv[2]) if len(sys.argv) > 2 else 1024
+    print(f"Reechantillonnage -> {SAMPLE_RATE} Hz, {seconds:.0f}s d'audio, blocs de {blocksize}")
+    worst = max(bench(rate, channels, seconds, blocksize) for rate, channels in FORMATS)
+    print(f"Pire cas: {worst * 100:.2f}% du temps reel")
+
+
+if __name__ == "__main__":
+    main()
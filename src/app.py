@@ -9,9 +9,17 @@ import webbrowser
 import pystray
 from PIL import Image, ImageDraw, ImageEnhance
 from src.audio_recorder import AudioRecorder
+from src.audio_sources import create_source
+from src.denoise import SpectralGate, DenoiseReport
+from src.event_loop import (
+    AppState, EventLoop, TOGGLE, MODEL_READY, MODEL_WAIT, TRANSCRIPTION_DONE, SETTINGS_SAVED, QUIT,
+)
 from src.transcriber import Transcriber
+from src.transcriber_process import TranscriberProcess
+from src.server import ServerClient
+from src.transcription_queue import TranscriptionQueue
 from src.text_injector import TextInjector
-from src.config import MIN_RECORDING_DURATION
+from src.config import MIN_RECORDING_DURATION, EVENT_IDLE_TIMEOUT_WINDOWS
 from src.settings import Settings
 from src.version import VERSION, GITHUB_REPO
 from src.updater import UpdateChecker
@@ -29,18 +37,45 @@ class OpenWhisperApp:
         # Settings persistants
         self.settings = Settings()
 
-        self.recorder = AudioRecorder()
-        self.transcriber = Transcriber(self.settings)
+        self.recorder = AudioRecorder(
+            storage=self.settings.audio_storage,
+            spill_threshold=self.settings.spill_threshold,
+            native_capture=self.settings.native_capture,
+            vad_mode=self.settings.vad_mode,
+            blocksize=self.settings.audio_blocksize,
+            latency=self.settings.audio_latency,
+            dtype=self.settings.capture_dtype,
+            source=self._create_audio_source()
+        )
+        if self.settings.server_client:
+            self.transcriber = ServerClient(self.settings.server_address)
+        elif self.settings.transcriber_process:
+            self.transcriber = TranscriberProcess(self.settings)
+        else:
+            self.transcriber = Transcriber(self.settings)
         self.injector = TextInjector()
-        self.is_running = True
-        self.is_recording = False
-        self.is_transcribing = False
-        self.is_model_loading = True
+        self.denoiser = SpectralGate()
+        self.denoise_report = DenoiseReport()
+        self.transcription_queue = TranscriptionQueue(self._process_job)
         self.record_start_time = None
+        self._stream = None  # Session de transcription continue (si activee)
         self._toggle_cooldown = 0
         self._spinner_frame = 0
-        self._spinner_thread = None
-        self._loading_thread = None
+
+        # Etat et transitions : uniquement sur le thread de la boucle d'evenements
+        self.state = AppState()
+        self._model_waiters = []  # Dictees en attente du modele, liberees par MODEL_READY
+        self.events = EventLoop(
+            animated=lambda: self.state.animated,
+            on_tick=self._animate,
+            # Sous Windows, Ctrl+C n'interrompt pas une attente sans delai
+            idle_timeout=EVENT_IDLE_TIMEOUT_WINDOWS if IS_WINDOWS else None
+        )
+        self.events.on(TOGGLE, self._on_toggle)
+        self.events.on(MODEL_READY, self._on_model_ready)
+        self.events.on(MODEL_WAIT, self._on_model_wait)
+        self.events.on(TRANSCRIPTION_DONE, self._on_transcription_done)
+        self.events.on(SETTINGS_SAVED, self._apply_settings)
         self._logo_base = self._load_logo()
         self._logo_gray = self._create_gray_logo()
 
@@ -53,10 +88,24 @@ class OpenWhisperApp:
         # UI components
         self.settings_window = SettingsWindow(self.settings, self._on_settings_saved)
         # Toujours centrer l'overlay au demarrage (ignorer position sauvegardee)
-        self.recording_overlay = RecordingOverlay(None)
+        self.recording_overlay = RecordingOverlay(None, level_meter=self.recorder.meter)
 
         # Hotkey actuel (pour re-enregistrement)
         self._current_hotkey = self.settings.hotkey
+        self._current_cancel_hotkey = self.settings.cancel_hotkey
+
+    # Lecture seule : l'etat est modifie par les gestionnaires d'evenements
+    @property
+    def is_recording(self) -> bool:
+        return self.state.recording
+
+    @property
+    def is_transcribing(self) -> bool:
+        return self.state.pending > 0
+
+    @property
+    def is_model_loading(self) -> bool:
+        return self.state.model == AppState.LOADING
 
     # ── Asset path (dev + exe) ──────────────────────────
 
@@ -97,11 +146,13 @@ class OpenWhisperApp:
           idle          -> logo + point rouge (bas droite)
           recording     -> logo + point vert  (bas droite)
           transcribing  -> logo + arc spinner bleu + point jaune
+          queued        -> logo grise + arc spinner orange + point jaune
+                           (dictee en attente de la fin du chargement)
           error         -> logo grise + croix rouge
         """
         img = Image.new("RGBA", (64, 64), (0, 0, 0, 0))
 
-        if state == "loading":
+        if state in ("loading", "queued"):
             if self._logo_gray:
                 img.paste(self._logo_gray, (0, 0), self._logo_gray)
             else:
@@ -110,6 +161,8 @@ class OpenWhisperApp:
             dc = ImageDraw.Draw(img)
             angle = (self._spinner_frame * 30) % 360
             dc.arc([2, 2, 62, 62], angle, angle + 100, fill=(255, 140, 0), width=5)
+            if state == "queued":
+                dc.ellipse([46, 46, 60, 60], fill=(255, 180, 0), outline=(200, 140, 0))
         elif state == "error":
             if self._logo_gray:
                 img.paste(self._logo_gray, (0, 0), self._logo_gray)
@@ -149,14 +202,20 @@ class OpenWhisperApp:
 
     def _menu_items(self):
         """Menu dynamique - regenere a chaque ouverture"""
-        if self.is_model_loading:
+        if self.is_recording:
+            status = "[REC] Enregistrement en cours..."
+            if self.is_model_loading:
+                status += " (modele en chargement)"
+        elif self.is_transcribing and self.is_model_loading:
+            status = "[...] Dictee en attente du modele..."
+        elif self.is_model_loading:
             status = "[...] Chargement du modele Whisper..."
         elif self.transcriber.has_error():
             status = "[ERR] Erreur chargement modele"
-        elif self.is_recording:
-            status = "[REC] Enregistrement en cours..."
         elif self.is_transcribing:
             status = "[...] Transcription en cours..."
+            if self.transcription_queue.depth > 1:
+                status += f" ({self.transcription_queue.depth - 1} en file)"
         else:
             status = "[OK] Pret"
 
@@ -175,6 +234,12 @@ class OpenWhisperApp:
             )
             yield pystray.Menu.SEPARATOR
 
+        yield pystray.MenuItem(
+            f"Annuler la transcription ({self.settings.cancel_hotkey})",
+            self.cancel_transcription,
+            enabled=self.is_transcribing
+        )
+
         # Parametres (desactive temporairement)
         yield pystray.MenuItem("Parametres...", self._open_settings)
 
@@ -184,53 +249,53 @@ class OpenWhisperApp:
         yield pystray.Menu.SEPARATOR
         yield pystray.MenuItem("Quitter", self.quit_app)
 
-    # ── Loading animation (pendant chargement modele) ───
+    # ── Icone et chargement du modele ──────────────────
 
-    def _start_loading_animation(self):
-        self._spinner_frame = 0
-        self._loading_thread = threading.Thread(target=self._loading_loop, daemon=True)
-        self._loading_thread.start()
-
-    def _stop_loading_animation(self):
-        self.is_model_loading = False
-        self._loading_thread = None
-        self.icon.icon = self._create_icon_image("idle")
-
-    def _loading_loop(self):
-        while self.is_model_loading and self.is_running:
-            self._spinner_frame += 1
-            self.icon.icon = self._create_icon_image("loading")
-            time.sleep(0.1)
-            # Verifier si le modele est charge
-            if self.transcriber.is_ready():
-                self.is_model_loading = False
-                if self.transcriber.has_error():
-                    self.icon.icon = self._create_icon_image("error")
-                    print(f"[ERREUR] Chargement modele echoue: {self.transcriber.get_error()}")
-                else:
-                    self.icon.icon = self._create_icon_image("idle")
-                    print("[OK] Modele pret - Hotkey active")
-                break
-        self._loading_thread = None
-
-    # ── Spinner (animation pendant transcription) ───────
-
-    def _start_spinner(self):
-        self._spinner_frame = 0
-        self._spinner_thread = threading.Thread(target=self._spinner_loop, daemon=True)
-        self._spinner_thread.start()
+    def _refresh_icon(self):
+        """Icone correspondant a l'etat courant"""
+        self.icon.icon = self._create_icon_image(self.state.icon)
+
+    def _animate(self):
+        """Image suivante du spinner (minuteur de la boucle, actif seulement si anime)"""
+        self._spinner_frame += 1
+        self._refresh_icon()
 
-    def _stop_spinner(self):
-        self.is_transcribing = False
-        if self._spinner_thread and self._spinner_thread.is_alive():
-            self._spinner_thread.join(timeout=0.2)
-        self._spinner_thread = None
+    def _watch_model(self):
+        """Passe en chargement ; MODEL_READY sera poste a la fin, sans sondage"""
+        self.state.model = AppState.LOADING
+        threading.Thread(target=self._wait_model_ready, daemon=True).start()
 
-    def _spinner_loop(self):
-        while self.is_transcribing:
-            self._spinner_frame += 1
-            self.icon.icon = self._create_icon_image("transcribing")
-            time.sleep(0.1)
+    def _wait_model_ready(self):
+        self.transcriber.wait_ready()
+        self.events.post(MODEL_READY)
+
+    def _on_model_wait(self, ready: threading.Event):
+        """Une dictee attend le modele (recharge apres inactivite ou premier chargement)"""
+        if self.transcriber.is_ready():
+            ready.set()
+            return
+        self._model_waiters.append(ready)
+        if self.state.model != AppState.LOADING:
+            self._watch_model()
+            self._refresh_icon()
+
+    def _on_model_ready(self):
+        if not self.transcriber.is_ready():
+            return  # Un nouveau chargement a ete lance entre-temps
+        waiters, self._model_waiters = self._model_waiters, []
+        for ready in waiters:
+            ready.set()
+        if self.transcriber.has_error():
+            self.state.model = AppState.ERROR
+            print(f"[ERREUR] Chargement modele echoue: {self.transcriber.get_error()}")
+        else:
+            self.state.model = AppState.READY
+            print("[OK] Modele pret")
+        self._refresh_icon()
+
+    def _on_transcription_done(self):
+        self.state.pending -= 1
+        self._refresh_icon()
 
     # ── Demarrage automatique ───────────────────────────
 
@@ -294,7 +359,10 @@ class OpenWhisperApp:
             webbrowser.open(self.download_url)
 
     def _on_settings_saved(self, model_changed: bool, hotkey_changed: bool):
-        """Callback appele apres sauvegarde des parametres"""
+        """Callback appele apres sauvegarde des parametres (thread de la fenetre)"""
+        self.events.post(SETTINGS_SAVED, model_changed, hotkey_changed)
+
+    def _apply_settings(self, model_changed: bool, hotkey_changed: bool):
         print("[Settings] Parametres sauvegardes")
 
         # Re-enregistrer le hotkey si change
@@ -307,13 +375,40 @@ class OpenWhisperApp:
             keyboard.add_hotkey(self._current_hotkey, self.toggle_recording)
             print(f"[Settings] Hotkey change: {self._current_hotkey}")
 
-        # Recharger le modele si necessaire
-        if model_changed:
-            print("[Settings] Rechargement du modele...")
-            self.is_model_loading = True
-            self.icon.icon = self._create_icon_image("loading")
-            self.transcriber = Transcriber(self.settings)
-            self._start_loading_animation()
+        if self.settings.cancel_hotkey != self._current_cancel_hotkey:
+            try:
+                keyboard.remove_hotkey(self._current_cancel_hotkey)
+            except Exception:
+                pass
+            self._current_cancel_hotkey = self.settings.cancel_hotkey
+            keyboard.add_hotkey(self._current_cancel_hotkey, self.cancel_transcription)
+
+        # Format de stockage audio (pris en compte au prochain enregistrement)
+        self.recorder.storage = self.settings.audio_storage
+        self.recorder.spill_threshold = self.settings.spill_threshold
+        self.recorder.set_vad_mode(self.settings.vad_mode)
+        capture_changed = self.recorder.configure_capture(
+            self.settings.native_capture,
+            self.settings.audio_blocksize,
+            self.settings.audio_latency,
+            self.settings.capture_dtype
+        )
+        if capture_changed:
+            # Le format de capture change : rouvrir le flux chaud avec le nouveau format
+            self.recorder.close_warm_stream()
+            threading.Thread(target=self._prepare_audio, daemon=True).start()
+        elif self.settings.warm_stream:
+            self.recorder.open_warm_stream()
+        else:
+            self.recorder.close_warm_stream()
+
+        # Changer de modele a chaud (l'ancien sert jusqu'a ce que le nouveau soit pret)
+        had_model = self.transcriber.has_model()
+        if self.transcriber.switch_model(self.settings):
+            print("[Settings] Changement de modele...")
+            if not had_model:
+                self._watch_model()
+                self._refresh_icon()
 
     def _on_update_checked(self, has_update: bool, version: str, url: str):
         """Callback appele apres verification des mises a jour"""
@@ -366,16 +461,21 @@ class OpenWhisperApp:
     # ── Controle enregistrement (toggle) ────────────────
 
     def toggle_recording(self):
-        """Appui unique = demarrer OU arreter"""
-        # Bloquer si le modele n'est pas charge
-        if self.is_model_loading:
-            print("[!] Modele en cours de chargement, veuillez patienter...")
-            return
+        """Hotkey : la transition est faite par la boucle d'evenements"""
+        self.events.post(TOGGLE)
 
+    def _on_toggle(self):
+        """Appui unique = demarrer OU arreter
+
+        L'enregistrement est possible pendant le chargement du modele : l'audio
+        est garde et transcrit des que le modele est pret.
+        """
         # Bloquer si le modele est en erreur
         if self.transcriber.has_error():
             print(f"[!] Modele non disponible: {self.transcriber.get_error()}")
             return
+        if self.state.model == AppState.ERROR:
+            self._on_model_ready()  # Erreur passagere levee (serveur de nouveau joignable)
 
         now = time.time()
         if now - self._toggle_cooldown < 0.3:
@@ -388,30 +488,128 @@ class OpenWhisperApp:
             self._start_recording()
 
     def _start_recording(self):
-        self.is_recording = True
+        self.state.recording = True
         self.record_start_time = time.time()
 
-        # Callback pour la waveform
-        def on_audio(samples):
-            if self.recording_overlay.is_visible:
-                self.recording_overlay.update_waveform(samples)
+        # Recharge le modele en arriere-plan s'il a ete decharge (pendant que l'utilisateur parle)
+        self.transcriber.acquire()
+
+        # Transcription continue pendant l'enregistrement
+        if self.settings.streaming_transcription and not self.settings.two_pass:
+            self._stream = self.transcriber.start_stream()
+
+        # Audio brut uniquement pour la transcription continue (l'overlay lit les niveaux)
+        on_audio = self._stream.feed if self._stream else None
 
         if not self.recorder.start(on_audio_callback=on_audio):
-            self.is_recording = False
+            self.state.recording = False
+            self._cancel_stream()
+            self.transcriber.release()
             return
 
-        self.icon.icon = self._create_icon_image("recording")
+        self._refresh_icon()
 
         # Afficher l'overlay
         self.recording_overlay.show()
 
         sounds.play_start_recording()
-        print("[REC] Enregistrement demarre...")
+        if self.transcriber.is_ready():
+            print("[REC] Enregistrement demarre...")
+        else:
+            print("[REC] Enregistrement demarre (modele en chargement, transcription des qu'il est pret)...")
+
+    def _inject_segments(self, segments) -> str:
+        """Injecte chaque segment des qu'il est decode, retourne le texte complet"""
+        text = ""
+        for segment in segments:
+            piece = self.injector.join_segment(text, segment)
+            self.injector.inject(piece)
+            text += piece
+        return text
+
+    def _inject_draft(self, audio_data, draft: str, cancel):
+        """Injecte le brouillon puis le corrige avec le modele principal
+
+        La correction est faite dans le thread de la file : la dictee suivante
+        n'est injectee qu'apres elle, le remplacement vise donc bien le brouillon.
+        """
+        if draft:
+            print(f"[OK] Brouillon: {draft}")
+            self._copy_to_clipboard(draft)
+            self.injector.inject(draft)
+            sounds.play_done()
+        window = self.injector.foreground_window()
+
+        segments = self._until_cancelled(self.transcriber.iter_segments(audio_data, cancel=cancel),
+                                         cancel)
+        text = " ".join(segments).strip()
+        if cancel.is_set():
+            print("[!] Correction annulee, brouillon conserve")
+            return
+        if not text or text == draft:
+            print("[OK] Brouillon confirme par le modele principal")
+            return
+        if window != self.injector.foreground_window():
+            print("[!] Fenetre active changee, correction non appliquee")
+            return
+        if draft:
+            self.injector.replace(draft, text, self.settings.refine_mode)
+        else:
+            self.injector.inject(text)
+        self._copy_to_clipboard(text)
+        print(f"[OK] Corrige: {text}")
+
+    def _cancel_stream(self):
+        if self._stream:
+            self._stream.cancel()
+            self._stream = None
+
+    def cancel_transcription(self, icon=None, item=None):
+        """Annule la dictee en cours de transcription (et celles en attente)"""
+        cancelled = self.transcription_queue.cancel_all()
+        if cancelled:
+            print(f"[Cancel] {cancelled} dictee(s) annulee(s)")
+
+    def _until_cancelled(self, segments, cancel):
+        """Consomme les segments jusqu'a l'annulation (verifiee entre deux segments)
+
+        Le generateur est ferme des l'annulation constatee : faster-whisper
+        s'arrete apres le segment en cours et le thread de la file est libere.
+        """
+        try:
+            for segment in segments:
+                if cancel.is_set():
+                    break
+                yield segment
+        finally:
+            close = getattr(segments, "close", None)
+            if close:
+                close()
+            if cancel.is_set() and cancel.requested_at is not None:
+                print(f"[Cancel] Decodage interrompu, CPU libere "
+                      f"{(time.perf_counter() - cancel.requested_at) * 1000:.0f} ms apres la demande")
 
     def _stop_and_transcribe(self):
+        """Arrete l'enregistrement et confie la transcription a la file (retour immediat)"""
+        job = None
+        try:
+            job = self._stop_recording()
+        finally:
+            if job is None:
+                # Rien a transcrire : relance le delai de dechargement du modele
+                self.transcriber.release()
+        if job is not None:
+            self.state.pending += 1
+            self.transcription_queue.submit(job)
+        self._refresh_icon()
+
+    def _stop_recording(self):
+        """Arrete la capture, retourne la dictee a transcrire (ou None)"""
         duration = time.time() - self.record_start_time
-        audio_data = self.recorder.stop()
-        self.is_recording = False
+        # La session continue a deja decode l'audio brut : pas de decoupage VAD
+        audio_data = self.recorder.stop(trim=self._stream is None)
+        self.state.recording = False
+        stream, self._stream = self._stream, None
 
         # Cacher l'overlay et sauvegarder la position
         overlay_pos = self.recording_overlay.hide()
@@ -420,50 +618,149 @@ class OpenWhisperApp:
             self.settings.save()
 
         if duration < MIN_RECORDING_DURATION:
-            self.icon.icon = self._create_icon_image("idle")
+            if stream:
+                stream.cancel()
             print(f"[!] Enregistrement trop court ({duration:.2f}s)")
-            return
+            return None
 
         print("[STOP] Enregistrement arrete")
 
-        if audio_data is not None and len(audio_data) > 0:
-            self.is_transcribing = True
-            self._start_spinner()
-            sounds.play_stop_recording()
-            print("[...] Transcription en cours...")
+        if audio_data is None or len(audio_data) == 0:
+            if stream:
+                stream.cancel()
+            print("[!] Pas d'audio enregistre")
+            return None
 
-            text = self.transcriber.transcribe(audio_data)
+        sounds.play_stop_recording()
+        return self.transcription_queue.create_job(
+            audio_data, duration, stream, self.recorder.noise_sample
+        )
 
-            self._stop_spinner()
-            self.icon.icon = self._create_icon_image("idle")
+    def _process_job(self, job):
+        """Transcrit et injecte une dictee (thread de la file)"""
+        try:
+            self._transcribe_job(job)
+        finally:
+            self.events.post(TRANSCRIPTION_DONE)
+            # Relance le delai de dechargement du modele
+            self.transcriber.release()
+
+    def _transcribe_job(self, job):
+        audio_data, stream, cancel = job.audio, job.stream, job.cancel_token
+        if cancel.is_set():
+            if stream:
+                stream.cancel()
+            print(f"[Cancel] Dictee #{job.id} annulee avant la transcription")
+            return
 
-            if text:
-                print(f"[OK] Transcrit: {text}")
-                self._copy_to_clipboard(text)
+        if not self.transcriber.is_ready():
+            # Dictee en file : le chargement du modele recouvre la prise de parole
+            print("[...] Dictee en attente du modele...")
+            queued_at = time.perf_counter()
+            # Reveil par MODEL_READY (boucle d'evenements) ou par l'annulation, sans sondage
+            ready = threading.Event()
+            cancel.add_callback(ready.set)
+            self.events.post(MODEL_WAIT, ready)
+            ready.wait()
+            cancel.remove_callback(ready.set)
+            if cancel.is_set():
+                if stream:
+                    stream.cancel()
+                print(f"[Cancel] Dictee #{job.id} annulee pendant le chargement du modele")
+                return
+            print(f"[OK] Modele pret apres {time.perf_counter() - queued_at:.1f}s d'attente "
+                  f"(enregistrement de {job.duration:.1f}s pendant le chargement)")
+        print("[...] Transcription en cours...")
+
+        # Reduction de bruit (la session continue a deja decode l'audio brut)
+        denoised = self.settings.noise_suppression and not stream
+        if denoised:
+            audio_data = self.denoiser.process(audio_data, job.noise_sample)
+
+        # Mode deux passes : brouillon injecte tout de suite, correction ensuite
+        draft = None
+        if not stream and self.settings.two_pass:
+            draft = self.transcriber.transcribe_draft(audio_data)
+        if draft is not None:
+            self._inject_draft(audio_data, draft, cancel)
+            return
+
+        if stream:
+            segments = stream.finish_segments(audio_data)
+        elif self.settings.latency_budget > 0:
+            segments = [self.transcriber.transcribe_within_budget(audio_data, cancel)]
+        else:
+            segments = self.transcriber.iter_segments(audio_data, cancel=cancel)
+
+        segments = self._until_cancelled(segments, cancel)
+        window = self.injector.foreground_window()
+        if self.settings.incremental_injection:
+            text = self._inject_segments(segments)
+        else:
+            text = " ".join(segments).strip()
+
+        if cancel.is_set():
+            # Resultat partiel abandonne (y compris les segments deja injectes)
+            if self.settings.incremental_injection and text and window == self.injector.foreground_window():
+                self.injector.replace(text, "", "delete")
+            print(f"[Cancel] Dictee #{job.id} annulee, texte partiel abandonne")
+            return
+
+        if not stream and self.settings.latency_budget <= 0:
+            self.denoise_report.add(denoised, self.transcriber.last_stats)
+
+        if text:
+            print(f"[OK] Transcrit: {text}")
+            self._copy_to_clipboard(text)
+            if not self.settings.incremental_injection:
                 self.injector.inject(text)
-                sounds.play_done()
-                print("[OK] Texte copie et injecte")
-            else:
-                print("[!] Aucun texte detecte")
+            sounds.play_done()
+            print("[OK] Texte copie et injecte")
         else:
-            self.icon.icon = self._create_icon_image("idle")
-            print("[!] Pas d'audio enregistre")
+            print("[!] Aucun texte detecte")
 
     # ── Cycle de vie ────────────────────────────────────
 
     def quit_app(self, icon=None, item=None):
-        self.is_running = False
-        self.is_model_loading = False
+        self.events.post(QUIT)
+
+    def _shutdown(self):
+        """Arret apres la sortie de la boucle d'evenements (thread principal)"""
+        print(f"[Events] {self.events.summary()}")
         if self.recorder.is_recording():
             self.recorder.stop()
+            self.transcriber.release()
+        self.recorder.close_warm_stream()
+        self._cancel_stream()
+        self.transcription_queue.stop()
+        self.transcriber.shutdown()
         self.icon.stop()
-        sys.exit(0)
+
+    def _create_audio_source(self):
+        """Source audio du reglage audio_source (micro si invalide)"""
+        try:
+            source = create_source(self.settings.audio_source)
+        except Exception as e:
+            print(f"[!] Source audio invalide ({self.settings.audio_source}): {e}")
+            source = create_source("device")
+        if self.settings.audio_source != "device":
+            print(f"[Audio] Source: {source.name}")
+        return source
+
+    def _prepare_audio(self):
+        """Prepare la capture : taille de bloc, puis flux chaud ou bruit ambiant"""
+        self.recorder.probe_blocksize()
+        if self.settings.warm_stream:
+            self.recorder.open_warm_stream()
+        else:
+            self.recorder.calibrate_vad()
 
     def run(self):
         hotkey = self.settings.hotkey
         print("=" * 50)
         print(f"  OpenWhisper v{VERSION} - Demarre")
         print(f"  Hotkey : {hotkey}  (mode toggle)")
+        print(f"  Annuler la transcription : {self._current_cancel_hotkey}")
         print(f"  Plateforme : {platform.system()}")
         print("  1er appui  -> demarrer l'enregistrement")
         print("  2eme appui -> arreter + transcrire")
@@ -471,19 +768,21 @@ class OpenWhisperApp:
         print("[...] Chargement du modele Whisper...")
 
         keyboard.add_hotkey(hotkey, self.toggle_recording)
+        keyboard.add_hotkey(self._current_cancel_hotkey, self.cancel_transcription)
+
+        # Sonde de la taille de bloc, flux chaud ou calibration VAD (pendant le chargement du modele)
+        threading.Thread(target=self._prepare_audio, daemon=True).start()
 
         # Verifier les mises a jour en arriere-plan
         self.update_checker.check_async(self._on_update_checked)
 
-        # Demarrer l'animation de chargement
-        self._start_loading_animation()
+        # Chargement en cours : MODEL_READY sera poste a la fin
+        self._watch_model()
 
         tray_thread = threading.Thread(target=self.icon.run, daemon=True)
         tray_thread.start()
 
         try:
-            while self.is_running:
-                time.sleep(0.1)
-        except KeyboardInterrupt:
-            print("\nArret de l'application...")
-            self.quit_app()
+            self.events.run()
+        finally:
+            self._shutdown()
@@ -0,0 +1,232 @@
+"""Tampon audio preallloue pour l'enregistrement (ecriture sans allocation)"""
+import threading
+import time
+import numpy as np
+from src.config import SAMPLE_RATE
+
+INT16_SCALE = 32767.0
+
+
+class AudioRingBuffer:
+    """Tampon circulaire d'echantillons mono
+
+    - grow=True  : tampon lineaire qui double de taille quand il est plein
+                   (enregistrement : rien n'est jamais perdu)
+    - grow=False : tampon circulaire de capacite fixe, les echantillons les
+                   plus anciens sont ecrases
+
+    write() est appele depuis le callback PortAudio : il copie directement le
+    bloc dans la memoire preallouee, sans tableau intermediaire.
+    """
+
+    def __init__(self, seconds: float, dtype: str = "float32", grow: bool = True):
+        self.dtype = np.dtype(dtype)
+        self.grow = grow
+        self._data = np.empty(max(1, int(seconds * SAMPLE_RATE)), dtype=self.dtype)
+        self._start = 0  # Indice du plus ancien echantillon (mode circulaire)
+        self._size = 0
+        self._scratch = np.empty(0, dtype=np.float32)  # Ecretage avant conversion int16
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data)
+
+    def _store(self, dest: np.ndarray, samples: np.ndarray):
+        if self.dtype == np.int16:
+            # Ecretage a [-1, 1] : au-dela (reechantillonneur), la conversion deborderait
+            # et 1.05 deviendrait -0.95, un claquement pleine echelle
+            n = len(samples)
+            if len(self._scratch) < n:
+                self._scratch = np.empty(n, dtype=np.float32)
+            scratch = self._scratch[:n]
+            np.clip(samples, -1.0, 1.0, out=scratch)
+            np.multiply(scratch, INT16_SCALE, out=scratch)
+            np.rint(scratch, out=scratch)
+            dest[:] = scratch
+        else:
+            dest[:] = samples
+
+    def write(self, block: np.ndarray):
+        """Ajoute un bloc (frames,) ou (frames, channels) ; seul le 1er canal est garde"""
+        samples = block[:, 0] if block.ndim == 2 else block
+        n = len(samples)
+        if n == 0:
+            return
+
+        if self.grow:
+            if self._size + n > len(self._data):
+                self._resize(max(2 * len(self._data), self._size + n))
+            self._store(self._data[self._size:self._size + n], samples)
+            self._size += n
+            return
+
+        # Mode circulaire : seuls les `capacity` derniers echantillons comptent
+        capacity = len(self._data)
+        if n >= capacity:
+            self._store(self._data, samples[n - capacity:])
+            self._start = 0
+            self._size = capacity
+            return
+
+        end = (self._start + self._size) % capacity
+        first = min(n, capacity - end)
+        self._store(self._data[end:end + first], samples[:first])
+        if first < n:
+            self._store(self._data[:n - first], samples[first:])
+        overflow = self._size + n - capacity
+        if overflow > 0:
+            self._start = (self._start + overflow) % capacity
+            self._size = capacity
+        else:
+            self._size += n
+
+    def _resize(self, capacity: int):
+        data = np.empty(capacity, dtype=self.dtype)
+        data[:self._size] = self._data[:self._size]
+        self._data = data
+
+    def raw(self) -> np.ndarray:
+        """Echantillons dans l'ordre chronologique, au format de stockage
+
+        Sans copie pour un tampon lineaire ; une copie si les donnees
+        circulaires sont en deux morceaux.
+        """
+        end = self._start + self._size
+        if end <= len(self._data):
+            return self._data[self._start:end]
+        return np.concatenate((self._data[self._start:], self._data[:end - len(self._data)]))
+
+    def view(self) -> np.ndarray:
+        """Echantillons float32 pour Whisper (vue sans copie en stockage float32)"""
+        data = self.raw()
+        if self.dtype == np.int16:
+            return np.multiply(data, np.float32(1.0 / INT16_SCALE), dtype=np.float32)
+        return data
+
+    def clear(self):
+        self._start = 0
+        self._size = 0
+
+
+class SpillingAudioBuffer:
+    """Tampon d'enregistrement qui bascule sur disque au-dela d'un seuil
+
+    Jusqu'au seuil, l'audio reste en memoire (AudioRingBuffer). Ensuite, le
+    callback ecrit dans un petit tampon de transit qu'un thread vide
+    regulierement dans un fichier float32 brut : la memoire residente reste
+    constante quelle que soit la duree. view() retourne un np.memmap sur ce
+    fichier, lu sans copie par Whisper.
+
+    Les tampons de transit et le thread d'ecriture sont crees avec le tampon
+    (au demarrage de l'enregistrement) : au passage du seuil, le callback ne
+    fait que basculer un indicateur et reveiller le thread.
+    """
+
+    FLUSH_INTERVAL = 0.5  # Secondes entre deux ecritures sur disque
+    STAGING_SECONDS = 5
+
+    def __init__(self, seconds: float, threshold_seconds: float, directory, dtype: str = "float32"):
+        self._memory = AudioRingBuffer(seconds, dtype=dtype)
+        self._threshold = int(threshold_seconds * SAMPLE_RATE)
+        self._directory = directory
+        self._lock = threading.Lock()
+        self._spilling = False
+        self._initial = None  # Contenu memoire a ecrire en premier
+        self._staging = AudioRingBuffer(self.STAGING_SECONDS)
+        self._spare = AudioRingBuffer(self.STAGING_SECONDS)
+        self._file = None
+        self._spilled = 0
+        self._wake = threading.Event()  # Seuil atteint (ou tampon ferme)
+        self._stop = threading.Event()
+        self.path = None
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def __len__(self) -> int:
+        if not self._spilling:
+            return len(self._memory)
+        with self._lock:
+            pending = len(self._staging)
+            if self._initial is not None:
+                pending += len(self._initial)
+        return self._spilled + pending
+
+    def write(self, block: np.ndarray):
+        if not self._spilling:
+            self._memory.write(block)
+            if len(self._memory) >= self._threshold and not self._wake.is_set():
+                self._start_spill()
+            return
+        with self._lock:
+            self._staging.write(block)
+
+    def _start_spill(self):
+        """Bascule sur disque (depuis le callback : ni allocation, ni E/S, ni thread)"""
+        with self._lock:
+            self._initial, self._memory = self._memory, None
+            self._spilling = True
+        self._wake.set()
+
+    def _flush(self):
+        """Ecrit sur disque l'audio en attente (thread d'ecriture)"""
+        with self._lock:
+            initial, self._initial = self._initial, None
+            full, self._staging = self._staging, self._spare
+
+        if initial is not None:
+            data = initial.view()
+            data.tofile(self._file)
+            self._spilled += len(data)
+        data = full.raw()
+        data.tofile(self._file)
+        self._spilled += len(data)
+        full.clear()
+        self._spare = full
+
+    def _write_loop(self):
+        self._wake.wait()
+        if not self._spilling:
+            return  # Enregistrement termine sous le seuil
+        self.path = self._directory / f"recording-{time.strftime('%Y%m%d-%H%M%S')}.f32"
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "wb")
+        print(f"[Audio] Enregistrement long : ecriture sur disque ({self.path})")
+        self._flush()
+        while not self._stop.wait(self.FLUSH_INTERVAL):
+            self._flush()
+
+    def view(self) -> np.ndarray:
+        """Echantillons float32 (np.memmap sans copie si l'audio est sur disque)"""
+        if not self._spilling:
+            self.close()
+            return self._memory.view()
+
+        if not self._stop.is_set():
+            self._stop.set()
+            self._writer.join()
+            self._flush()
+            self._file.close()
+        return np.memmap(self.path, dtype=np.float32, mode="r")
+
+    def close(self):
+        """Arrete le thread d'ecriture d'un tampon reste sous le seuil"""
+        if not self._spilling:
+            self._wake.set()
+
+
+def cleanup_spill_files(directory):
+    """Supprime les fichiers d'enregistrements longs precedents
+
+    Un fichier encore projete en memoire (transcription en cours, Windows)
+    est ignore et sera supprime au prochain appel.
+    """
+    if not directory.exists():
+        return
+    for path in directory.glob("recording-*.f32"):
+        try:
+            path.unlink()
+        except OSError:
+            pass
@@ -1,84 +1,220 @@
 """Gestion de l'enregistrement audio"""
-import sounddevice as sd
+import queue
 import numpy as np
-from src.config import SAMPLE_RATE, CHANNELS
+import threading
+import time
+from src.config import (
+    SAMPLE_RATE, CHANNELS, RECORD_BUFFER_SECONDS, AUDIO_STORAGE, PREROLL_SECONDS,
+    SPILL_THRESHOLD_SECONDS, RESAMPLE_QUEUE_BLOCKS, VAD_MODE,
+    VAD_CALIBRATION_SECONDS, DENOISE_PROFILE_SECONDS, AUDIO_BLOCKSIZE, AUDIO_LATENCY, CAPTURE_DTYPE,
+    BLOCKSIZE_CANDIDATES, BLOCKSIZE_PROBE_SECONDS, BLOCKSIZE_MAX_LOAD,
+)
+from src.audio_buffer import AudioRingBuffer, SpillingAudioBuffer, cleanup_spill_files
+from src.resampler import StreamingResampler, downmix
+from src.vad import create_vad
+from src.level_meter import LevelMeter
+from src.capture_stats import CaptureStats
+from src.audio_sources import AudioSource, DeviceSource
+from src.settings import get_settings_dir
 
 
 class AudioRecorder:
-    def __init__(self):
+    def __init__(self, storage: str = AUDIO_STORAGE, spill_threshold: float = SPILL_THRESHOLD_SECONDS,
+                 native_capture: bool = False, vad_mode: str = VAD_MODE,
+                 blocksize=AUDIO_BLOCKSIZE, latency: str = AUDIO_LATENCY,
+                 dtype: str = CAPTURE_DTYPE, source: AudioSource = None):
         self.recording = False
-        self.frames = []
+        self.storage = storage  # float32 ou int16
+        self.spill_threshold = spill_threshold  # Secondes avant ecriture sur disque (0 = jamais)
+        self.native_capture = native_capture  # Forcer la capture au format natif du peripherique
+        self.blocksize = blocksize  # Echantillons par callback (0 = PortAudio, "auto" = sonde)
+        self.latency = latency  # Classe de latence PortAudio (low/high)
+        self.dtype = dtype  # Format livre par le peripherique (float32/int16)
+        self.vad_mode = vad_mode
+        self.vad = create_vad(vad_mode)  # None = pas de VAD cote client
+        self._vad = None  # VAD de l'enregistrement en cours
+        self.spill_dir = get_settings_dir() / "recordings"
+        self.buffer = None
         self.stream = None
-        self.device = self._find_input_device()
-        self._on_audio_callback = None  # Callback pour waveform temps reel
+        self.source = source or DeviceSource()  # Micro par defaut (fichier, stdin, synthetique)
+        self._on_audio_callback = None  # Callback audio brut (transcription continue)
+        self.meter = LevelMeter()  # Niveaux par bloc (overlay, statistiques)
+        self.stats = CaptureStats()  # xruns, duree et gigue du callback
+        self._probed_blocksize = None  # Resultat de la sonde (blocksize "auto")
+        self.noise_sample = None  # Extrait sans parole du dernier enregistrement (reduction de bruit)
+        self._stream_rate = SAMPLE_RATE
 
-    def _find_input_device(self):
-        """Trouve un peripherique d'entree valide"""
-        try:
-            # Essayer le peripherique par defaut
-            default = sd.default.device[0]
-            if default is not None and default >= 0:
-                return default
-        except Exception:
-            pass
+        # Flux chaud : le peripherique reste ouvert et alimente un pre-roll circulaire
+        self._warm = False
+        self._stream_lock = threading.Lock()  # Ouverture/fermeture (start vs calibration)
+        self._preroll = None
+        self._lock = threading.Lock()
 
-        # Chercher un peripherique d'entree disponible
-        try:
-            devices = sd.query_devices()
-            for i, dev in enumerate(devices):
-                if dev['max_input_channels'] > 0:
-                    print(f"[Audio] Peripherique trouve: {dev['name']}")
-                    return i
-        except Exception as e:
-            print(f"[Audio] Erreur lors de la recherche: {e}")
+        # Latence appui hotkey -> premier echantillon
+        self._start_time = None
+        self._first_sample_latency = None
 
-        return None
+        # Capture native : le callback ne fait que copier, un thread reechantillonne
+        self._resampler = None
+        self._resample_queue = None
+        self._resample_thread = None
+        self._dropped_blocks = 0
 
-    def start(self, on_audio_callback=None):
-        """Demarre l'enregistrement audio
+    def _callback(self, indata, frames, time_info, status):
+        start = time.perf_counter()
+        if status:
+            self.stats.record_status(status)
+
+        if self._resample_queue is not None:
+            # Capture native : aucun calcul ici, le thread de reechantillonnage s'en charge
+            try:
+                # Source rejouee au plus vite : attendre le thread plutot que perdre des blocs
+                self._resample_queue.put((indata.copy(), self.recording),
+                                         block=not self.source.realtime)
+            except queue.Full:
+                self._dropped_blocks += 1
+        elif indata.dtype != np.float32:
+            self._deliver(downmix(indata), self.recording, owned=True)
+        else:
+            self._deliver(indata, self.recording)
+
+        self.stats.record(start, frames)
+
+    def _deliver(self, samples, recording: bool, owned: bool = False):
+        """Range un bloc 16 kHz dans le pre-roll ou le tampon d'enregistrement
 
         Args:
-            on_audio_callback: Callback appele avec les samples audio (pour waveform)
+            recording: Etat de l'enregistrement au moment de la capture du bloc
+            owned: Le bloc est deja une copie (inutile de recopier pour le callback)
         """
-        if self.device is None:
-            print("[!] Aucun peripherique audio trouve")
-            return False
+        if not recording:
+            # Flux chaud au repos : seul le pre-roll (taille fixe) est alimente
+            preroll = self._preroll
+            if preroll is None:
+                return
+            with self._lock:
+                if not self.recording:
+                    preroll.write(samples)
+                    return
+            # L'enregistrement a demarre entre-temps : le bloc suit le pre-roll
 
-        self.recording = True
-        self.frames = []
-        self._on_audio_callback = on_audio_callback
+        if self._first_sample_latency is None:
+            self._first_sample_latency = time.perf_counter() - self._start_time
+        self.buffer.write(samples)
+        self.meter.process(samples)
+        vad = self._vad
+        if vad is not None:
+            vad.feed(samples)
+        # Seuls les consommateurs de l'audio brut recoivent une copie du bloc
+        if self._on_audio_callback:
+            try:
+                self._on_audio_callback(samples if owned else samples.copy())
+            except Exception:
+                pass
 
-        def callback(indata, frames, time, status):
-            if status:
-                print(f"[Audio] Status: {status}")
-            if self.recording:
-                self.frames.append(indata.copy())
-                # Appeler le callback waveform si defini
-                if self._on_audio_callback:
-                    try:
-                        self._on_audio_callback(indata.copy())
-                    except Exception:
-                        pass
+    def _stream_blocksize(self) -> int:
+        if self.blocksize == "auto":
+            return self._probed_blocksize or 0
+        return int(self.blocksize or 0)
+
+    def _open_stream(self, blocksize=None) -> bool:
+        if blocksize is None:
+            blocksize = self._stream_blocksize()
+        options = dict(blocksize=blocksize, latency=self.latency, dtype=self.dtype)
+
+        if not self.native_capture:
+            try:
+                self.stats.reset(SAMPLE_RATE)
+                self._stream_rate = SAMPLE_RATE
+                self.stream = self.source.open_stream(
+                    samplerate=SAMPLE_RATE,
+                    channels=CHANNELS,
+                    callback=self._callback,
+                    **options
+                )
+                self.stream.start()
+                return True
+            except Exception as e:
+                # Beaucoup de peripheriques refusent 16 kHz mono : repli sur le format natif
+                print(f"[Audio] Format {SAMPLE_RATE} Hz mono refuse ({e}), capture native")
+                self.stream = None
 
         try:
-            self.stream = sd.InputStream(
-                device=self.device,
-                samplerate=SAMPLE_RATE,
-                channels=CHANNELS,
-                callback=callback,
-                dtype='float32'
+            rate, channels = self.source.native_format()
+            self._start_resampler(rate)
+            self.stats.reset(rate)
+            self._stream_rate = rate
+            self.stream = self.source.open_stream(
+                samplerate=rate,
+                channels=channels,
+                callback=self._callback,
+                **options
             )
             self.stream.start()
+            print(f"[Audio] Capture native: {rate} Hz, {channels} canal(aux) -> {SAMPLE_RATE} Hz mono")
             return True
         except Exception as e:
             print(f"[!] Erreur demarrage audio: {e}")
-            self.recording = False
+            self.stream = None
+            self._stop_resampler()
             return False
 
-    def stop(self):
-        """Arrete l'enregistrement et retourne l'audio"""
-        self.recording = False
+    def _start_resampler(self, rate: int):
+        self._resampler = StreamingResampler(rate, SAMPLE_RATE)
+        self._resample_queue = queue.Queue(maxsize=RESAMPLE_QUEUE_BLOCKS)
+        self._dropped_blocks = 0
+        self._resample_thread = threading.Thread(
+            target=self._resample_loop,
+            args=(self._resample_queue, self._resampler),
+            daemon=True
+        )
+        self._resample_thread.start()
+
+    def _resample_loop(self, blocks: queue.Queue, resampler: StreamingResampler):
+        """Downmix + reechantillonnage hors du callback audio"""
+        while True:
+            item = blocks.get()
+            if item is None:
+                return
+            if isinstance(item, threading.Event):
+                item.set()  # Marqueur de vidage (stop)
+                continue
+            block, recording = item
+            try:
+                samples = resampler.process(downmix(block))
+                if len(samples):
+                    self._deliver(samples, recording, owned=True)
+            except Exception as e:
+                print(f"[Audio] Erreur reechantillonnage: {e}")
+
+    def _drain_resampler(self, flush: bool = False):
+        """Attend que les blocs deja captures soient reechantillonnes"""
+        blocks = self._resample_queue
+        if blocks is None:
+            return
+        done = threading.Event()
+        try:
+            blocks.put(done, timeout=1.0)
+            done.wait(timeout=2.0)
+        except queue.Full:
+            pass
+        if flush and self.buffer is not None:
+            self.buffer.write(self._resampler.flush())
+        if self._dropped_blocks:
+            print(f"[Audio] {self._dropped_blocks} bloc(s) perdu(s) (reechantillonnage en retard)")
+            self._dropped_blocks = 0
+
+    def _stop_resampler(self):
+        if self._resample_queue is not None:
+            try:
+                self._resample_queue.put(None, timeout=1.0)
+            except queue.Full:
+                pass
+        self._resampler = None
+        self._resample_queue = None
+        self._resample_thread = None
 
+    def _close_stream(self, flush: bool = False):
         if self.stream:
             try:
                 self.stream.stop()
@@ -86,13 +222,219 @@ class AudioRecorder:
             except Exception:
                 pass
             self.stream = None
+        if self._resample_queue is not None:
+            # Peripherique ferme : traiter les blocs restants (et la queue du filtre)
+            self._drain_resampler(flush)
+            self._stop_resampler()
+
+    def open_warm_stream(self) -> bool:
+        """Garde le peripherique ouvert en permanence avec un pre-roll circulaire
 
-        if not self.frames:
+        Les PREROLL_SECONDS precedant l'appui du hotkey sont ajoutees au debut
+        de chaque enregistrement et l'ouverture du peripherique n'est plus sur
+        le chemin critique. Au repos, seul le pre-roll (taille fixe) est ecrit.
+        """
+        if self._warm:
+            return True
+        if not self.source.available:
+            print("[!] Aucun peripherique audio trouve")
+            return False
+
+        self._preroll = AudioRingBuffer(PREROLL_SECONDS, grow=False)
+        if self.stream is None and not self._open_stream():
+            self._preroll = None
+            return False
+        self._warm = True
+        print(f"[Audio] Flux chaud ouvert ({PREROLL_SECONDS * 1000:.0f} ms de pre-roll)")
+        return True
+
+    def close_warm_stream(self):
+        """Ferme le flux chaud (l'enregistrement en cours continue)"""
+        if not self._warm:
+            return
+        self._warm = False
+        self._preroll = None
+        if not self.recording:
+            self._close_stream()
+        print("[Audio] Flux chaud ferme")
+
+    def set_vad_mode(self, mode: str):
+        """Change de VAD en conservant la calibration et le compteur"""
+        if mode == self.vad_mode:
+            return
+        previous, self.vad = self.vad, create_vad(mode)
+        self.vad_mode = mode
+        if previous is not None and self.vad is not None:
+            self.vad.noise_floor_db = previous.noise_floor_db
+            self.vad.saved_seconds = previous.saved_seconds
+
+    def calibrate_vad(self):
+        """Mesure le bruit ambiant (au lancement) en ouvrant brievement le micro
+
+        Avec le flux chaud, le pre-roll recalibre la VAD a chaque enregistrement
+        et cette mesure est inutile.
+        """
+        if self.vad is None or self._warm or self.recording or not self.source.available:
+            return
+        self._preroll = AudioRingBuffer(VAD_CALIBRATION_SECONDS, grow=False)
+        if not self._open_stream():
+            self._preroll = None
+            return
+        time.sleep(VAD_CALIBRATION_SECONDS + 0.1)
+        self._drain_resampler()
+
+        with self._stream_lock:
+            with self._lock:
+                preroll, self._preroll = self._preroll, None
+            if self.recording:
+                # Enregistrement demarre pendant la mesure : il garde le flux
+                return
+            self._close_stream()
+        if self.vad.calibrate(preroll.view()):
+            print(f"[VAD] Bruit ambiant: {self.vad.noise_floor_db:.0f} dBFS")
+
+    def configure_capture(self, native_capture: bool, blocksize, latency: str, dtype: str) -> bool:
+        """Change le format du flux (applique a la prochaine ouverture), True si modifie"""
+        capture = (native_capture, blocksize, latency, dtype)
+        if capture == (self.native_capture, self.blocksize, self.latency, self.dtype):
+            return False
+        self.native_capture, self.blocksize, self.latency, self.dtype = capture
+        self._probed_blocksize = None  # La sonde depend de tous ces reglages
+        return True
+
+    def probe_blocksize(self):
+        """Mode "auto" : plus petite taille de bloc sans xrun sur cette machine
+
+        Chaque candidat est ouvert BLOCKSIZE_PROBE_SECONDS ; il est retenu s'il
+        ne provoque aucun xrun et si le callback reste sous BLOCKSIZE_MAX_LOAD
+        de la duree du bloc. La sonde s'interrompt si un enregistrement demarre.
+        """
+        if self.blocksize != "auto" or self._probed_blocksize or not self.source.available:
+            return
+        for candidate in BLOCKSIZE_CANDIDATES:
+            with self._stream_lock:
+                if self.recording or self.stream is not None:
+                    return
+                if not self._open_stream(blocksize=candidate):
+                    continue
+                time.sleep(BLOCKSIZE_PROBE_SECONDS)
+                stats = self.stats
+                xruns, load, callbacks = stats.xruns, stats.load(), stats.callbacks
+                self._close_stream()
+            if callbacks and xruns == 0 and load < BLOCKSIZE_MAX_LOAD:
+                self._probed_blocksize = candidate
+                print(f"[Audio] Taille de bloc retenue: {candidate} "
+                      f"({candidate / self._stream_rate * 1000:.1f} ms, callback {load * 100:.0f}% du bloc)")
+                return
+            print(f"[Audio] Taille de bloc {candidate} rejetee ({xruns} xrun(s), "
+                  f"callback {load * 100:.0f}% du bloc)")
+        print("[Audio] Aucune taille de bloc stable, choix laisse a PortAudio")
+
+    def _create_buffer(self):
+        if isinstance(self.buffer, SpillingAudioBuffer):
+            self.buffer.close()  # Enregistrement precedent vide : view() n'a pas ete appele
+        if self.spill_threshold and self.spill_threshold > 0:
+            cleanup_spill_files(self.spill_dir)
+            return SpillingAudioBuffer(RECORD_BUFFER_SECONDS, self.spill_threshold,
+                                       self.spill_dir, dtype=self.storage)
+        return AudioRingBuffer(RECORD_BUFFER_SECONDS, dtype=self.storage)
+
+    def start(self, on_audio_callback=None):
+        """Demarre l'enregistrement audio
+
+        Args:
+            on_audio_callback: Callback appele avec une copie de chaque bloc
+                (transcription continue). Les niveaux pour l'affichage sont
+                publies par self.meter, sans copie.
+        """
+        if not self.source.available:
+            print("[!] Aucun peripherique audio trouve")
+            return False
+
+        # Nouveau tampon a chaque enregistrement : le precedent peut encore etre
+        # en cours de transcription (vue sans copie)
+        self.buffer = self._create_buffer()
+        self._on_audio_callback = on_audio_callback
+        self.meter.reset()
+        self.noise_sample = None
+        self._start_time = time.perf_counter()
+        self._first_sample_latency = None
+
+        self._vad = self.vad
+        if self._vad is not None:
+            self._vad.reset()
+
+        with self._stream_lock:
+            with self._lock:
+                if self._preroll is not None and self.stream is not None:
+                    # Le peripherique est deja ouvert : reprendre le pre-roll et basculer
+                    self.stats.reset(self._stream_rate)
+                    preroll = self._preroll.view()
+                    self.noise_sample = np.array(preroll)
+                    if self._vad is not None:
+                        if self._warm:
+                            self._vad.calibrate(preroll)
+                        self._vad.feed(preroll)
+                    self.buffer.write(preroll)
+                    # La transcription continue doit voir le meme audio que le tampon :
+                    # ses positions (segments valides) sont relatives au debut du tampon
+                    if on_audio_callback and len(preroll):
+                        try:
+                            on_audio_callback(np.array(preroll))
+                        except Exception:
+                            pass
+                    self._preroll.clear()
+                    self.recording = True
+                    return True
+
+            self.recording = True
+            if not self._open_stream():
+                self.recording = False
+                return False
+            return True
+
+    def stop(self, trim: bool = True):
+        """Arrete l'enregistrement et retourne l'audio
+
+        Args:
+            trim: Retirer les silences (VAD). Sans parole, None est retourne
+                  meme si trim est faux.
+        """
+        self.recording = False
+
+        if not self._warm:
+            self._close_stream(flush=True)
+        else:
+            self._drain_resampler()
+
+        if self._first_sample_latency is not None:
+            mode = "flux chaud" if self._warm else "ouverture du peripherique"
+            print(f"[Audio] Latence hotkey -> premier echantillon: "
+                  f"{self._first_sample_latency * 1000:.0f} ms ({mode})")
+        print(f"[Audio] Capture: {self.stats.summary()}")
+        levels = self.meter.summary()
+        if levels:
+            print(f"[Audio] Niveaux: {levels}")
+
+        if self.buffer is None or len(self.buffer) == 0:
             return None
 
-        # Convertir en array numpy
-        audio_data = np.concatenate(self.frames, axis=0).flatten()
-        return audio_data
+        # Vue float32 sans copie (tampon float32 ou fichier projete en memoire)
+        audio = self.buffer.view()
+
+        vad, self._vad = self._vad, None
+        if vad is not None:
+            trimmed = vad.apply(audio)
+            if trimmed is None:
+                return None
+            if self.noise_sample is None and vad.leading_silence:
+                # Silence precedant la parole : reference pour la reduction de bruit
+                lead = vad.leading_silence
+                start = max(0, lead - int(DENOISE_PROFILE_SECONDS * SAMPLE_RATE))
+                self.noise_sample = np.array(audio[start:lead])
+            if trim:
+                audio = trimmed
+        return audio
 
     def is_recording(self):
         return self.recording
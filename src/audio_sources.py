@@ -0,0 +1,333 @@
+"""Sources audio interchangeables : micro, fichier, pipe stdin, generateur synthetique
+
+Toutes exposent la meme interface que sounddevice : open_stream() retourne un
+flux avec start()/stop()/close() qui appelle callback(indata, frames,
+time_info, status) avec des blocs (frames, channels). AudioRecorder et tout
+ce qui suit (VAD, niveaux, transcription) fonctionnent donc sans micro, par
+exemple sur une machine d'integration continue sans PortAudio.
+"""
+import sys
+import threading
+import time
+import wave
+from pathlib import Path
+from typing import Optional, Tuple
+import numpy as np
+from src.config import SAMPLE_RATE, CHANNELS, NATIVE_MAX_CHANNELS
+from src.audio_buffer import INT16_SCALE
+
+DEFAULT_BLOCKSIZE = 512
+
+
+class AudioSource:
+    """Interface commune des sources audio"""
+
+    name = "source"
+    finite = False  # La source peut se terminer (fichier, pipe)
+    realtime = True  # Cadencee par l'horloge : le consommateur ne doit jamais bloquer
+
+    def __init__(self):
+        self.finished = threading.Event()  # Fin des donnees (sources finies)
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    def native_format(self) -> Tuple[int, int]:
+        """(taux d'echantillonnage, canaux) de la source"""
+        return SAMPLE_RATE, CHANNELS
+
+    def open_stream(self, samplerate: int, channels: int, callback,
+                    blocksize: int = 0, latency=None, dtype: str = "float32"):
+        raise NotImplementedError
+
+    def _check_format(self, samplerate: int, channels: int):
+        rate, native_channels = self.native_format()
+        if (samplerate, channels) != (rate, native_channels):
+            raise ValueError(f"format {samplerate} Hz x{channels} non supporte "
+                             f"(natif : {rate} Hz x{native_channels})")
+
+
+class DeviceSource(AudioSource):
+    """Peripherique d'entree PortAudio (sounddevice importe a la demande)"""
+
+    name = "micro"
+
+    def __init__(self, device=None):
+        super().__init__()
+        self._sd = None
+        self.device = device if device is not None else self._find_input_device()
+
+    def _sounddevice(self):
+        if self._sd is None:
+            import sounddevice
+            self._sd = sounddevice
+        return self._sd
+
+    def _find_input_device(self):
+        """Trouve un peripherique d'entree valide"""
+        try:
+            sd = self._sounddevice()
+        except Exception as e:
+            print(f"[Audio] PortAudio indisponible: {e}")
+            return None
+
+        try:
+            # Essayer le peripherique par defaut
+            default = sd.default.device[0]
+            if default is not None and default >= 0:
+                return default
+        except Exception:
+            pass
+
+        # Chercher un peripherique d'entree disponible
+        try:
+            devices = sd.query_devices()
+            for i, dev in enumerate(devices):
+                if dev['max_input_channels'] > 0:
+                    print(f"[Audio] Peripherique trouve: {dev['name']}")
+                    return i
+        except Exception as e:
+            print(f"[Audio] Erreur lors de la recherche: {e}")
+
+        return None
+
+    @property
+    def available(self) -> bool:
+        return self.device is not None
+
+    def native_format(self) -> Tuple[int, int]:
+        info = self._sounddevice().query_devices(self.device, 'input')
+        rate = int(info['default_samplerate']) or SAMPLE_RATE
+        # Certains peripheriques virtuels annoncent 32 canaux
+        channels = max(1, min(int(info['max_input_channels']), NATIVE_MAX_CHANNELS))
+        return rate, channels
+
+    def open_stream(self, samplerate: int, channels: int, callback,
+                    blocksize: int = 0, latency=None, dtype: str = "float32"):
+        return self._sounddevice().InputStream(
+            device=self.device,
+            samplerate=samplerate,
+            channels=channels,
+            callback=callback,
+            blocksize=blocksize,
+            latency=latency,
+            dtype=dtype
+        )
+
+
+class GeneratedStream:
+    """Flux pilote par un thread : appelle le callback avec les blocs de read()
+
+    En temps reel, les blocs sont cadences sur l'horloge (comme un micro) ;
+    sinon ils sont livres aussi vite que le consommateur les accepte.
+    """
+
+    def __init__(self, source: AudioSource, read, samplerate: int, callback,
+                 blocksize: int, dtype: str, realtime: bool):
+        self._source = source
+        self._read = read
+        self._rate = samplerate
+        self._callback = callback
+        self._blocksize = blocksize or DEFAULT_BLOCKSIZE
+        self._dtype = dtype
+        self._realtime = realtime
+        self._stop = threading.Event()
+        self._thread = None
+        self.active = False
+
+    def start(self):
+        self._stop.clear()
+        self.active = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        deadline = time.perf_counter()
+        while not self._stop.is_set():
+            block = self._read(self._blocksize)
+            if block is None or len(block) == 0:
+                self._source.finished.set()
+                break
+            if self._dtype == "int16":
+                block = np.multiply(np.clip(block, -1.0, 1.0), INT16_SCALE).astype(np.int16)
+            self._callback(block, len(block), None, None)
+            if self._realtime:
+                deadline += len(block) / self._rate
+                delay = deadline - time.perf_counter()
+                if delay > 0:
+                    self._stop.wait(delay)
+        self.active = False
+
+    def stop(self):
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+
+    def close(self):
+        self.stop()
+
+
+class FileSource(AudioSource):
+    """Fichier WAV (PCM 16 bits) ou brut s16le rejoue en temps reel ou au plus vite"""
+
+    finite = True
+
+    def __init__(self, path, realtime: bool = True, samplerate: int = SAMPLE_RATE,
+                 channels: int = CHANNELS, loop: bool = False):
+        super().__init__()
+        self.path = Path(path)
+        self.name = f"fichier {self.path.name}"
+        self.realtime = realtime
+        self.loop = loop
+        self._audio, self._rate = self._load(samplerate, channels)
+        self._position = 0
+
+    def _load(self, samplerate: int, channels: int):
+        if self.path.suffix.lower() == ".wav":
+            with wave.open(str(self.path), "rb") as wav:
+                if wav.getsampwidth() != 2:
+                    raise ValueError(f"{self.path}: seul le PCM 16 bits est supporte")
+                samplerate, channels = wav.getframerate(), wav.getnchannels()
+                data = wav.readframes(wav.getnframes())
+        else:
+            data = self.path.read_bytes()
+        frames = np.frombuffer(data, dtype=np.int16)
+        frames = frames[:len(frames) - len(frames) % channels].reshape(-1, channels)
+        return np.multiply(frames, 1.0 / INT16_SCALE, dtype=np.float32), samplerate
+
+    @property
+    def duration(self) -> float:
+        return len(self._audio) / self._rate
+
+    def native_format(self) -> Tuple[int, int]:
+        return self._rate, self._audio.shape[1]
+
+    def _read(self, frames: int) -> Optional[np.ndarray]:
+        if self._position >= len(self._audio):
+            if not self.loop:
+                return None
+            self._position = 0
+        block = self._audio[self._position:self._position + frames]
+        self._position += len(block)
+        return block
+
+    def rewind(self):
+        self._position = 0
+        self.finished.clear()
+
+    def open_stream(self, samplerate: int, channels: int, callback,
+                    blocksize: int = 0, latency=None, dtype: str = "float32"):
+        self._check_format(samplerate, channels)
+        return GeneratedStream(self, self._read, samplerate, callback, blocksize, dtype,
+                               self.realtime)
+
+
+class StdinSource(AudioSource):
+    """PCM brut s16le lu sur l'entree standard (cadence par le producteur du pipe)"""
+
+    name = "stdin"
+    finite = True
+    realtime = False  # Le pipe retient le producteur si le consommateur est en retard
+
+    def __init__(self, samplerate: int = SAMPLE_RATE, channels: int = CHANNELS, stream=None):
+        super().__init__()
+        self._rate = samplerate
+        self._channels = channels
+        self._stream = stream or sys.stdin.buffer
+
+    def native_format(self) -> Tuple[int, int]:
+        return self._rate, self._channels
+
+    def _read(self, frames: int) -> Optional[np.ndarray]:
+        data = self._stream.read(frames * self._channels * 2)
+        if not data:
+            return None
+        samples = np.frombuffer(data[:len(data) - len(data) % (2 * self._channels)], dtype=np.int16)
+        return np.multiply(samples.reshape(-1, self._channels), 1.0 / INT16_SCALE, dtype=np.float32)
+
+    def open_stream(self, samplerate: int, channels: int, callback,
+                    blocksize: int = 0, latency=None, dtype: str = "float32"):
+        self._check_format(samplerate, channels)
+        return GeneratedStream(self, self._read, samplerate, callback, blocksize, dtype,
+                               realtime=False)
+
+
+class SyntheticSource(AudioSource):
+    """Generateur de test : sinus, bruit blanc ou rafales de "parole" (sinus module)
+
+    kind="speech" alterne 1.5 s de signal et 0.5 s de silence bruite, de quoi
+    exercer la VAD et les niveaux sans enregistrement reel.
+    """
+
+    KINDS = ("tone", "noise", "speech")
+
+    def __init__(self, kind: str = "tone", frequency: float = 440.0, amplitude: float = 0.1,
+                 samplerate: int = SAMPLE_RATE, channels: int = CHANNELS,
+                 realtime: bool = True, duration: float = None, seed: int = 0):
+        super().__init__()
+        if kind not in self.KINDS:
+            raise ValueError(f"type de signal inconnu: {kind}")
+        self.name = f"synthetique {kind}"
+        self.kind = kind
+        self.frequency = frequency
+        self.amplitude = amplitude
+        self.realtime = realtime
+        self.finite = duration is not None
+        self._rate = samplerate
+        self._channels = channels
+        self._limit = int(duration * samplerate) if duration is not None else None
+        self._rng = np.random.default_rng(seed)
+        self._position = 0
+
+    def native_format(self) -> Tuple[int, int]:
+        return self._rate, self._channels
+
+    def _read(self, frames: int) -> Optional[np.ndarray]:
+        if self._limit is not None:
+            frames = min(frames, self._limit - self._position)
+            if frames <= 0:
+                return None
+        t = (self._position + np.arange(frames)) / self._rate
+        self._position += frames
+
+        if self.kind == "noise":
+            signal = self.amplitude * self._rng.standard_normal(frames)
+        else:
+            signal = self.amplitude * np.sin(2 * np.pi * self.frequency * t)
+            if self.kind == "speech":
+                # Enveloppe syllabique (4 Hz) et pauses de 0.5 s toutes les 2 s
+                envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t)
+                signal = signal * envelope * ((t % 2.0) < 1.5)
+                signal += 0.002 * self._rng.standard_normal(frames)
+
+        block = signal.astype(np.float32)[:, None]
+        return np.repeat(block, self._channels, axis=1) if self._channels > 1 else block
+
+    def open_stream(self, samplerate: int, channels: int, callback,
+                    blocksize: int = 0, latency=None, dtype: str = "float32"):
+        self._check_format(samplerate, channels)
+        return GeneratedStream(self, self._read, samplerate, callback, blocksize, dtype,
+                               self.realtime)
+
+
+def create_source(spec: str = "device") -> AudioSource:
+    """Source depuis une description texte (reglage audio_source, scripts)
+
+        device | device:<index>
+        file:<chemin> | file-fast:<chemin>      (WAV 16 bits ou brut s16le 16 kHz)
+        stdin | stdin:<taux>:<canaux>           (PCM s16le)
+        synthetic:<tone|noise|speech>[:<frequence>]
+    """
+    kind, _, arg = (spec or "device").partition(":")
+    if kind == "device":
+        return DeviceSource(int(arg) if arg else None)
+    if kind in ("file", "file-fast"):
+        return FileSource(arg, realtime=(kind == "file"))
+    if kind == "stdin":
+        rate, _, channels = arg.partition(":")
+        return StdinSource(int(rate or SAMPLE_RATE), int(channels or CHANNELS))
+    if kind == "synthetic":
+        signal, _, frequency = arg.partition(":")
+        return SyntheticSource(signal or "tone", float(frequency or 440.0))
+    raise ValueError(f"source audio inconnue: {spec}")
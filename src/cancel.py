@@ -0,0 +1,48 @@
+"""Jeton d'annulation partage par la file, le transcripteur et ses processus"""
+import threading
+import time
+
+
+class CancelToken(threading.Event):
+    """Annulation d'une transcription, horodatee pour mesurer la liberation du CPU
+
+    Les callbacks enregistres sont appeles une fois, par le thread qui annule :
+    ils interrompent ce qui ne peut pas verifier le jeton entre deux segments
+    (morceaux en cours dans le pool parallele, processus enfant, connexion au serveur).
+    """
+
+    requested_at = None
+
+    def __init__(self):
+        super().__init__()
+        self._callbacks = []
+        self._callbacks_lock = threading.Lock()
+
+    def add_callback(self, callback):
+        """Enregistre callback, appele immediatement si l'annulation a deja eu lieu"""
+        with self._callbacks_lock:
+            if not self.is_set():
+                self._callbacks.append(callback)
+                return
+        self._run(callback)
+
+    def remove_callback(self, callback):
+        with self._callbacks_lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def set(self):
+        with self._callbacks_lock:
+            if self.requested_at is None:
+                self.requested_at = time.perf_counter()
+            super().set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            self._run(callback)
+
+    @staticmethod
+    def _run(callback):
+        try:
+            callback()
+        except Exception as e:
+            print(f"[Cancel] Erreur pendant l'annulation: {e}")
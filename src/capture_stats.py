@@ -0,0 +1,67 @@
+"""Statistiques du callback de capture (xruns, duree, gigue)"""
+import time
+
+
+class CaptureStats:
+    """Compteurs mis a jour depuis le callback audio, resumes a l'arret
+
+    Pour chaque callback : duree d'execution (comparee au budget, la duree
+    du bloc) et ecart entre l'intervalle reel depuis le callback precedent
+    et l'intervalle attendu (gigue). Les drapeaux overflow/underflow de
+    PortAudio sont comptes au lieu d'etre affiches depuis le callback.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self, rate: int = 0):
+        self.rate = rate
+        self.callbacks = 0
+        self.overflows = 0
+        self.underflows = 0
+        self.max_block = 0
+        self._total_cost = 0.0
+        self.max_cost = 0.0
+        self._total_jitter = 0.0
+        self.max_jitter = 0.0
+        self._last_start = None
+
+    @property
+    def xruns(self) -> int:
+        return self.overflows + self.underflows
+
+    def record_status(self, status):
+        if getattr(status, "input_overflow", False):
+            self.overflows += 1
+        if getattr(status, "input_underflow", False):
+            self.underflows += 1
+
+    def record(self, start: float, frames: int):
+        """A appeler en fin de callback avec l'instant d'entree"""
+        cost = time.perf_counter() - start
+        self.callbacks += 1
+        self._total_cost += cost
+        self.max_cost = max(self.max_cost, cost)
+        self.max_block = max(self.max_block, frames)
+        if self._last_start is not None and self.rate:
+            jitter = abs((start - self._last_start) - frames / self.rate)
+            self._total_jitter += jitter
+            self.max_jitter = max(self.max_jitter, jitter)
+        self._last_start = start
+
+    def load(self) -> float:
+        """Duree maximale du callback rapportee a la duree d'un bloc"""
+        if not self.rate or not self.max_block:
+            return 0.0
+        return self.max_cost / (self.max_block / self.rate)
+
+    def summary(self) -> str:
+        if not self.callbacks:
+            return "aucun callback"
+        mean_cost = self._total_cost / self.callbacks * 1e6
+        mean_jitter = self._total_jitter / max(1, self.callbacks - 1) * 1000
+        return (f"{self.callbacks} callbacks de {self.max_block} echantillons, "
+                f"duree moy {mean_cost:.0f} us / max {self.max_cost * 1e6:.0f} us "
+                f"({self.load() * 100:.0f}% du bloc), "
+                f"gigue moy {mean_jitter:.1f} ms / max {self.max_jitter * 1000:.1f} ms, "
+                f"xruns {self.overflows} overflow / {self.underflows} underflow")
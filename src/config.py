@@ -1,4 +1,5 @@
 """Configuration globale de l'application"""
+import os
 
 # Modèle Whisper à utiliser (tiny, base, small, medium, large-v3)
 # tiny = ultra rapide, précision moyenne
@@ -20,7 +21,150 @@ CHANNELS = 1  # Mono
 
 # Hotkey
 HOTKEY = "ctrl+space"
+CANCEL_HOTKEY = "ctrl+alt+space"  # Annule la transcription en cours
 
 # Durée minimale d'enregistrement (secondes)
 MIN_RECORDING_DURATION = 0.3
 
+
+# Transcription en continu pendant l'enregistrement (fenetres glissantes)
+STREAMING_WINDOW = 15.0  # Secondes d'audio non validees declenchant un decodage intermediaire
+STREAMING_COMMIT_MARGIN = 3.0  # Les segments finissant dans ces dernieres secondes restent provisoires
+
+# Budget memoire (Mo) du pool de modeles Whisper gardes en cache (eviction LRU)
+MODEL_POOL_BUDGET_MB = 2048
+
+# Secondes d'inactivite avant dechargement du modele (0 = jamais)
+MODEL_UNLOAD_DELAY = 300
+
+# Inference de chauffe apres chargement et maintien "a chaud" du modele
+MODEL_WARMUP = True
+KEEP_WARM_INTERVAL = 120  # Secondes d'inactivite avant une nouvelle inference de chauffe
+
+# Profils de decodage : compromis vitesse / precision
+#   latency  = decodage glouton, pas de repli en temperature (dictees courtes)
+#   balanced = beam search avec repli limite
+#   accuracy = beam search avec repli complet (comportement faster-whisper par defaut)
+# cpu_threads = 0 : valeur par defaut de CTranslate2
+DECODING_PROFILE = "balanced"
+DECODING_PROFILES = {
+    "latency": {
+        "beam_size": 1,
+        "best_of": 1,
+        "temperature": [0.0],
+        "condition_on_previous_text": False,
+        "without_timestamps": True,
+        "cpu_threads": os.cpu_count() or 0,
+        "vad_threshold": 0.5,
+        "min_speech_duration_ms": 250,
+        "min_silence_duration_ms": 500,
+    },
+    "balanced": {
+        "beam_size": 5,
+        "best_of": 5,
+        "temperature": [0.0, 0.2, 0.4],
+        "condition_on_previous_text": True,
+        "without_timestamps": False,
+        "cpu_threads": 0,
+        "vad_threshold": 0.5,
+        "min_speech_duration_ms": 250,
+        "min_silence_duration_ms": 2000,
+    },
+    "accuracy": {
+        "beam_size": 5,
+        "best_of": 5,
+        "temperature": [0.0, 0.2, 0.4, 0.6, 0.8, 1.0],
+        "condition_on_previous_text": True,
+        "without_timestamps": False,
+        "cpu_threads": os.cpu_count() or 0,
+        "vad_threshold": 0.35,
+        "min_speech_duration_ms": 250,
+        "min_silence_duration_ms": 2000,
+    },
+}
+
+# Transcription en deux passes : brouillon rapide puis correction par le modele principal
+DRAFT_MODEL = "base"
+
+# Transcription parallele des longs enregistrements (processus separes)
+PARALLEL_WORKERS = 0  # Nombre de processus (0 = desactive)
+PARALLEL_MIN_DURATION = 120.0  # Duree minimale (s) pour decouper l'enregistrement
+PARALLEL_CHUNK_SECONDS = 60.0  # Taille cible des morceaux (coupes sur les silences)
+PARALLEL_OVERLAP_SECONDS = 1.0  # Chevauchement quand aucun silence n'est trouve
+PARALLEL_RAM_FRACTION = 0.8  # Part de la RAM disponible utilisable par les copies du modele
+
+# Modele heberge dans un processus enfant (audio en memoire partagee)
+TRANSCRIBER_PROCESS = False
+TRANSCRIBER_PROCESS_STOP_TIMEOUT = 10.0  # Secondes avant arret force d'un ancien processus
+
+# Serveur de transcription local (python main.py --server) partage entre plusieurs outils
+SERVER_SOCKET_NAME = "openwhisper.sock"  # Dans le dossier des parametres
+SERVER_TCP_PORT = 8765  # Repli sur 127.0.0.1 sans socket Unix (Windows)
+SERVER_WORKERS = 2  # Transcriptions simultanees (num_workers de CTranslate2)
+SERVER_QUEUE_SIZE = 4  # Requetes en attente au-dela : refusees ("busy")
+SERVER_MAX_AUDIO_SECONDS = 1800  # Taille maximale d'une requete
+SERVER_SAMPLE_RATES = (8000, 16000, 22050, 32000, 44100, 48000)  # Taux acceptes du client
+SERVER_MAX_AUDIO_BYTES = SERVER_MAX_AUDIO_SECONDS * SAMPLE_RATE * 2  # PCM 16 bits mono a SAMPLE_RATE
+SERVER_TIMEOUT = 5.0  # Connexion et envoi de l'audio (secondes)
+
+# Detection des boucles de decodage (hallucinations repetitives)
+WATCHDOG_MAX_COMPRESSION_RATIO = 2.4  # Texte trop compressible = repetitions
+WATCHDOG_MAX_TOKENS_PER_SECOND = 15.0  # Debit de parole humain tres inferieur
+WATCHDOG_NGRAM = 3  # Taille des n-grammes surveilles dans un segment
+WATCHDOG_MAX_NGRAM_REPEATS = 4  # Occurrences d'un meme n-gramme dans un segment
+WATCHDOG_MAX_SEGMENT_REPEATS = 2  # Repetitions sur place d'un segment identique avant de l'ecarter
+WATCHDOG_MAX_SKIPS = 3  # Segments anormaux consecutifs ecartes avant interruption du decodage
+
+# Budget de latence par dictee avec repli sur un petit modele precharge
+LATENCY_BUDGET = 0  # Secondes (0 = desactive)
+FALLBACK_MODEL = "base"
+
+# Tampon d'enregistrement preallloue (agrandi par doublement si necessaire)
+RECORD_BUFFER_SECONDS = 60
+AUDIO_STORAGE = "float32"  # float32 ou int16 (moitie de memoire, une conversion a l'arret)
+
+# Flux audio chaud : pre-roll ajoute au debut de chaque enregistrement
+PREROLL_SECONDS = 0.5
+
+# Enregistrements longs : au-dela de ce seuil l'audio est ecrit sur disque (0 = jamais)
+SPILL_THRESHOLD_SECONDS = 600
+
+# Capture au taux natif du peripherique (downmix + reechantillonnage vers SAMPLE_RATE)
+NATIVE_MAX_CHANNELS = 2  # Certains peripheriques virtuels annoncent 32 canaux
+RESAMPLE_QUEUE_BLOCKS = 64  # Blocs en attente de reechantillonnage avant perte
+
+# VAD cote client : silences retires avant le modele, rien n'est decode sans parole
+VAD_MODE = "off"  # off, energy ou silero (desactivee par defaut : les pauses sont raccourcies)
+VAD_FRAME_MS = 30
+VAD_MARGIN_DB = 10.0  # Parole = bruit ambiant + marge
+VAD_MIN_THRESHOLD_DB = -55.0  # Seuil absolu minimal (dBFS)
+VAD_MAX_FLOOR_DB = -45.0  # Bruit ambiant estime plafonne (sans calibration)
+VAD_PAD_MS = 200  # Marge conservee autour de la parole (pauses ramenees a 2x)
+VAD_MIN_SPEECH_MS = 250  # En dessous : aucune parole, le modele n'est pas appele
+VAD_CALIBRATION_SECONDS = 0.5  # Mesure du bruit ambiant au demarrage
+
+# Niveaux audio calcules une fois par bloc (barres de l'overlay, RMS, crete)
+LEVEL_BARS = 6
+CLIP_LEVEL = 0.99  # Crete consideree comme saturation
+
+# Source audio : device, file:<wav>, file-fast:<wav>, stdin, synthetic:<tone|noise|speech>
+AUDIO_SOURCE = "device"
+
+# Reglages du flux de capture (latence/robustesse)
+AUDIO_BLOCKSIZE = 0  # Echantillons par callback (0 = choix de PortAudio, "auto" = sonde)
+AUDIO_LATENCY = "high"  # Classe de latence PortAudio : low ou high
+CAPTURE_DTYPE = "float32"  # Format des echantillons livres par le peripherique
+BLOCKSIZE_CANDIDATES = (64, 128, 256, 512, 1024, 2048)  # Sonde : du plus petit au plus grand
+BLOCKSIZE_PROBE_SECONDS = 0.5  # Duree d'essai de chaque taille
+BLOCKSIZE_MAX_LOAD = 0.5  # Duree max du callback / duree du bloc pour etre retenu
+
+# Reduction de bruit spectrale avant la transcription (ventilation, climatisation)
+NOISE_SUPPRESSION = False
+DENOISE_NPERSEG = 512  # Taille de la fenetre STFT (32 ms), recouvrement 75%
+DENOISE_STRENGTH = 1.5  # Seuil du gate = profil de bruit x facteur
+DENOISE_FLOOR = 0.1  # Attenuation maximale (-20 dB) : evite le bruit musical
+DENOISE_PROFILE_SECONDS = 1.0  # Bruit de reference maximal (pre-roll ou silence initial)
+
+# Boucle d'evenements de l'application (aucun reveil periodique au repos)
+ANIMATION_INTERVAL = 0.1  # Image du spinner de l'icone (chargement, transcription)
+EVENT_IDLE_TIMEOUT_WINDOWS = 1.0  # Sous Windows : reveil pour que Ctrl+C reste pris en compte
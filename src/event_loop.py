@@ -0,0 +1,137 @@
+"""Boucle d'evenements de l'application : toutes les transitions d'etat sur un seul thread
+
+Les autres threads (hotkey, menu, file de transcription, chargement du
+modele) ne modifient plus l'etat : ils postent un evenement. Au repos la
+boucle est bloquee sur la file sans delai d'attente, donc aucun reveil
+periodique ; le minuteur d'animation de l'icone n'existe que pendant un
+chargement ou une transcription.
+"""
+import queue
+import time
+from src.config import ANIMATION_INTERVAL
+
+# Evenements
+TOGGLE = "toggle"  # Appui sur le hotkey
+MODEL_READY = "model_ready"  # Chargement termine (succes ou erreur)
+MODEL_WAIT = "model_wait"  # Dictee en file bloquee jusqu'au chargement (evenement a liberer)
+TRANSCRIPTION_DONE = "transcription_done"  # Dictee traitee (ou annulee) par la file
+SETTINGS_SAVED = "settings_saved"  # Fenetre de parametres validee
+QUIT = "quit"
+
+
+class AppState:
+    """Etat de l'application, modifie uniquement par le thread de la boucle"""
+
+    LOADING = "loading"
+    READY = "ready"
+    ERROR = "error"
+
+    def __init__(self):
+        self.model = self.LOADING
+        self.recording = False
+        self.pending = 0  # Dictees soumises a la file et pas encore traitees
+
+    @property
+    def transcribing(self) -> bool:
+        return self.pending > 0
+
+    @property
+    def animated(self) -> bool:
+        """L'icone tourne : chargement (hors enregistrement) ou transcription"""
+        if self.recording:
+            return False
+        return self.transcribing or self.model == self.LOADING
+
+    @property
+    def icon(self) -> str:
+        """Etat d'icone correspondant (voir OpenWhisperApp._create_icon_image)"""
+        if self.recording:
+            return "recording"
+        if self.transcribing:
+            return "queued" if self.model == self.LOADING else "transcribing"
+        if self.model == self.LOADING:
+            return "loading"
+        if self.model == self.ERROR:
+            return "error"
+        return "idle"
+
+
+class EventLoop:
+    """File d'evenements a un seul consommateur, avec un minuteur d'animation optionnel"""
+
+    def __init__(self, animated=None, on_tick=None, interval: float = ANIMATION_INTERVAL,
+                 idle_timeout: float = None):
+        self._events = queue.Queue()
+        self._handlers = {}
+        self._animated = animated or (lambda: False)
+        self._on_tick = on_tick
+        self._interval = interval
+        self._idle_timeout = idle_timeout  # None : aucun reveil au repos
+        self._stats = {"events": 0, "ticks": 0, "idle_wakeups": 0, "total_latency": 0.0,
+                       "max_latency": 0.0}
+
+    def on(self, event: str, handler):
+        self._handlers[event] = handler
+
+    def post(self, event: str, *args):
+        """Poste un evenement (depuis n'importe quel thread)"""
+        self._events.put((event, args, time.perf_counter()))
+
+    def run(self):
+        """Traite les evenements jusqu'a QUIT (bloquant)"""
+        next_tick = None
+        while True:
+            if self._animated():
+                now = time.perf_counter()
+                next_tick = next_tick or now + self._interval
+                timeout = max(0.0, next_tick - now)
+            else:
+                next_tick = None
+                timeout = self._idle_timeout
+
+            try:
+                event, args, posted_at = self._events.get(timeout=timeout)
+            except queue.Empty:
+                event = None
+            except KeyboardInterrupt:
+                print("\nArret de l'application...")
+                return
+
+            if event is None:
+                if next_tick is None:
+                    self._stats["idle_wakeups"] += 1
+                    continue
+            else:
+                latency = time.perf_counter() - posted_at
+                stats = self._stats
+                stats["events"] += 1
+                stats["total_latency"] += latency
+                stats["max_latency"] = max(stats["max_latency"], latency)
+                if event == QUIT:
+                    return
+                handler = self._handlers.get(event)
+                try:
+                    if handler:
+                        handler(*args)
+                except Exception as e:
+                    print(f"[Events] Erreur pendant '{event}': {e}")
+
+            now = time.perf_counter()
+            if next_tick is not None and now >= next_tick:
+                next_tick += self._interval
+                if next_tick <= now:
+                    # Apres un traitement long : pas de rafale d'images en retard
+                    next_tick = now + self._interval
+                self._stats["ticks"] += 1
+                if self._on_tick:
+                    self._on_tick()
+
+    def stats(self) -> dict:
+        return dict(self._stats)
+
+    def summary(self) -> str:
+        stats = self._stats
+        average = stats["total_latency"] / stats["events"] * 1000 if stats["events"] else 0.0
+        return (f"{stats['events']} evenements (latence moy {average:.2f} ms, "
+                f"max {stats['max_latency'] * 1000:.2f} ms), {stats['ticks']} images d'animation, "
+                f"{stats['idle_wakeups']} reveils au repos")
@@ -0,0 +1,69 @@
+"""Mesure des niveaux audio, calculee une fois par bloc pour tous les consommateurs"""
+from typing import NamedTuple, Optional
+import numpy as np
+from src.config import LEVEL_BARS, CLIP_LEVEL
+
+
+class Levels(NamedTuple):
+    seq: int  # Numero du bloc (change a chaque publication)
+    bars: np.ndarray  # Crete par barre de l'overlay
+    rms: float
+    peak: float
+
+
+class LevelMeter:
+    """Barres, RMS et crete d'un bloc, publies dans une case "derniere valeur"
+
+    process() est appele depuis le callback audio : quelques reductions NumPy
+    sur le bloc remodele en (barres, echantillons), sans copie. Les
+    consommateurs (overlay, statistiques) lisent latest() a leur rythme ;
+    la publication est une simple affectation de reference (atomique), sans
+    verrou ni file d'attente.
+    """
+
+    def __init__(self, num_bars: int = LEVEL_BARS):
+        self.num_bars = num_bars
+        self._latest: Optional[Levels] = None
+        self.reset()
+
+    def reset(self):
+        """Nouvel enregistrement"""
+        self._latest = None
+        self._seq = 0
+        self._sum_squares = 0.0
+        self._count = 0
+        self._peak = 0.0
+        self._clipped = 0
+
+    def process(self, samples: np.ndarray):
+        samples = samples.reshape(-1)
+        chunk = len(samples) // self.num_bars
+        if chunk == 0:
+            return
+
+        bars = np.abs(samples[:chunk * self.num_bars].reshape(self.num_bars, chunk)).max(axis=1)
+        sum_squares = float(np.dot(samples, samples))
+        peak = float(bars.max())
+
+        self._sum_squares += sum_squares
+        self._count += len(samples)
+        self._peak = max(self._peak, peak)
+        if peak >= CLIP_LEVEL:
+            self._clipped += 1
+
+        self._seq += 1
+        self._latest = Levels(self._seq, bars, (sum_squares / len(samples)) ** 0.5, peak)
+
+    def latest(self) -> Optional[Levels]:
+        return self._latest
+
+    def summary(self) -> Optional[str]:
+        """Niveau moyen et crete de l'enregistrement (dBFS)"""
+        if self._count == 0:
+            return None
+        rms = (self._sum_squares / self._count) ** 0.5
+        text = (f"niveau moyen {20 * np.log10(rms + 1e-10):.0f} dBFS, "
+                f"crete {20 * np.log10(self._peak + 1e-10):.0f} dBFS")
+        if self._clipped:
+            text += f", {self._clipped} bloc(s) sature(s)"
+        return text
@@ -0,0 +1,143 @@
+"""Mesure et liberation de la memoire du processus (cross-platform)"""
+import os
+import platform
+
+IS_WINDOWS = platform.system() == "Windows"
+IS_LINUX = platform.system() == "Linux"
+
+
+def get_rss_mb():
+    """Retourne la memoire residente du processus en Mo (None si indisponible)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except Exception:
+        pass
+
+    try:
+        if IS_LINUX:
+            with open("/proc/self/statm", "r") as f:
+                resident_pages = int(f.read().split()[1])
+            return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+        if IS_WINDOWS:
+            import ctypes
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [
+                    ("cb", wintypes.DWORD),
+                    ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t),
+                    ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t),
+                    ("PeakPagefileUsage", ctypes.c_size_t),
+                ]
+
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            process = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+                return counters.WorkingSetSize / (1024 * 1024)
+    except Exception:
+        pass
+
+    return None
+
+
+def get_available_mb():
+    """Retourne la memoire disponible du systeme en Mo (None si inconnue)"""
+    try:
+        import psutil
+        return psutil.virtual_memory().available / (1024 * 1024)
+    except Exception:
+        pass
+
+    try:
+        if IS_LINUX:
+            with open("/proc/meminfo", "r") as f:
+                for line in f:
+                    if line.startswith("MemAvailable:"):
+                        return int(line.split()[1]) / 1024
+
+        if IS_WINDOWS:
+            import ctypes
+
+            class MEMORYSTATUSEX(ctypes.Structure):
+                _fields_ = [
+                    ("dwLength", ctypes.c_ulong),
+                    ("dwMemoryLoad", ctypes.c_ulong),
+                    ("ullTotalPhys", ctypes.c_ulonglong),
+                    ("ullAvailPhys", ctypes.c_ulonglong),
+                    ("ullTotalPageFile", ctypes.c_ulonglong),
+                    ("ullAvailPageFile", ctypes.c_ulonglong),
+                    ("ullTotalVirtual", ctypes.c_ulonglong),
+                    ("ullAvailVirtual", ctypes.c_ulonglong),
+                    ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+                ]
+
+            status = MEMORYSTATUSEX()
+            status.dwLength = ctypes.sizeof(status)
+            if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+                return status.ullAvailPhys / (1024 * 1024)
+    except Exception:
+        pass
+
+    return None
+
+
+def release_memory():
+    """Force la liberation de la memoire inutilisee vers le systeme"""
+    import gc
+    gc.collect()
+
+    try:
+        if IS_LINUX:
+            import ctypes
+            ctypes.CDLL("libc.so.6").malloc_trim(0)
+        elif IS_WINDOWS:
+            import ctypes
+            process = ctypes.windll.kernel32.GetCurrentProcess()
+            ctypes.windll.kernel32.SetProcessWorkingSetSize(process, ctypes.c_size_t(-1), ctypes.c_size_t(-1))
+    except Exception:
+        pass
+
+
+def lock_resident_memory() -> bool:
+    """Verrouille les pages actuelles du processus en RAM (mlockall, Linux/macOS)
+
+    MCL_CURRENT seulement : les pages allouees ensuite (modele charge plus
+    tard) ne sont pas couvertes, l'appel est a refaire apres chaque chargement.
+    Necessite une limite RLIMIT_MEMLOCK suffisante ; retourne False sinon.
+    """
+    if IS_WINDOWS:
+        return False
+    try:
+        import ctypes
+        import ctypes.util
+        MCL_CURRENT = 1
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if libc.mlockall(MCL_CURRENT) != 0:
+            errno = ctypes.get_errno()
+            print(f"[Memory] mlockall refuse: {os.strerror(errno)}")
+            return False
+        return True
+    except Exception as e:
+        print(f"[Memory] mlockall indisponible: {e}")
+        return False
+
+
+def unlock_resident_memory():
+    """Annule lock_resident_memory()"""
+    if IS_WINDOWS:
+        return
+    try:
+        import ctypes
+        import ctypes.util
+        ctypes.CDLL(ctypes.util.find_library("c")).munlockall()
+    except Exception:
+        pass
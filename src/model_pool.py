@@ -0,0 +1,187 @@
+"""Pool de modeles Whisper avec budget memoire et eviction LRU"""
+import threading
+from collections import OrderedDict
+from src.config import MODEL_POOL_BUDGET_MB
+
+# Empreinte memoire approximative (Mo) des modeles CTranslate2 en float16
+MODEL_MEMORY_MB = {
+    "tiny": 75,
+    "base": 145,
+    "small": 485,
+    "medium": 1530,
+    "large-v3": 3090,
+}
+
+# Facteur applique selon la precision de calcul
+COMPUTE_TYPE_FACTOR = {
+    "int8": 0.5,
+    "int8_float16": 0.55,
+    "int8_float32": 0.55,
+    "float16": 1.0,
+    "float32": 2.0,
+}
+
+
+def estimate_model_mb(model_name: str, compute_type: str) -> int:
+    """Estime la memoire occupee par un modele charge"""
+    base = MODEL_MEMORY_MB.get(model_name, MODEL_MEMORY_MB["large-v3"])
+    return int(base * COMPUTE_TYPE_FACTOR.get(compute_type, 1.0))
+
+
+class ModelPool:
+    """Cache de modeles cle (model, device, compute_type) avec eviction LRU
+
+    Le nombre de threads CPU ne fait pas partie de la cle : un changement de
+    profil qui ne modifie que lui ne recharge pas le modele, il s'applique au
+    prochain chargement depuis le disque (un modele deja en memoire garde ses
+    threads, voir loaded_threads()).
+    Un modele evince n'est libere qu'une fois la derniere reference relachee :
+    une transcription en cours sur l'ancien modele se termine normalement.
+    Les modeles epingles (modele principal actif, modele auxiliaire en cours
+    d'utilisation) ne sont jamais evinces : la memoire comptee reste celle
+    reellement occupee.
+    """
+
+    def __init__(self, budget_mb: int = MODEL_POOL_BUDGET_MB, num_workers: int = 1):
+        self._budget_mb = budget_mb
+        self.num_workers = num_workers  # Transcriptions simultanees par modele (serveur)
+        self._models = OrderedDict()  # key -> WhisperModel (du moins au plus recent)
+        self._lock = threading.Lock()
+        self._load_locks = {}  # key -> Lock (evite deux chargements du meme modele)
+        self._reserved = {}  # nom -> Mo occupes hors du pool (copies du modele des processus paralleles)
+        self._pinned = {}  # key -> nombre d'utilisateurs (protege de l'eviction)
+        self._threads = {}  # key -> threads CPU du chargement
+
+    @staticmethod
+    def make_key(model_name: str, device: str, compute_type: str) -> tuple:
+        return (model_name, device, compute_type)
+
+    def get(self, key: tuple, cpu_threads: int = 0, pin: bool = False):
+        """Retourne le modele (charge depuis le disque si absent du pool)
+
+        Args:
+            cpu_threads: Threads CPU d'un nouveau chargement (0 = defaut de CTranslate2)
+            pin: Epingle le modele avant de le retourner (unpin() a la fin de l'utilisation)
+        """
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                if pin:
+                    self._pin(key)
+                print(f"[Pool] Modele '{key[0]}' deja en memoire")
+                return self._models[key]
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    if pin:
+                        self._pin(key)
+                    return self._models[key]
+
+            model = self._load(key, cpu_threads)
+
+            with self._lock:
+                self._models[key] = model
+                self._threads[key] = cpu_threads
+                self._load_locks.pop(key, None)
+                if pin:
+                    self._pin(key)
+                self._evict_over_budget(keep=key)
+            return model
+
+    def peek(self, key: tuple, pin: bool = False):
+        """Retourne le modele s'il est deja en memoire (None sinon), sans le charger
+
+        Args:
+            pin: Epingle le modele trouve (unpin() a la fin de l'utilisation)
+        """
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                if pin:
+                    self._pin(key)
+            return model
+
+    def loaded_threads(self, key: tuple):
+        """Threads CPU avec lesquels le modele a ete charge (None s'il est absent)"""
+        with self._lock:
+            return self._threads.get(key)
+
+    def _pin(self, key: tuple):
+        self._pinned[key] = self._pinned.get(key, 0) + 1
+
+    def unpin(self, key: tuple):
+        """Fin d'utilisation d'un modele epingle par get() ou peek()"""
+        with self._lock:
+            count = self._pinned.get(key, 0) - 1
+            if count > 0:
+                self._pinned[key] = count
+            else:
+                self._pinned.pop(key, None)
+
+    def _load(self, key: tuple, cpu_threads: int):
+        from faster_whisper import WhisperModel
+        model_name, device, compute_type = key
+        print(f"[Whisper] Chargement du modele '{model_name}'...")
+        return WhisperModel(
+            model_name,
+            device=device,
+            compute_type=compute_type,
+            cpu_threads=cpu_threads,
+            num_workers=self.num_workers
+        )
+
+    def _evict_over_budget(self, keep: tuple):
+        """Evince les modeles les moins recemment utilises et non epingles (appele sous verrou)"""
+        while self.used_mb() > self._budget_mb:
+            victim = next((k for k in self._models if k != keep and k not in self._pinned), None)
+            if victim is None:
+                break
+            del self._models[victim]
+            self._threads.pop(victim, None)
+            print(f"[Pool] Modele '{victim[0]}' evince (budget {self._budget_mb} Mo)")
+
+    def used_mb(self) -> int:
+        """Memoire estimee occupee par les modeles du pool et les reservations"""
+        return sum(estimate_model_mb(k[0], k[2]) for k in self._models) + sum(self._reserved.values())
+
+    @property
+    def budget_mb(self) -> int:
+        return self._budget_mb
+
+    def reserve(self, name: str, mb: int, keep: tuple = None):
+        """Compte mb dans le budget (memoire hors du pool) et evince si necessaire"""
+        with self._lock:
+            self._reserved[name] = mb
+            self._evict_over_budget(keep=keep)
+
+    def unreserve(self, name: str):
+        with self._lock:
+            self._reserved.pop(name, None)
+
+    def set_budget(self, budget_mb: int, keep: tuple = None):
+        """Change le budget memoire et evince si necessaire"""
+        with self._lock:
+            self._budget_mb = budget_mb
+            self._evict_over_budget(keep=keep)
+
+    def evict(self, key: tuple) -> bool:
+        """Retire un modele du pool, retourne True s'il etait present"""
+        with self._lock:
+            self._threads.pop(key, None)
+            return self._models.pop(key, None) is not None
+
+    def clear(self) -> int:
+        """Vide le pool, retourne le nombre de modeles retires"""
+        with self._lock:
+            count = len(self._models)
+            self._models.clear()
+            self._threads.clear()
+            return count
+
+    def __contains__(self, key: tuple) -> bool:
+        with self._lock:
+            return key in self._models
@@ -0,0 +1,182 @@
+"""Transcription parallele des longs enregistrements sur plusieurs processus"""
+import os
+import re
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, CancelledError
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+from src.config import (
+    SAMPLE_RATE, PARALLEL_CHUNK_SECONDS, PARALLEL_OVERLAP_SECONDS,
+)
+
+FRAME_SECONDS = 0.03  # Trame d'analyse d'energie
+SILENCE_SECONDS = 0.3  # Duree du silence recherche autour d'une coupe
+SILENCE_RATIO = 0.1  # Silence = energie < 10% de l'energie mediane
+
+# Modele du processus worker (charge une seule fois par processus)
+_worker_model = None
+_worker_language = None
+
+
+def find_chunks(audio: np.ndarray, chunk_seconds: float = PARALLEL_CHUNK_SECONDS,
+                overlap_seconds: float = PARALLEL_OVERLAP_SECONDS) -> list:
+    """Decoupe l'audio en morceaux d'environ chunk_seconds sur des silences
+
+    Retourne une liste de (debut, fin, chevauchement) en echantillons ; le
+    chevauchement est non nul quand aucun silence n'a ete trouve pres de la coupe.
+    """
+    frame = int(FRAME_SECONDS * SAMPLE_RATE)
+    n_frames = len(audio) // frame
+    chunk_frames = int(chunk_seconds / FRAME_SECONDS)
+    if n_frames <= chunk_frames:
+        return [(0, len(audio), 0)]
+
+    # Energie par trame puis moyenne glissante sur la duree de silence recherchee
+    energy = np.square(audio[:n_frames * frame].reshape(n_frames, frame)).mean(axis=1)
+    smooth = max(1, int(SILENCE_SECONDS / FRAME_SECONDS))
+    smoothed = np.convolve(energy, np.ones(smooth) / smooth, mode="same")
+    threshold = np.median(energy) * SILENCE_RATIO
+    search = chunk_frames // 4
+    overlap = int(overlap_seconds * SAMPLE_RATE)
+
+    chunks = []
+    start = 0
+    start_frame = 0
+    while n_frames - start_frame > chunk_frames + search:
+        target = start_frame + chunk_frames
+        lo, hi = target - search, target + search
+        cut_frame = lo + int(np.argmin(smoothed[lo:hi]))
+        cut = cut_frame * frame
+        forced = smoothed[cut_frame] > threshold
+        chunks.append((start, cut, overlap if forced else 0))
+        start = max(0, cut - overlap) if forced else cut
+        start_frame = cut_frame
+    chunks.append((start, len(audio), 0))
+    return chunks
+
+
+def _normalize(word: str) -> str:
+    return re.sub(r"[^\w']", "", word.lower())
+
+
+def merge_overlap(previous: str, text: str, max_words: int = 12) -> str:
+    """Retire du debut de text les mots deja presents a la fin de previous"""
+    prev_words = [_normalize(w) for w in previous.split()[-max_words:]]
+    words = text.split()
+    head = [_normalize(w) for w in words[:max_words]]
+    for k in range(min(len(prev_words), len(head)), 0, -1):
+        if prev_words[-k:] == head[:k]:
+            return " ".join(words[k:])
+    return text
+
+
+def _init_worker(model_key: tuple, language: str):
+    """Charge le modele dans le processus worker"""
+    global _worker_model, _worker_language
+    from faster_whisper import WhisperModel
+    model_name, device, compute_type, cpu_threads = model_key
+    _worker_model = WhisperModel(
+        model_name,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=cpu_threads
+    )
+    _worker_language = language
+
+
+def _transcribe_chunk(audio: np.ndarray, options: dict, watchdog: bool) -> list:
+    segments, info = _worker_model.transcribe(audio, language=_worker_language, **options)
+    if watchdog:
+        from src.watchdog import DecodingWatchdog
+        segments = DecodingWatchdog().filter(segments)
+    return [segment.text.strip() for segment in segments]
+
+
+class ParallelTranscriber:
+    """Pool de processus, chacun avec son propre modele et une part des threads CPU"""
+
+    def __init__(self, model_key: tuple, language: str, workers: int):
+        model_name, device, compute_type = model_key[:3]
+        cpu_threads = max(1, (os.cpu_count() or workers) // workers)
+        self.model_key = (model_name, device, compute_type, cpu_threads)
+        self.language = language
+        self.workers = workers
+        # spawn : fork est incompatible avec les threads de CTranslate2
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.model_key, language),
+        )
+        self._closed = False
+        self._terminate_lock = threading.Lock()
+        print(f"[Parallel] {workers} processus ({cpu_threads} threads chacun)")
+
+    def matches(self, model_key: tuple, language: str, workers: int) -> bool:
+        """Pool reutilisable ; il peut compter moins de processus que demande (memoire)"""
+        return (not self._closed and self.model_key[:3] == model_key[:3]
+                and self.language == language and self.workers <= workers)
+
+    def iter_segments(self, audio: np.ndarray, options: dict, watchdog: bool = True, cancel=None):
+        """Transcrit les morceaux en parallele et produit les segments dans l'ordre
+
+        Args:
+            cancel: CancelToken de la dictee, verifie entre deux morceaux ; son
+                declenchement arrete aussi les processus qui decodent encore
+        """
+        chunks = find_chunks(audio)
+        print(f"[Parallel] {len(chunks)} morceaux de ~{PARALLEL_CHUNK_SECONDS:.0f}s")
+
+        futures = [
+            self._executor.submit(_transcribe_chunk, audio[start:end], options, watchdog)
+            for start, end, _ in chunks
+        ]
+
+        if cancel is not None:
+            cancel.add_callback(self.terminate)
+
+        previous = ""
+        overlap_before = 0
+        try:
+            for (start, end, overlap), future in zip(chunks, futures):
+                if cancel is not None and cancel.is_set():
+                    return
+                try:
+                    texts = future.result()
+                except (BrokenProcessPool, CancelledError):
+                    if cancel is not None and cancel.is_set():
+                        return
+                    raise
+                if overlap_before and texts:
+                    texts[0] = merge_overlap(previous, texts[0])
+                for text in texts:
+                    if text:
+                        previous = text
+                        yield text
+                overlap_before = overlap
+        finally:
+            if cancel is not None:
+                cancel.remove_callback(self.terminate)
+            # Consommation interrompue (annulation) : les morceaux non demarres sont
+            # abandonnes, ceux en cours occuperaient encore les coeurs jusqu'a leur fin
+            running = [future for future in futures if not future.cancel() and not future.done()]
+            if running:
+                self.terminate()
+
+    def terminate(self):
+        """Arrete immediatement les processus ; le pool sera recree a la dictee suivante"""
+        with self._terminate_lock:
+            if self._closed:
+                return
+            self._closed = True
+            processes = list((self._executor._processes or {}).values())
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+        print(f"[Parallel] {len(processes)} processus arretes (decodage interrompu)")
+
+    def shutdown(self):
+        self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,91 @@
+"""Reechantillonnage polyphase en flux (taux natif du peripherique -> 16 kHz)"""
+from fractions import Fraction
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import firwin
+from src.config import SAMPLE_RATE
+from src.audio_buffer import INT16_SCALE
+
+
+class StreamingResampler:
+    """Reechantillonneur polyphase a etat, bloc par bloc
+
+    Meme filtre que scipy.signal.resample_poly (fenetre de Kaiser), mais
+    l'historique entre blocs est conserve : pas d'effet de bord aux
+    frontieres, la sortie est identique a un traitement d'un seul tenant.
+    Chaque echantillon de sortie est un produit scalaire avec une seule
+    phase du filtre (taps / up operations).
+    """
+
+    def __init__(self, in_rate: int, out_rate: int = SAMPLE_RATE, max_denominator: int = 1000):
+        ratio = Fraction(int(out_rate), int(in_rate)).limit_denominator(max_denominator)
+        self.in_rate = int(in_rate)
+        self.out_rate = int(out_rate)
+        self.up = ratio.numerator
+        self.down = ratio.denominator
+        self.passthrough = self.up == self.down
+
+        if self.passthrough:
+            return
+
+        max_rate = max(self.up, self.down)
+        half_len = 10 * max_rate
+        h = firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0)) * self.up
+
+        # Matrice polyphase : phase p -> taps h[p], h[p + up], ... (inverses pour le produit)
+        self.taps = -(-len(h) // self.up)
+        padded = np.zeros(self.taps * self.up)
+        padded[:len(h)] = h
+        self._phases = padded.reshape(self.taps, self.up).T[:, ::-1].astype(np.float32)
+
+        self._delay = half_len  # Retard du filtre (domaine sur-echantillonne)
+        self._history = np.zeros(self.taps - 1, dtype=np.float32)
+        self._consumed = 0  # Echantillons d'entree recus
+        self._produced = 0  # Echantillons de sortie produits
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """Reechantillonne un bloc mono float32, retourne les echantillons disponibles"""
+        if self.passthrough:
+            return samples
+
+        samples = samples.astype(np.float32, copy=False)
+        data = np.concatenate((self._history, samples))
+        first_index = self._consumed - len(self._history)  # Indice global de data[0]
+        self._consumed += len(samples)
+
+        # Sorties dont toute la fenetre d'entree est disponible
+        k_end = (self._consumed * self.up - self._delay - 1) // self.down + 1
+        k = np.arange(self._produced, max(k_end, self._produced))
+        if len(k):
+            m = k * self.down + self._delay
+            base = m // self.up  # Dernier echantillon d'entree utilise
+            windows = sliding_window_view(data, self.taps)
+            start = base - (self.taps - 1) - first_index
+            out = np.einsum("ij,ij->i", windows[start], self._phases[m % self.up])
+            self._produced = int(k[-1]) + 1
+        else:
+            out = np.zeros(0, dtype=np.float32)
+
+        self._history = data[len(data) - (self.taps - 1):].copy()
+        return out
+
+    def flush(self) -> np.ndarray:
+        """Vide le filtre en fin de flux (queue de la derniere sortie)"""
+        if self.passthrough:
+            return np.zeros(0, dtype=np.float32)
+        expected = -(-self._consumed * self.up // self.down)
+        out = self.process(np.zeros(self.taps, dtype=np.float32))
+        return out[:max(0, expected - (self._produced - len(out)))]
+
+
+def downmix(block: np.ndarray) -> np.ndarray:
+    """Moyenne des canaux (frames, channels) int16 ou float32 -> (frames,) float32"""
+    if block.dtype == np.int16:
+        block = np.multiply(block, 1.0 / INT16_SCALE, dtype=np.float32)
+    elif block.dtype != np.float32:
+        block = block.astype(np.float32)
+    if block.ndim == 1:
+        return block
+    if block.shape[1] == 1:
+        return block[:, 0]
+    return block.mean(axis=1, dtype=np.float32)
@@ -0,0 +1,558 @@
+"""Serveur de transcription local : un seul modele partage par plusieurs outils
+
+Protocole en lignes JSON sur un socket Unix (TCP 127.0.0.1 si le systeme n'a
+pas de socket Unix). Une connexion peut enchainer plusieurs requetes :
+
+    -> {"command": "transcribe", "format": "pcm", "sample_rate": 16000,
+        "channels": 1, "length": <octets>}
+       puis <length> octets d'audio (PCM s16le, ou fichier WAV 16 bits)
+    <- {"segment": "..."}                       un message par segment decode
+    <- {"done": true, "text": "...", "duration": 4.2, "elapsed": 0.9, "queue_wait": 0.0}
+       ou {"error": "...", "busy": true}        file d'admission pleine (connexion fermee,
+                                                l'audio n'est pas lu)
+
+    -> {"command": "status"}                    "wait": true : reponse une fois le modele charge
+    <- {"ready": true, "model": "base", "running": 1, "queued": 0, ...}
+
+Les requetes concurrentes se partagent le modele : CTranslate2 decode jusqu'a
+num_workers transcriptions en parallele, au-dela elles attendent dans une file
+bornee, et les suivantes sont refusees immediatement plutot que de s'accumuler.
+"""
+import argparse
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+import wave
+import numpy as np
+from src.audio_buffer import INT16_SCALE
+from src.config import (
+    SAMPLE_RATE, SERVER_SOCKET_NAME, SERVER_TCP_PORT, SERVER_WORKERS, SERVER_QUEUE_SIZE,
+    SERVER_MAX_AUDIO_BYTES, SERVER_SAMPLE_RATES, SERVER_TIMEOUT,
+)
+from src.resampler import StreamingResampler, downmix
+from src.settings import get_settings_dir
+
+HAS_UNIX_SOCKETS = hasattr(socket, "AF_UNIX")
+
+
+def parse_address(spec: str = ""):
+    """Adresse du serveur : "unix:<chemin>", "tcp:<hote>:<port>", un chemin, ou "" (defaut)
+
+    Retourne (famille, adresse) utilisable par socket.connect()/bind().
+    """
+    spec = (spec or "").strip()
+    if spec.startswith("tcp:"):
+        host, _, port = spec[4:].rpartition(":")
+        return socket.AF_INET, (host or "127.0.0.1", int(port or SERVER_TCP_PORT))
+    if spec.startswith("unix:"):
+        spec = spec[5:]
+    if not spec:
+        if not HAS_UNIX_SOCKETS:
+            return socket.AF_INET, ("127.0.0.1", SERVER_TCP_PORT)
+        spec = str(get_settings_dir() / SERVER_SOCKET_NAME)
+    return socket.AF_UNIX, spec
+
+
+def format_address(family, address) -> str:
+    if family == socket.AF_INET:
+        return f"tcp:{address[0]}:{address[1]}"
+    return f"unix:{address}"
+
+
+def check_audio_format(sample_rate: int, channels: int):
+    """Leve ValueError si le taux ou le nombre de canaux n'est pas accepte par le serveur"""
+    if sample_rate not in SERVER_SAMPLE_RATES:
+        raise ValueError(f"taux d'echantillonnage non supporte: {sample_rate} Hz")
+    if channels not in (1, 2):
+        raise ValueError(f"nombre de canaux non supporte: {channels}")
+
+
+def decode_audio(payload: bytes, fmt: str, sample_rate: int, channels: int) -> np.ndarray:
+    """PCM s16le ou WAV 16 bits -> float32 mono a SAMPLE_RATE"""
+    if fmt == "wav":
+        with wave.open(io.BytesIO(payload), "rb") as wav:
+            if wav.getsampwidth() != 2:
+                raise ValueError("seul le WAV PCM 16 bits est supporte")
+            sample_rate, channels = wav.getframerate(), wav.getnchannels()
+            payload = wav.readframes(wav.getnframes())
+    elif fmt != "pcm":
+        raise ValueError(f"format audio inconnu: {fmt}")
+    check_audio_format(sample_rate, channels)
+
+    samples = np.frombuffer(payload[:len(payload) - len(payload) % (2 * channels)], dtype=np.int16)
+    audio = downmix(samples.reshape(-1, channels))
+    if sample_rate != SAMPLE_RATE:
+        resampler = StreamingResampler(sample_rate)
+        audio = np.concatenate((resampler.process(audio), resampler.flush()))
+    return audio
+
+
+def _read_message(stream):
+    line = stream.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+def _write_message(stream, message: dict):
+    stream.write(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+    stream.flush()
+
+
+# ── Serveur ────────────────────────────────────────────
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Une connexion client : requetes traitees l'une apres l'autre"""
+
+    def handle(self):
+        owner = self.server.owner
+        while True:
+            try:
+                request = _read_message(self.rfile)
+            except (OSError, ValueError) as e:
+                print(f"[Server] Requete invalide: {e}")
+                return
+            if request is None:
+                return
+            command = request.get("command", "transcribe")
+            try:
+                if command == "status":
+                    _write_message(self.wfile, owner.status(wait=bool(request.get("wait"))))
+                elif command == "transcribe":
+                    if not owner.handle_transcribe(request, self.rfile, self.wfile):
+                        return
+                else:
+                    _write_message(self.wfile, {"error": f"commande inconnue: {command}"})
+            except OSError:
+                return  # Client deconnecte
+            except Exception as e:
+                # Erreur inattendue (decodage, modele) : le client recoit une reponse finale
+                # au lieu d'une connexion coupee ; la requete en cours n'est plus lisible
+                print(f"[Server] Erreur pendant '{command}': {e}")
+                try:
+                    _write_message(self.wfile, {"error": f"erreur interne: {e}"})
+                except OSError:
+                    pass
+                return
+
+
+class _LocalTCPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+
+
+class TranscriptionServer:
+    """Sert un Transcriber aux clients locaux (socket Unix ou TCP localhost)"""
+
+    def __init__(self, transcriber, address: str = "", workers: int = SERVER_WORKERS,
+                 queue_size: int = SERVER_QUEUE_SIZE, model_name: str = ""):
+        self.transcriber = transcriber
+        self.workers = max(1, workers)
+        self.queue_size = max(0, queue_size)
+        self.model_name = model_name
+        self._slots = threading.Semaphore(self.workers)
+        self._lock = threading.Lock()
+        self._admitted = 0  # Requetes en cours ou en file
+        self._running = 0
+        self._stats = {"requests": 0, "rejected": 0, "audio": 0.0, "elapsed": 0.0}
+
+        family, bind = parse_address(address)
+        if family == socket.AF_UNIX:
+            self._remove_stale_socket(bind)
+            self._server = socketserver.ThreadingUnixStreamServer(bind, _Handler)
+        else:
+            # Ecoute locale uniquement : pas d'authentification
+            bind = ("127.0.0.1", bind[1])
+            self._server = _LocalTCPServer(bind, _Handler)
+        self._server.daemon_threads = True
+        self._server.owner = self
+        self.family, self.address = family, bind
+
+    @staticmethod
+    def _remove_stale_socket(path: str):
+        """Supprime le fichier d'un serveur arrete, refuse si un serveur repond encore"""
+        if not os.path.exists(path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except OSError:
+            os.unlink(path)
+            return
+        finally:
+            probe.close()
+        raise RuntimeError(f"un serveur ecoute deja sur {path}")
+
+    def status(self, wait: bool = False) -> dict:
+        if wait:
+            self.transcriber.wait_ready()
+        with self._lock:
+            running, queued = self._running, self._admitted - self._running
+        return {
+            "ready": self.transcriber.is_ready() and self.transcriber.has_model(),
+            "error": self.transcriber.get_error(),
+            "model": self.model_name,
+            "running": running,
+            "queued": queued,
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+        }
+
+    def _admit(self) -> bool:
+        with self._lock:
+            if self._admitted >= self.workers + self.queue_size:
+                self._stats["rejected"] += 1
+                return False
+            self._admitted += 1
+            return True
+
+    def handle_transcribe(self, request: dict, rfile, wfile) -> bool:
+        """Lit l'audio, le transcrit et renvoie les segments ; False si la connexion est perdue
+
+        L'en-tete est verifie et la requete admise avant de lire l'audio : la
+        taille maximale ne depend pas de l'en-tete du client, et une requete
+        refusee ne fait rien allouer. Sans lecture du corps, la connexion est
+        alors fermee.
+        """
+        try:
+            length = int(request.get("length", 0))
+            rate = int(request.get("sample_rate", SAMPLE_RATE))
+            channels = int(request.get("channels", 1))
+            if request.get("format", "pcm") == "pcm":
+                check_audio_format(rate, channels)
+        except (TypeError, ValueError) as e:
+            _write_message(wfile, {"error": str(e)})
+            return False
+        # Marge pour l'en-tete d'un fichier WAV
+        if length <= 0 or length > SERVER_MAX_AUDIO_BYTES + 1024:
+            _write_message(wfile, {"error": f"taille audio invalide: {length} octets"})
+            return False
+
+        if not self._admit():
+            _write_message(wfile, {"error": "serveur sature, reessayer plus tard", "busy": True})
+            return False
+
+        try:
+            payload = rfile.read(length)
+            if len(payload) < length:
+                return False
+            try:
+                audio = decode_audio(payload, request.get("format", "pcm"), rate, channels)
+            except (ValueError, EOFError, wave.Error) as e:
+                _write_message(wfile, {"error": str(e)})
+                return True
+            del payload
+            return self._transcribe(audio, wfile)
+        finally:
+            with self._lock:
+                self._admitted -= 1
+
+    def _transcribe(self, audio: np.ndarray, wfile) -> bool:
+        queued_at = time.perf_counter()
+        with self._slots:
+            queue_wait = time.perf_counter() - queued_at
+            with self._lock:
+                self._running += 1
+                running, queued = self._running, self._admitted - self._running
+            self.transcriber.acquire()
+            start = time.perf_counter()
+            texts = []
+            segments = self.transcriber.iter_segments(audio)
+            try:
+                for text in segments:
+                    texts.append(text)
+                    # Client parti : l'echec d'ecriture ferme le generateur (decodage arrete)
+                    _write_message(wfile, {"segment": text})
+            except OSError:
+                print("[Server] Client deconnecte, transcription abandonnee")
+                return False
+            finally:
+                segments.close()
+                self.transcriber.release()
+                with self._lock:
+                    self._running -= 1
+
+        duration = len(audio) / SAMPLE_RATE
+        elapsed = time.perf_counter() - start
+        stats = self._stats
+        with self._lock:
+            stats["requests"] += 1
+            stats["audio"] += duration
+            stats["elapsed"] += elapsed
+        print(f"[Server] {duration:.1f}s d'audio en {elapsed:.2f}s (attente {queue_wait:.2f}s, "
+              f"{running} en cours, {queued} en file, {stats['requests']} requetes, "
+              f"{stats['rejected']} refusees)")
+        _write_message(wfile, {"done": True, "text": " ".join(texts).strip(), "duration": duration,
+                               "elapsed": elapsed, "queue_wait": queue_wait})
+        return True
+
+    def serve_forever(self):
+        print(f"[Server] Ecoute sur {format_address(self.family, self.address)} "
+              f"({self.workers} transcription(s) simultanee(s), file de {self.queue_size})")
+        self._server.serve_forever()
+
+    def shutdown(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self.family == socket.AF_UNIX:
+            try:
+                os.unlink(self.address)
+            except OSError:
+                pass
+
+
+# ── Client (mode client leger de l'application) ────────
+
+class ServerClient:
+    """Meme interface que Transcriber pour l'application, decodage par un serveur local
+
+    L'application ne charge alors aucun modele. Chaque transcription ouvre
+    une connexion ; fermer le generateur de segments ferme la connexion et le
+    serveur arrete le decodage au segment suivant.
+    """
+
+    def __init__(self, address: str = ""):
+        self.family, self.address = parse_address(address)
+        self.last_stats = None
+        self._ready = threading.Event()
+        self._error = None
+        self._unreachable = False  # Erreur de connexion : reverifiee en arriere-plan par has_error()
+        self._checking = threading.Lock()  # Verification en arriere-plan en cours
+        self._model = None
+        threading.Thread(target=self._wait_server, daemon=True).start()
+
+    def _connect(self):
+        sock = socket.socket(self.family, socket.SOCK_STREAM)
+        sock.settimeout(SERVER_TIMEOUT)
+        try:
+            sock.connect(self.address)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def status(self, wait: bool = False) -> dict:
+        """Etat du serveur ; wait : la reponse n'arrive qu'une fois son modele charge"""
+        with self._connect() as sock, sock.makefile("rwb") as stream:
+            _write_message(stream, {"command": "status", "wait": wait})
+            if wait:
+                sock.settimeout(None)
+            return _read_message(stream) or {}
+
+    def _probe(self, wait: bool = False) -> bool:
+        """Interroge le serveur et met a jour l'etat, retourne True s'il est pret
+
+        L'erreur est effacee des que le serveur repond a nouveau.
+        """
+        try:
+            status = self.status(wait)
+            if not status:
+                raise ConnectionError("connexion fermee par le serveur")
+        except (OSError, ValueError) as e:
+            self._set_unreachable(e)
+            return False
+        self._unreachable = False
+        self._error = status.get("error")
+        self._model = status.get("model")
+        return bool(status.get("ready"))
+
+    def _set_unreachable(self, error: OSError):
+        self._unreachable = True
+        self._error = f"serveur {format_address(self.family, self.address)} injoignable ({error})"
+
+    def _wait_server(self):
+        """Attend que le serveur ait charge son modele : une requete bloquante, sans sondage
+
+        Serveur injoignable : l'erreur est affichee et has_error() relance une
+        verification en arriere-plan a chaque appui du hotkey.
+        """
+        self._probe(wait=True)
+        if self._error:
+            print(f"[Server] {self._error}")
+        elif self._model:
+            print(f"[Server] Client du serveur {format_address(self.family, self.address)} "
+                  f"(modele '{self._model}')")
+        self._ready.set()
+
+    def iter_segments(self, audio_data: np.ndarray, cancel=None):
+        """Envoie l'audio au serveur et produit les segments au fil du decodage
+
+        Args:
+            cancel: CancelToken ; annule, la connexion est coupee sans attendre
+                le segment suivant et le serveur arrete le decodage
+        """
+        if audio_data is None or len(audio_data) == 0:
+            return
+        audio = np.clip(np.asarray(audio_data, dtype=np.float32).reshape(-1), -1.0, 1.0)
+        payload = np.multiply(audio, INT16_SCALE).astype("<i2").tobytes()
+        try:
+            sock = self._connect()
+        except OSError as e:
+            self._set_unreachable(e)
+            print(f"[Server] Serveur injoignable: {e}")
+            return
+        if self._unreachable:
+            self._unreachable = False
+            self._error = None
+
+        def on_cancel():
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+        if cancel is not None:
+            cancel.add_callback(on_cancel)
+        try:
+            yield from self._exchange(sock, payload, cancel)
+        except OSError as e:
+            if cancel is None or not cancel.is_set():
+                print(f"[Server] Connexion interrompue: {e}")
+        finally:
+            if cancel is not None:
+                cancel.remove_callback(on_cancel)
+
+    def _exchange(self, sock, payload: bytes, cancel):
+        """Envoie la requete sur sock et produit les segments recus"""
+        with sock, sock.makefile("rwb") as stream:
+            _write_message(stream, {"command": "transcribe", "format": "pcm",
+                                    "sample_rate": SAMPLE_RATE, "channels": 1,
+                                    "length": len(payload)})
+            try:
+                stream.write(payload)
+                stream.flush()
+            except OSError:
+                # Requete refusee avant la lecture de l'audio (serveur sature) : lire sa reponse
+                try:
+                    message = _read_message(stream)
+                except (OSError, ValueError):
+                    message = None
+                if not message or "error" not in message:
+                    raise
+                print(f"[Server] Erreur: {message['error']}")
+                return
+            # Pas de delai pendant le decodage d'un long enregistrement
+            sock.settimeout(None)
+            while True:
+                message = _read_message(stream)
+                if cancel is not None and cancel.is_set():
+                    return
+                if message is None:
+                    print("[Server] Connexion interrompue par le serveur")
+                    return
+                if "segment" in message:
+                    yield message["segment"]
+                elif message.get("done"):
+                    self.last_stats = (message["duration"], message["elapsed"], None)
+                    self._error = None
+                    return
+                else:
+                    print(f"[Server] Erreur: {message.get('error')}")
+                    return
+
+    def transcribe(self, audio_data: np.ndarray) -> str:
+        return " ".join(self.iter_segments(audio_data)).strip()
+
+    def transcribe_draft(self, audio_data: np.ndarray):
+        return None  # Pas de modele de brouillon cote client
+
+    def transcribe_within_budget(self, audio_data: np.ndarray, cancel=None) -> str:
+        return " ".join(self.iter_segments(audio_data, cancel)).strip()
+
+    def start_stream(self):
+        return None  # Transcription continue reservee au modele local
+
+    def switch_model(self, settings) -> bool:
+        return False  # Le modele est choisi au lancement du serveur
+
+    def acquire(self):
+        pass
+
+    def release(self):
+        pass
+
+    def has_model(self) -> bool:
+        if self._unreachable and self._ready.is_set():
+            self._recheck()
+        return self._model is not None and self._error is None
+
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    def wait_ready(self, timeout: float = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def _recheck(self):
+        """Reinterroge le serveur dans un thread (une seule verification a la fois)"""
+        if not self._checking.acquire(blocking=False):
+            return
+
+        def check():
+            try:
+                self._probe()
+            finally:
+                self._checking.release()
+
+        threading.Thread(target=check, daemon=True).start()
+
+    def has_error(self) -> bool:
+        """Etat connu du serveur, sans attente (appele depuis la boucle d'evenements)
+
+        Serveur injoignable : une verification est relancee en arriere-plan,
+        l'appui suivant voit son resultat.
+        """
+        if self._unreachable and self._ready.is_set():
+            self._recheck()
+        return self._error is not None
+
+    def get_error(self) -> str:
+        return self._error
+
+    def shutdown(self):
+        pass  # Une connexion par requete : rien a fermer
+
+
+def main(argv=None) -> int:
+    """Point d'entree de `python main.py --server`"""
+    from src.model_pool import ModelPool
+    from src.settings import Settings
+    from src.transcriber import Transcriber
+
+    parser = argparse.ArgumentParser(prog="main.py --server", description="Serveur de transcription local")
+    parser.add_argument("--server", action="store_true")
+    parser.add_argument("--address", default="", help="unix:<chemin> ou tcp:127.0.0.1:<port>")
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--workers", type=int, default=SERVER_WORKERS,
+                        help="Transcriptions simultanees (num_workers de CTranslate2)")
+    parser.add_argument("--queue-size", type=int, default=SERVER_QUEUE_SIZE)
+    args = parser.parse_args(argv)
+
+    settings = Settings()
+    if args.model:
+        settings.set("whisper_model", args.model)
+    # Le modele partage reste charge : pas de dechargement apres inactivite
+    settings.set("model_unload_delay", 0)
+    pool = ModelPool(settings.model_pool_budget_mb, num_workers=max(1, args.workers))
+    transcriber = Transcriber(settings, pool=pool)
+
+    try:
+        server = TranscriptionServer(transcriber, args.address, args.workers, args.queue_size,
+                                     model_name=settings.whisper_model)
+    except (OSError, RuntimeError) as e:
+        print(f"[Server] Demarrage impossible: {e}")
+        return 1
+    # Arret propre sur SIGTERM aussi (socket supprime, processus de transcription arretes)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("[Server] Arret")
+    finally:
+        server.shutdown()
+        transcriber.shutdown()
+    return 0
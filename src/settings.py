@@ -30,7 +30,37 @@ class Settings:
         "device": config.DEVICE,
         "compute_type": config.COMPUTE_TYPE,
         "hotkey": config.HOTKEY,
+        "cancel_hotkey": config.CANCEL_HOTKEY,
         "overlay_position": None,  # (x, y) ou None pour auto
+        "streaming_transcription": False,  # Transcrire pendant l'enregistrement
+        "incremental_injection": False,  # Injecter chaque segment des qu'il est decode
+        "model_pool_budget_mb": config.MODEL_POOL_BUDGET_MB,  # Memoire max des modeles en cache
+        "model_unload_delay": config.MODEL_UNLOAD_DELAY,  # Secondes avant dechargement (0 = jamais)
+        "model_warmup": config.MODEL_WARMUP,  # Inference de chauffe apres chargement
+        "keep_warm": False,  # Relancer la chauffe apres chaque periode d'inactivite
+        "keep_warm_interval": config.KEEP_WARM_INTERVAL,
+        "lock_model_memory": False,  # mlockall apres chargement (Linux/macOS)
+        "decoding_profile": config.DECODING_PROFILE,  # latency, balanced ou accuracy
+        "two_pass": False,  # Brouillon rapide injecte puis corrige par le modele principal
+        "draft_model": config.DRAFT_MODEL,
+        "refine_mode": "select",  # select (selection + collage) ou delete (retour arriere)
+        "parallel_workers": config.PARALLEL_WORKERS,  # Processus pour les longs enregistrements
+        "decoding_watchdog": True,  # Interrompre les boucles de decodage
+        "latency_budget": config.LATENCY_BUDGET,  # Secondes max par dictee (0 = sans limite)
+        "fallback_model": config.FALLBACK_MODEL,  # Modele de repli si le budget est depasse
+        "audio_storage": config.AUDIO_STORAGE,  # float32 ou int16 (moitie de memoire)
+        "warm_stream": False,  # Micro ouvert en permanence (pre-roll, pas de syllabe perdue)
+        "spill_threshold": config.SPILL_THRESHOLD_SECONDS,  # Secondes avant ecriture sur disque
+        "native_capture": False,  # Capturer au taux/canaux natifs puis reechantillonner
+        "vad_mode": config.VAD_MODE,  # off, energy, silero : silences retires avant le modele
+        "audio_source": config.AUDIO_SOURCE,  # device, file:..., stdin, synthetic:... (tests)
+        "audio_blocksize": config.AUDIO_BLOCKSIZE,  # 0 = PortAudio, "auto" = plus petit sans xrun
+        "audio_latency": config.AUDIO_LATENCY,  # low ou high
+        "capture_dtype": config.CAPTURE_DTYPE,  # float32 ou int16
+        "noise_suppression": config.NOISE_SUPPRESSION,  # Gate spectral avant la transcription
+        "transcriber_process": config.TRANSCRIBER_PROCESS,  # Modele dans un processus separe
+        "server_client": False,  # Transcrire via un serveur local (python main.py --server)
+        "server_address": "",  # unix:<chemin> ou tcp:<hote>:<port>, vide = adresse par defaut
     }
 
     def __init__(self):
@@ -96,6 +126,137 @@ class Settings:
     def hotkey(self) -> str:
         return self._settings["hotkey"]
 
+    @property
+    def cancel_hotkey(self) -> str:
+        return self._settings["cancel_hotkey"]
+
     @property
     def overlay_position(self):
         return self._settings["overlay_position"]
+
+    @property
+    def streaming_transcription(self) -> bool:
+        return bool(self._settings["streaming_transcription"])
+
+    @property
+    def incremental_injection(self) -> bool:
+        return bool(self._settings["incremental_injection"])
+
+    @property
+    def model_pool_budget_mb(self) -> int:
+        return int(self._settings["model_pool_budget_mb"])
+
+    @property
+    def model_unload_delay(self) -> float:
+        return float(self._settings["model_unload_delay"])
+
+    @property
+    def model_warmup(self) -> bool:
+        return bool(self._settings["model_warmup"])
+
+    @property
+    def keep_warm(self) -> bool:
+        return bool(self._settings["keep_warm"])
+
+    @property
+    def keep_warm_interval(self) -> float:
+        return float(self._settings["keep_warm_interval"])
+
+    @property
+    def lock_model_memory(self) -> bool:
+        return bool(self._settings["lock_model_memory"])
+
+    @property
+    def decoding_profile(self) -> str:
+        profile = self._settings["decoding_profile"]
+        return profile if profile in config.DECODING_PROFILES else config.DECODING_PROFILE
+
+    @property
+    def two_pass(self) -> bool:
+        return bool(self._settings["two_pass"])
+
+    @property
+    def draft_model(self) -> str:
+        return self._settings["draft_model"]
+
+    @property
+    def refine_mode(self) -> str:
+        return self._settings["refine_mode"]
+
+    @property
+    def parallel_workers(self) -> int:
+        return int(self._settings["parallel_workers"])
+
+    @property
+    def decoding_watchdog(self) -> bool:
+        return bool(self._settings["decoding_watchdog"])
+
+    @property
+    def latency_budget(self) -> float:
+        return float(self._settings["latency_budget"])
+
+    @property
+    def fallback_model(self) -> str:
+        return self._settings["fallback_model"]
+
+    @property
+    def audio_storage(self) -> str:
+        storage = self._settings["audio_storage"]
+        return storage if storage in ("float32", "int16") else config.AUDIO_STORAGE
+
+    @property
+    def warm_stream(self) -> bool:
+        return bool(self._settings["warm_stream"])
+
+    @property
+    def spill_threshold(self) -> float:
+        return float(self._settings["spill_threshold"])
+
+    @property
+    def native_capture(self) -> bool:
+        return bool(self._settings["native_capture"])
+
+    @property
+    def vad_mode(self) -> str:
+        mode = self._settings["vad_mode"]
+        return mode if mode in ("off", "energy", "silero") else config.VAD_MODE
+
+    @property
+    def audio_blocksize(self):
+        blocksize = self._settings["audio_blocksize"]
+        if blocksize == "auto":
+            return blocksize
+        try:
+            return max(0, int(blocksize))
+        except (TypeError, ValueError):
+            return config.AUDIO_BLOCKSIZE
+
+    @property
+    def audio_latency(self) -> str:
+        latency = self._settings["audio_latency"]
+        return latency if latency in ("low", "high") else config.AUDIO_LATENCY
+
+    @property
+    def capture_dtype(self) -> str:
+        dtype = self._settings["capture_dtype"]
+        return dtype if dtype in ("float32", "int16") else config.CAPTURE_DTYPE
+
+    @property
+    def noise_suppression(self) -> bool:
+        return bool(self._settings["noise_suppression"])
+
+    @property
+    def audio_source(self) -> str:
+        return self._settings["audio_source"] or config.AUDIO_SOURCE
+
+    @property
+    def transcriber_process(self) -> bool:
+        return bool(self._settings["transcriber_process"])
+
+    @property
+    def server_client(self) -> bool:
+        return bool(self._settings["server_client"])
+
+    @property
+    def server_address(self) -> str:
+        return self._settings["server_address"] or ""
@@ -6,6 +6,23 @@ import platform
 
 
 class TextInjector:
+    # Ponctuation qui se colle au mot precedent
+    NO_SPACE_BEFORE = ",.)]}…%"
+
+    @staticmethod
+    def join_segment(previous_text: str, segment: str) -> str:
+        """Retourne le segment precede d'un espace si necessaire
+
+        Args:
+            previous_text: Texte deja injecte (vide pour le premier segment)
+            segment: Texte du nouveau segment (sans espaces en bordure)
+        """
+        if not previous_text or not segment:
+            return segment
+        if previous_text[-1].isspace() or segment[0] in TextInjector.NO_SPACE_BEFORE:
+            return segment
+        return " " + segment
+
     @staticmethod
     def inject(text: str):
         """
@@ -40,3 +57,45 @@ class TextInjector:
             pyperclip.copy(original_clipboard)
         except Exception:
             pass
+
+    @staticmethod
+    def foreground_window():
+        """Identifiant de la fenetre active (Windows uniquement, None ailleurs)"""
+        if platform.system() != 'Windows':
+            return None
+        try:
+            import ctypes
+            return ctypes.windll.user32.GetForegroundWindow()
+        except Exception:
+            return None
+
+    @staticmethod
+    def replace(old_text: str, new_text: str, mode: str = "select"):
+        """
+        Remplace le texte qui vient d'etre injecte (curseur juste apres)
+        Seule la partie differente apres le prefixe commun est retapee.
+
+        Args:
+            mode: "select" (selection Maj+Gauche puis collage)
+                  ou "delete" (retour arriere puis collage)
+        """
+        prefix = 0
+        for a, b in zip(old_text, new_text):
+            if a != b:
+                break
+            prefix += 1
+
+        to_remove = len(old_text) - prefix
+        to_insert = new_text[prefix:]
+        if to_remove == 0 and not to_insert:
+            return
+
+        key = 'shift+left' if mode == "select" else 'backspace'
+        for _ in range(to_remove):
+            keyboard.press_and_release(key)
+
+        if to_insert:
+            # Le collage remplace la selection eventuelle
+            TextInjector.inject(to_insert)
+        elif mode == "select":
+            keyboard.press_and_release('delete')
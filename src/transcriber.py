@@ -1,31 +1,101 @@
 """Transcription audio avec faster-whisper (chargement au demarrage)"""
-from src.config import WHISPER_MODEL, LANGUAGE, DEVICE, COMPUTE_TYPE
+from src.config import (
+    WHISPER_MODEL, LANGUAGE, DEVICE, COMPUTE_TYPE, SAMPLE_RATE,
+    STREAMING_WINDOW, STREAMING_COMMIT_MARGIN, MODEL_POOL_BUDGET_MB,
+    MODEL_UNLOAD_DELAY, MODEL_WARMUP, KEEP_WARM_INTERVAL,
+    DECODING_PROFILE, DECODING_PROFILES,
+    PARALLEL_WORKERS, PARALLEL_MIN_DURATION, PARALLEL_RAM_FRACTION,
+    LATENCY_BUDGET, FALLBACK_MODEL,
+)
+from src.model_pool import ModelPool, estimate_model_mb
+from src.parallel_transcriber import ParallelTranscriber
+from src.watchdog import DecodingWatchdog
+from src.memory import (
+    get_rss_mb, get_available_mb, release_memory, lock_resident_memory, unlock_resident_memory,
+)
+from src.cancel import CancelToken
 import numpy as np
 import threading
+import time
 
 
 class Transcriber:
-    def __init__(self, settings=None):
+    def __init__(self, settings=None, pool: ModelPool = None):
         self.model = None
+        self._active_key = None  # Cle du modele principal, epinglee dans le pool
         self._ready = threading.Event()
         self._error = None
         self._settings = settings
+        self._swap_lock = threading.Lock()
+        self._load_generation = 0
+        self._users = 0  # Enregistrements/transcriptions en cours (empeche le dechargement)
+        self._unloaded = False
+        self._last_used = time.monotonic()
+        self._unload_timer = None
+        self._parallel = None  # Pool de processus pour les longs enregistrements
+        self._rtf = {}  # Facteur temps reel recent par modele (moyenne glissante)
+        self._deadline_stats = {"dictations": 0, "fallbacks": 0}
+        self.last_stats = None  # Derniere transcription terminee : (duree audio, duree, part VAD)
 
         # Utiliser les settings si fournis, sinon les defaults de config
         if settings:
             self._model_name = settings.whisper_model
-            self._language = settings.language
             self._device = settings.device
             self._compute_type = settings.compute_type
+            budget_mb = settings.model_pool_budget_mb
         else:
             self._model_name = WHISPER_MODEL
-            self._language = LANGUAGE
             self._device = DEVICE
             self._compute_type = COMPUTE_TYPE
+            budget_mb = MODEL_POOL_BUDGET_MB
+        self._apply_options(settings)
+
+        self._pool = pool or ModelPool(budget_mb)
+
+        # Mesures de latence (premiere transcription vs a chaud)
+        self._cold = True
+        self._memory_locked = False
+        # Maintien a chaud : minuteur programme seulement si l'option est active
+        self._keep_warm_timer = None
+        self._keep_warm_lock = threading.Lock()
+        self._keep_warm_stop = threading.Event()
+
+        threading.Thread(target=self._load_model, args=(self._key(), 0), daemon=True).start()
 
-        threading.Thread(target=self._load_model, daemon=True).start()
+    def _apply_options(self, settings):
+        """Lit les options modifiables sans rechargement du modele"""
+        if settings:
+            self._language = settings.language
+            self._unload_delay = settings.model_unload_delay
+            self._warmup_enabled = settings.model_warmup
+            self._keep_warm = settings.keep_warm
+            self._keep_warm_interval = settings.keep_warm_interval
+            self._lock_memory = settings.lock_model_memory
+            self._profile_name = settings.decoding_profile
+            self._draft_model = settings.draft_model if settings.two_pass else None
+            self._parallel_workers = settings.parallel_workers
+            self._watchdog = DecodingWatchdog() if settings.decoding_watchdog else None
+            self._latency_budget = settings.latency_budget
+            self._fallback_model = settings.fallback_model
+        else:
+            self._language = LANGUAGE
+            self._unload_delay = MODEL_UNLOAD_DELAY
+            self._warmup_enabled = MODEL_WARMUP
+            self._keep_warm = False
+            self._keep_warm_interval = KEEP_WARM_INTERVAL
+            self._lock_memory = False
+            self._profile_name = DECODING_PROFILE
+            self._draft_model = None
+            self._parallel_workers = PARALLEL_WORKERS
+            self._watchdog = DecodingWatchdog()
+            self._latency_budget = LATENCY_BUDGET
+            self._fallback_model = FALLBACK_MODEL
+        self._profile = DECODING_PROFILES[self._profile_name]
 
-    def _load_model(self):
+    def _key(self) -> tuple:
+        return ModelPool.make_key(self._model_name, self._device, self._compute_type)
+
+    def _load_model(self, key: tuple, generation: int):
         # Fix SSL certificates for PyInstaller bundle
         try:
             import ssl
@@ -35,26 +105,487 @@ class Transcriber:
             pass
 
         try:
-            from faster_whisper import WhisperModel
-            print(f"[Whisper] Chargement du modele '{self._model_name}'...")
-            self.model = WhisperModel(
-                self._model_name,
-                device=self._device,
-                compute_type=self._compute_type
-            )
+            # Threads du profil courant : un changement de profil s'applique au prochain chargement
+            # Epingle des le chargement : un modele auxiliaire ne peut pas l'evincer
+            model = self._pool.get(key, self._profile["cpu_threads"], pin=True)
+            self._report_threads(key)
+            if self._warmup_enabled:
+                self._warmup(model)
+            with self._swap_lock:
+                # Un changement plus recent a pu etre demande entre-temps
+                if generation == self._load_generation:
+                    released, self._active_key = self._active_key, key
+                    self.model = model
+                    self._model_name, self._device, self._compute_type = key
+                    self._error = None
+                    self._cold = not self._warmup_enabled
+                else:
+                    released = key
+            if released is not None:
+                self._pool.unpin(released)
             print("[Whisper] Modele charge")
+            self._preload_aux_models()
+            self._lock_model_pages()
+            self._touch()
+            self._schedule_keep_warm()
         except Exception as e:
             import traceback
-            self._error = str(e)
             print(f"[Whisper] ERREUR chargement: {e}")
             print(f"[Whisper] Traceback:\n{traceback.format_exc()}")
+            if self.model is not None:
+                print(f"[Whisper] Conservation du modele '{self._model_name}'")
+            elif generation == self._load_generation:
+                self._error = str(e)
         finally:
-            self._ready.set()
+            if generation == self._load_generation or self.model is not None:
+                self._ready.set()
+
+    def _report_threads(self, key: tuple):
+        """Signale un modele en memoire charge avec d'autres threads CPU que le profil actif"""
+        loaded = self._pool.loaded_threads(key)
+        wanted = self._profile["cpu_threads"]
+        if loaded is not None and loaded != wanted:
+            print(f"[Whisper] Modele '{key[0]}' en memoire avec {loaded or 'auto'} threads CPU : "
+                  f"ceux du profil '{self._profile_name}' ({wanted or 'auto'}) "
+                  f"s'appliqueront au prochain chargement")
+
+    def switch_model(self, settings) -> bool:
+        """Change de modele a chaud d'apres les settings
+
+        L'ancien modele continue de servir jusqu'a ce que le nouveau soit pret.
+        Les threads CPU du profil ne rechargent pas un modele deja en memoire :
+        ils s'appliquent a son prochain chargement depuis le disque (apres un
+        dechargement ou une eviction). Retourne True si un chargement a ete lance.
+        """
+        self._apply_options(settings)
+        self._pool.set_budget(settings.model_pool_budget_mb, keep=self._key())
+        self._touch()
+        self._schedule_keep_warm()
+        if self._lock_memory != self._memory_locked and self.model is not None:
+            self._lock_model_pages()  # Option modifiee sans changement de modele
+
+        key = ModelPool.make_key(settings.whisper_model, settings.device, settings.compute_type)
+        if self.model is not None:
+            self._preload_aux_models()
+            if key == self._key():
+                self._report_threads(key)
+
+        with self._swap_lock:
+            if key == self._key() and self.model is not None:
+                return False
+            self._load_generation += 1
+            generation = self._load_generation
+            self._unloaded = False
+            if self.model is None:
+                # Aucun modele pour servir : les transcriptions attendront le chargement
+                self._ready.clear()
+                self._error = None
+
+        # Les pages de l'ancien modele ne restent pas verrouillees apres son eviction ;
+        # le nouveau est verrouille a la fin de son chargement
+        self._unlock_model_pages()
+        threading.Thread(target=self._load_model, args=(key, generation), daemon=True).start()
+        return True
+
+    # ── Dechargement apres inactivite ──────────────────
+
+    def acquire(self):
+        """Signale une utilisation (appui hotkey) : recharge en arriere-plan si decharge
+
+        Le rechargement se fait pendant que l'utilisateur parle. Le modele ne
+        peut pas etre decharge avant l'appel correspondant a release().
+        """
+        with self._swap_lock:
+            self._users += 1
+        self._reload_if_unloaded()
+
+    def release(self):
+        """Fin d'utilisation : relance le delai d'inactivite"""
+        with self._swap_lock:
+            self._users = max(0, self._users - 1)
+        self._touch()
+
+    def _touch(self):
+        """Met a jour la date de derniere utilisation et replanifie le dechargement"""
+        self._last_used = time.monotonic()
+        if self._unload_timer:
+            self._unload_timer.cancel()
+            self._unload_timer = None
+        if self._unload_delay and self._unload_delay > 0:
+            self._unload_timer = threading.Timer(self._unload_delay, self._unload_if_idle)
+            self._unload_timer.daemon = True
+            self._unload_timer.start()
+
+    def _unload_if_idle(self):
+        idle = time.monotonic() - self._last_used
+        with self._swap_lock:
+            if self.model is None:
+                return
+            if self._users > 0 or idle < self._unload_delay:
+                busy = True
+            else:
+                busy = False
+                rss_before = get_rss_mb()
+                self.model = None
+                self._unloaded = True
+                self._ready.clear()
+                self._pool.clear()
+                if self._active_key is not None:
+                    self._pool.unpin(self._active_key)
+                    self._active_key = None
+
+        if busy:
+            self._touch()
+            return
+
+        self._shutdown_parallel()
+        self._unlock_model_pages()
+        release_memory()
+        rss_after = get_rss_mb()
+        if rss_before is not None and rss_after is not None:
+            freed = f"{rss_before - rss_after:.0f} Mo liberes ({rss_before:.0f} -> {rss_after:.0f} Mo)"
+        else:
+            freed = "memoire liberee non mesurable"
+        print(f"[Whisper] Modele decharge apres {idle:.0f}s d'inactivite: {freed}")
+
+    def _reload_if_unloaded(self):
+        """Relance le chargement en arriere-plan si le modele a ete decharge"""
+        with self._swap_lock:
+            if not self._unloaded:
+                return
+            self._unloaded = False
+            self._load_generation += 1
+            generation = self._load_generation
+
+        print("[Whisper] Rechargement du modele en arriere-plan...")
+        threading.Thread(target=self._load_model, args=(self._key(), generation), daemon=True).start()
+
+    # ── Chauffe et maintien a chaud ─────────────────────
+
+    def _warmup(self, model):
+        """Inference sur un court extrait synthetique (init des kernels, pages chargees)"""
+        t = np.arange(SAMPLE_RATE, dtype=np.float32) / SAMPLE_RATE
+        rng = np.random.default_rng(0)
+        clip = 0.05 * np.sin(2 * np.pi * 220.0 * t) + 0.005 * rng.standard_normal(SAMPLE_RATE)
+
+        start = time.perf_counter()
+        try:
+            segments, info = model.transcribe(
+                clip.astype(np.float32),
+                language=self._language,
+                beam_size=1,
+                vad_filter=False,
+                without_timestamps=True,
+                condition_on_previous_text=False,
+            )
+            for _ in segments:
+                pass
+        except Exception as e:
+            print(f"[Whisper] Erreur warm-up: {e}")
+            return
+        print(f"[Whisper] Warm-up: {time.perf_counter() - start:.2f}s")
+
+    def _schedule_keep_warm(self, delay: float = None):
+        """(Re)programme la prochaine chauffe ; option desactivee : aucun minuteur"""
+        with self._keep_warm_lock:
+            if self._keep_warm_timer:
+                self._keep_warm_timer.cancel()
+                self._keep_warm_timer = None
+            if not self._keep_warm or self._keep_warm_stop.is_set() or self.model is None:
+                return
+            interval = max(self._keep_warm_interval, 1)
+            self._keep_warm_timer = threading.Timer(delay or interval, self._keep_warm_tick)
+            self._keep_warm_timer.daemon = True
+            self._keep_warm_timer.start()
+
+    def _keep_warm_tick(self):
+        """Relance une inference de chauffe apres chaque periode d'inactivite"""
+        model = self.model
+        if model is None:
+            return  # Decharge : reprogramme a la fin du prochain chargement
+        interval = max(self._keep_warm_interval, 1)
+        idle = time.monotonic() - self._last_used
+        if self._users > 0 or idle < interval:
+            # Utilise entre-temps : prochaine chauffe a la fin de la periode d'inactivite
+            self._schedule_keep_warm(max(interval - idle, 1))
+            return
+        # Pas de _touch() : le maintien a chaud ne retarde pas le dechargement
+        self._warmup(model)
+        self._cold = False
+        self._schedule_keep_warm()
+
+    def _lock_model_pages(self):
+        """Verrouille les pages en RAM (option) apres chaque chargement
+
+        mlockall(MCL_CURRENT) ne couvre que les pages deja presentes : l'appel
+        est refait apres le chargement de chaque modele (principal ou auxiliaire).
+        """
+        if not self._lock_memory:
+            self._unlock_model_pages()
+            return
+        locked = lock_resident_memory()
+        if locked and not self._memory_locked:
+            print("[Whisper] Pages du modele verrouillees en memoire")
+        self._memory_locked = locked
+
+    def _unlock_model_pages(self):
+        if self._memory_locked:
+            unlock_resident_memory()
+            self._memory_locked = False
+
+    # ── Modeles auxiliaires (brouillon, repli) ──────────
+
+    def _aux_key(self, model_name: str) -> tuple:
+        return ModelPool.make_key(model_name, self._device, self._compute_type)
+
+    def preload_aux_model(self, model_name: str):
+        """Charge un modele auxiliaire dans le pool en arriere-plan"""
+        key = self._aux_key(model_name)
+        if key == self._key() or key in self._pool:
+            return
+
+        def load():
+            try:
+                model = self._pool.get(key, self._profile["cpu_threads"])
+                if self._warmup_enabled:
+                    self._warmup(model)
+                self._lock_model_pages()
+                print(f"[Whisper] Modele auxiliaire '{model_name}' pret")
+            except Exception as e:
+                print(f"[Whisper] ERREUR chargement modele auxiliaire '{model_name}': {e}")
+
+        threading.Thread(target=load, daemon=True).start()
+
+    def _preload_aux_models(self):
+        """Precharge les modeles de brouillon et de repli actives dans les settings"""
+        if self._draft_model:
+            self.preload_aux_model(self._draft_model)
+        if self._latency_budget > 0 and self._fallback_model:
+            self.preload_aux_model(self._fallback_model)
+
+    def get_aux_model(self, model_name: str, pin: bool = False):
+        """Retourne le modele auxiliaire s'il est deja en memoire (None sinon)
+
+        Args:
+            pin: Protege le modele de l'eviction pendant son utilisation
+                (self._pool.unpin(self._aux_key(model_name)) ensuite)
+        """
+        return self._pool.peek(self._aux_key(model_name), pin=pin)
+
+    def transcribe_draft(self, audio_data: np.ndarray):
+        """Transcription rapide avec le modele de brouillon (profil latency)
+
+        Retourne None si le brouillon n'est pas disponible (desactive ou pas encore charge).
+        """
+        if not self._draft_model or audio_data is None or len(audio_data) == 0:
+            return None
+        model = self.get_aux_model(self._draft_model, pin=True)
+        if model is None:
+            return None
+
+        start = time.perf_counter()
+        try:
+            segments = self._decode(audio_data, model=model, profile=DECODING_PROFILES["latency"])
+            text = " ".join(t for t in (segment.text.strip() for segment in segments) if t)
+        finally:
+            self._pool.unpin(self._aux_key(self._draft_model))
+        print(f"[Whisper] Brouillon '{self._draft_model}' en {time.perf_counter() - start:.2f}s")
+        return text
+
+    # ── Budget de latence et modele de repli ───────────
+
+    def _update_rtf(self, model_name: str, elapsed: float, duration: float):
+        rtf = elapsed / duration
+        previous = self._rtf.get(model_name)
+        self._rtf[model_name] = rtf if previous is None else 0.7 * previous + 0.3 * rtf
+
+    def _collect(self, texts, *cancels):
+        """Consomme un flux de segments, retourne None si l'un des evenements d'annulation survient"""
+        def cancelled():
+            return any(cancel.is_set() for cancel in cancels)
+
+        parts = []
+        try:
+            for text in texts:
+                if cancelled():
+                    return None
+                parts.append(text)
+        finally:
+            texts.close()
+        return None if cancelled() else " ".join(p for p in parts if p)
+
+    def _decode_fallback(self, audio_data: np.ndarray, *cancels):
+        """Transcrit avec le modele de repli, epingle pendant le decodage (None s'il a ete evince)"""
+        model = self.get_aux_model(self._fallback_model, pin=True)
+        if model is None:
+            return None
+        start = time.perf_counter()
+        try:
+            texts = (segment.text.strip() for segment in
+                     self._decode(audio_data, model=model, profile=DECODING_PROFILES["latency"]))
+            text = self._collect(texts, *cancels)
+        finally:
+            self._pool.unpin(self._aux_key(self._fallback_model))
+        if text is not None:
+            self._update_rtf(self._fallback_model, time.perf_counter() - start,
+                             len(audio_data) / SAMPLE_RATE)
+        return text
+
+    def transcribe_within_budget(self, audio_data: np.ndarray, cancel=None) -> str:
+        """Transcrit en respectant le budget de latence
+
+        Si l'estimation (duree x RTF recent) depasse le budget, le modele de
+        repli est utilise directement. Sinon le modele principal demarre et,
+        s'il n'a pas fini a l'echeance, le modele de repli est lance en
+        parallele : le premier resultat obtenu est retenu.
+
+        Args:
+            cancel: CancelToken de la dictee ; annule, les deux modeles s'arretent
+                au segment suivant et "" est retourne
+        """
+        if audio_data is None or len(audio_data) == 0 or not self._wait_model():
+            return ""
+
+        cancel = cancel or CancelToken()
+        budget = self._latency_budget
+        fallback = self.get_aux_model(self._fallback_model) if budget > 0 else None
+        if fallback is None or fallback is self.model:
+            return self._collect(self.iter_segments(audio_data, cancel=cancel), cancel) or ""
+
+        duration = len(audio_data) / SAMPLE_RATE
+        rtf = self._rtf.get(self._model_name)
+        estimate = duration * rtf if rtf is not None else None
+        self._deadline_stats["dictations"] += 1
+
+        if estimate is not None and estimate > budget:
+            self._report_fallback(f"estimation {estimate:.1f}s > budget {budget:.1f}s")
+            # Le modele principal n'est pas mesure : reduire l'estimation pour le retenter
+            # une fois la machine moins chargee
+            self._rtf[self._model_name] = rtf * 0.85
+            text = self._decode_fallback(audio_data, cancel)
+            if text is None and not cancel.is_set():
+                # Modele de repli evince entre-temps : modele principal
+                text = self._collect(self.iter_segments(audio_data, cancel=cancel), cancel)
+            return text or ""
+
+        results = {}
+        done = threading.Event()
+        cancel_main = threading.Event()
+        cancel_fallback = threading.Event()
+        lock = threading.Lock()
+        runners = {"started": 0, "finished": 0}
+
+        def run(name, work):
+            try:
+                text = work()
+            except Exception as e:
+                print(f"[Deadline] Erreur modele {name}: {e}")
+                text = None
+            with lock:
+                runners["finished"] += 1
+                if text is not None:
+                    results.setdefault("winner", (name, text))
+                if text is not None or runners["finished"] == runners["started"]:
+                    done.set()
+
+        start = time.perf_counter()
+        runners["started"] = 1
+        threading.Thread(
+            target=run,
+            args=("principal", lambda: self._collect(self.iter_segments(audio_data, cancel=cancel),
+                                                     cancel_main)),
+            daemon=True
+        ).start()
+
+        # Annulation pendant le budget : le modele principal s'arrete et signale done
+        if (not done.wait(timeout=budget) or "winner" not in results) and not cancel.is_set():
+            self._report_fallback(f"pas de resultat apres {time.perf_counter() - start:.1f}s")
+            with lock:
+                runners["started"] += 1
+                done.clear()
+            threading.Thread(
+                target=run,
+                args=("repli", lambda: self._decode_fallback(audio_data, cancel_fallback, cancel)),
+                daemon=True
+            ).start()
+            done.wait()
+
+        if "winner" not in results or cancel.is_set():
+            cancel_main.set()
+            cancel_fallback.set()
+            return ""
+
+        name, text = results["winner"]
+        # Arreter le perdant au prochain segment
+        if name == "principal":
+            cancel_fallback.set()
+        else:
+            cancel_main.set()
+            # Le modele principal n'a pas fini : son RTF est au moins celui-ci
+            self._update_rtf(self._model_name, time.perf_counter() - start, duration)
+        print(f"[Deadline] Resultat retenu: modele {name}")
+        return text
+
+    def _report_fallback(self, reason: str):
+        stats = self._deadline_stats
+        stats["fallbacks"] += 1
+        ratio = 100.0 * stats["fallbacks"] / stats["dictations"]
+        print(f"[Deadline] Repli sur '{self._fallback_model}' ({reason}) - "
+              f"{stats['fallbacks']}/{stats['dictations']} dictees ({ratio:.0f}%)")
+
+    # ── Transcription parallele ────────────────────────
+
+    def _parallel_for(self, duration: float):
+        """Retourne le pool de processus a utiliser pour cette duree (ou None)"""
+        workers = self._parallel_workers
+        if workers < 2 or duration < PARALLEL_MIN_DURATION:
+            return None
+
+        with self._swap_lock:
+            parallel = self._parallel
+            if parallel and not parallel.matches(self._key(), self._language, workers):
+                self._shutdown_parallel()
+                parallel = None
+            if parallel is None:
+                per_worker = estimate_model_mb(self._model_name, self._compute_type)
+                capacity = self._parallel_capacity(workers, per_worker)
+                if capacity < 2:
+                    print(f"[Parallel] Memoire insuffisante pour {workers} copies du modele "
+                          f"({per_worker} Mo chacune), transcription sequentielle")
+                    return None
+                # Chaque processus charge sa propre copie : comptee dans le budget du pool
+                self._pool.reserve("parallel", capacity * per_worker, keep=self._key())
+                parallel = ParallelTranscriber(self._key(), self._language, capacity)
+                self._parallel = parallel
+        return parallel
+
+    def _parallel_capacity(self, workers: int, per_worker: int) -> int:
+        """Nombre de processus dont les copies du modele tiennent en memoire"""
+        # Le modele principal reste charge a cote des processus
+        room = self._pool.budget_mb - per_worker
+        available = get_available_mb()
+        if available is not None:
+            room = min(room, available * PARALLEL_RAM_FRACTION)
+        return min(workers, int(room // per_worker))
+
+    def _shutdown_parallel(self):
+        parallel, self._parallel = self._parallel, None
+        if parallel:
+            parallel.shutdown()
+            self._pool.unreserve("parallel")
+
+    def has_model(self) -> bool:
+        """Retourne True si un modele est disponible pour transcrire"""
+        return self.model is not None
 
     def is_ready(self) -> bool:
         """Retourne True si le modele est charge (ou en erreur)"""
         return self._ready.is_set()
 
+    def wait_ready(self, timeout: float = None) -> bool:
+        """Attend la fin du chargement (succes ou erreur), False si le delai expire"""
+        return self._ready.wait(timeout)
+
     def has_error(self) -> bool:
         """Retourne True si le chargement a echoue"""
         return self._error is not None
@@ -63,35 +594,277 @@ class Transcriber:
         """Retourne le message d'erreur"""
         return self._error
 
-    def transcribe(self, audio_data: np.ndarray) -> str:
-        """Transcrit l'audio en texte"""
-        if audio_data is None or len(audio_data) == 0:
-            return ""
-
+    def _wait_model(self) -> bool:
+        """Attend le chargement du modele, retourne False s'il est indisponible"""
+        self._reload_if_unloaded()
         if not self._ready.is_set():
             print("[Whisper] En attente du chargement du modele...")
         self._ready.wait()
 
         if self.model is None:
             print(f"[Whisper] Modele non disponible: {self._error}")
-            return ""
+            return False
+        return True
+
+    def _decode_options(self, profile: dict = None, **overrides) -> dict:
+        """Options de decodage d'un profil (actif par defaut), surchargeables"""
+        profile = profile or self._profile
+        options = {
+            "beam_size": profile["beam_size"],
+            "best_of": profile["best_of"],
+            "temperature": profile["temperature"],
+            "condition_on_previous_text": profile["condition_on_previous_text"],
+            "without_timestamps": profile["without_timestamps"],
+            "vad_filter": True,
+            "vad_parameters": {
+                "threshold": profile["vad_threshold"],
+                "min_speech_duration_ms": profile["min_speech_duration_ms"],
+                "min_silence_duration_ms": profile["min_silence_duration_ms"],
+            },
+        }
+        options.update(overrides)
+        return options
+
+    def _decode(self, audio_data: np.ndarray, model=None, profile: dict = None, stats: dict = None,
+                **options):
+        """Lance le decodage et retourne le generateur de segments faster-whisper
 
+        Args:
+            stats: Mesures propres a cette requete (part conservee par la VAD) ;
+                plusieurs decodages peuvent etre en cours (serveur)
+        """
         if audio_data.dtype != np.float32:
             audio_data = audio_data.astype(np.float32)
 
-        # Utiliser la langue des settings si disponible
-        language = self._language
-
-        segments, info = self.model.transcribe(
+        # Reference locale : un changement de modele peut survenir
+        model = model or self.model
+        self._touch()
+        segments, info = model.transcribe(
             audio_data,
-            language=language,
-            beam_size=5,
-            vad_filter=True,
-            vad_parameters={
-                "threshold": 0.5,
-                "min_speech_duration_ms": 250,
-            }
+            language=self._language,
+            **self._decode_options(profile, **options)
+        )
+        # Part de l'audio conservee par la VAD de faster-whisper
+        if stats is not None and info.duration and info.duration_after_vad is not None:
+            stats["vad_ratio"] = info.duration_after_vad / info.duration
+        if self._watchdog:
+            return self._watchdog.filter(segments)
+        return segments
+
+    def iter_segments(self, audio_data: np.ndarray, cancel=None, **options):
+        """Transcrit l'audio et produit le texte de chaque segment des qu'il est decode
+
+        Args:
+            cancel: CancelToken verifie entre deux segments (ou deux morceaux en
+                mode parallele) ; la transcription s'arrete sans statistiques
+        """
+        if audio_data is None or len(audio_data) == 0:
+            return
+
+        if not self._wait_model():
+            return
+
+        idle = time.monotonic() - self._last_used
+        with self._swap_lock:
+            cold = self._cold or (not self._keep_warm and idle > self._keep_warm_interval)
+            self._cold = False
+
+        duration = len(audio_data) / SAMPLE_RATE
+        parallel = self._parallel_for(duration)
+        request = {}
+        start = time.perf_counter()
+        if parallel:
+            if audio_data.dtype != np.float32:
+                audio_data = audio_data.astype(np.float32)
+            texts = parallel.iter_segments(audio_data, self._decode_options(**options),
+                                           watchdog=self._watchdog is not None, cancel=cancel)
+        else:
+            texts = (segment.text.strip() for segment in
+                     self._decode(audio_data, stats=request, **options))
+
+        try:
+            for text in texts:
+                if cancel is not None and cancel.is_set():
+                    return
+                if text:
+                    yield text
+        finally:
+            texts.close()
+        if cancel is not None and cancel.is_set():
+            return
+
+        elapsed = time.perf_counter() - start
+        self._update_rtf(self._model_name, elapsed, duration)
+        state = "a froid" if cold else "a chaud"
+        vad_ratio = request.get("vad_ratio")
+        self.last_stats = (duration, elapsed, vad_ratio)
+        kept = f", VAD {vad_ratio * 100:.0f}% conserve" if vad_ratio is not None else ""
+        print(f"[Whisper] {duration:.1f}s d'audio transcrites en {elapsed:.2f}s "
+              f"(RTF {elapsed / duration:.2f}, {state}{kept})")
+
+    def transcribe(self, audio_data: np.ndarray) -> str:
+        """Transcrit l'audio en texte"""
+        return " ".join(self.iter_segments(audio_data)).strip()
+
+    def shutdown(self):
+        """Arrete les threads et processus auxiliaires (fin du processus)"""
+        self._keep_warm_stop.set()
+        self._schedule_keep_warm()
+        if self._unload_timer:
+            self._unload_timer.cancel()
+        self._shutdown_parallel()
+
+    def start_stream(self) -> "StreamingSession":
+        """Demarre une session de transcription en continu (pendant l'enregistrement)"""
+        return StreamingSession(self)
+
+
+class StreamingSession:
+    """Transcription incrementale par fenetres chevauchantes
+
+    Les blocs audio sont fournis pendant l'enregistrement via feed(). Des que
+    STREAMING_WINDOW secondes non validees sont disponibles, la fenetre est
+    decodee en arriere-plan et les segments stables (qui se terminent avant
+    les STREAMING_COMMIT_MARGIN dernieres secondes) sont valides. La fenetre
+    suivante repart du dernier segment valide, elle chevauche donc la
+    precedente. A l'arret, seule la derniere fenetre reste a decoder.
+    """
+
+    PROMPT_CHARS = 200  # Contexte transmis au decodeur pour la fenetre suivante
+
+    def __init__(self, transcriber: Transcriber, window: float = STREAMING_WINDOW,
+                 commit_margin: float = STREAMING_COMMIT_MARGIN):
+        self._transcriber = transcriber
+        self._window = int(window * SAMPLE_RATE)
+        self._margin = int(commit_margin * SAMPLE_RATE)
+        self._lock = threading.Lock()
+        self._chunks = []
+        self._total = 0
+        self._committed = 0  # Nombre d'echantillons deja transcrits et valides
+        self._next_trigger = self._window
+        self._texts = []
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+
+    def feed(self, samples: np.ndarray):
+        """Ajoute un bloc audio (appele depuis le callback d'enregistrement)"""
+        samples = samples.reshape(-1)
+        with self._lock:
+            self._chunks.append(samples)
+            self._total += len(samples)
+            if self._total >= self._next_trigger:
+                self._wakeup.set()
+
+    def _snapshot(self) -> np.ndarray:
+        """Concatene les blocs recus (compacte la liste pour les appels suivants)"""
+        with self._lock:
+            if len(self._chunks) > 1:
+                self._chunks = [np.concatenate(self._chunks)]
+            return self._chunks[0] if self._chunks else np.zeros(0, dtype=np.float32)
+
+    def _prompt(self):
+        text = " ".join(self._texts).strip()
+        return text[-self.PROMPT_CHARS:] if text else None
+
+    def _decode_tail(self, audio: np.ndarray):
+        """Decode audio[committed:] integralement et produit le texte de chaque segment"""
+        window = audio[self._committed:]
+        if len(window) == 0:
+            return
+
+        for segment in self._transcriber._decode(window, initial_prompt=self._prompt()):
+            text = segment.text.strip()
+            self._texts.append(text)
+            yield text
+        self._committed = len(audio)
+
+    def _commit_window(self, audio: np.ndarray):
+        """Decode audio[committed:] et valide les segments stables"""
+        window = audio[self._committed:]
+        if len(window) == 0:
+            return
+
+        # Les horodatages sont necessaires pour reperer les segments stables
+        segments = self._transcriber._decode(
+            window,
+            initial_prompt=self._prompt(),
+            without_timestamps=False
         )
 
-        text = " ".join([segment.text for segment in segments])
-        return text.strip()
+        # Limite de stabilite (en secondes, relative a la fenetre)
+        stable_limit = (len(window) - self._margin) / SAMPLE_RATE
+        committed_end = None
+        has_speech = False
+        for segment in segments:
+            has_speech = True
+            if segment.end > stable_limit:
+                break
+            self._texts.append(segment.text.strip())
+            committed_end = segment.end
+
+        if not has_speech:
+            # Fenetre silencieuse : tout sauf la marge peut etre ignore
+            committed_end = stable_limit
+
+        with self._lock:
+            if committed_end is not None:
+                self._committed += int(committed_end * SAMPLE_RATE)
+                self._next_trigger = self._committed + self._window
+            else:
+                # Aucun segment stable : attendre une demi-fenetre avant de reessayer
+                self._next_trigger = self._total + self._window // 2
+
+    def _worker(self):
+        if not self._transcriber._wait_model():
+            return
+
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if self._closed:
+                return
+            with self._lock:
+                if self._total < self._next_trigger:
+                    continue
+            try:
+                self._commit_window(self._snapshot())
+            except Exception as e:
+                print(f"[Whisper] Erreur transcription continue: {e}")
+                return
+
+    def finish_segments(self, audio_data: np.ndarray = None):
+        """Termine la session : produit les segments deja valides puis ceux de la derniere fenetre
+
+        Args:
+            audio_data: Buffer complet de l'enregistrement (sinon les blocs recus)
+        """
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join()
+
+        committed_texts = list(self._texts)
+        for text in committed_texts:
+            if text:
+                yield text
+
+        if audio_data is None:
+            audio_data = self._snapshot()
+        if len(audio_data) == 0 or not self._transcriber._wait_model():
+            return
+
+        tail = (len(audio_data) - self._committed) / SAMPLE_RATE
+        print(f"[Whisper] Transcription continue: {tail:.1f}s restantes a decoder")
+        for text in self._decode_tail(audio_data):
+            if text:
+                yield text
+
+    def finish(self, audio_data: np.ndarray = None) -> str:
+        """Termine la session et retourne le texte complet"""
+        return " ".join(self.finish_segments(audio_data)).strip()
+
+    def cancel(self):
+        """Abandonne la session sans decoder la fin"""
+        self._closed = True
+        self._wakeup.set()
@@ -0,0 +1,470 @@
+"""Transcriber heberge dans un processus enfant (audio en memoire partagee)
+
+L'inference CTranslate2 ne dispute plus le GIL a l'icone, a l'overlay et au
+hook clavier, et la memoire d'un modele abandonne est rendue au systeme en
+arretant son processus. L'audio est copie une seule fois dans un segment
+multiprocessing.shared_memory (le tableau n'est pas serialise) ; les segments
+reviennent un par un sur un Pipe, des qu'ils sont decodes.
+"""
+import itertools
+import multiprocessing
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from src.cancel import CancelToken
+from src.config import TRANSCRIBER_PROCESS_STOP_TIMEOUT
+from src.memory import get_rss_mb
+from src.model_pool import ModelPool
+
+
+# ── Cote processus enfant ──────────────────────────────
+
+def _run_job(transcriber, send, job_id: int, kind: str, shm_name: str, length: int,
+             cancel: CancelToken):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    audio = np.ndarray((length,), dtype=np.float32, buffer=shm.buf)
+    try:
+        result = None
+        if kind == "segments":
+            segments = transcriber.iter_segments(audio, cancel=cancel)
+            try:
+                for text in segments:
+                    if cancel.is_set():
+                        break
+                    send("segment", job_id, text)
+            finally:
+                segments.close()
+        elif kind == "draft":
+            result = transcriber.transcribe_draft(audio)
+        else:
+            result = transcriber.transcribe_within_budget(audio, cancel)
+        send("done", job_id, result, transcriber.last_stats)
+    except Exception as e:
+        send("error", job_id, str(e))
+    finally:
+        del audio
+        try:
+            shm.close()
+        except BufferError:
+            # Le modele perdant du budget de latence decode encore : le segment
+            # est libere avec le dernier tableau qui le reference
+            pass
+
+
+def _serve(conn, values: dict):
+    """Boucle du processus enfant : un Transcriber, des commandes sur le Pipe"""
+    from src.settings import Settings
+    from src.transcriber import Transcriber
+
+    settings = Settings()
+    for key, value in values.items():
+        settings.set(key, value)
+    # Dechargement apres inactivite gere par le parent : il arrete ce processus,
+    # seul moyen de rendre au systeme la memoire du tas
+    settings.set("model_unload_delay", 0)
+    transcriber = Transcriber(settings)
+
+    send_lock = threading.Lock()
+
+    def send(*message):
+        with send_lock:
+            conn.send(message)
+
+    def report_ready():
+        transcriber.wait_ready()
+        send("ready", transcriber.has_model(), transcriber.get_error(), get_rss_mb())
+
+    threading.Thread(target=report_ready, daemon=True).start()
+
+    jobs = {}  # job_id -> (thread, evenement d'annulation)
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break  # Processus parent disparu
+        command = message[0]
+        if command == "transcribe":
+            job_id = message[1]
+            cancel = CancelToken()
+            thread = threading.Thread(target=_run_job, args=(transcriber, send, *message[1:], cancel),
+                                      daemon=True)
+            jobs[job_id] = (thread, cancel)
+            thread.start()
+        elif command == "cancel":
+            if message[1] in jobs:
+                jobs[message[1]][1].set()
+        elif command == "acquire":
+            transcriber.acquire()
+        elif command == "release":
+            transcriber.release()
+        elif command == "settings":
+            for key, value in message[1].items():
+                settings.set(key, value)
+            settings.set("model_unload_delay", 0)
+            if transcriber.switch_model(settings):
+                send("loading")
+                threading.Thread(target=report_ready, daemon=True).start()
+        elif command == "stop":
+            break
+        jobs = {job_id: job for job_id, job in jobs.items() if job[0].is_alive()}
+
+    # Les transcriptions en cours se terminent avant la sortie du processus
+    for thread, _ in jobs.values():
+        thread.join()
+    transcriber.shutdown()
+    conn.close()
+
+
+# ── Cote application ───────────────────────────────────
+
+class _Worker:
+    """Processus enfant et son extremite du Pipe"""
+
+    def __init__(self, context, values: dict, key: tuple):
+        self.key = key
+        self.conn, child_conn = context.Pipe()
+        # Pas de daemon : le processus enfant peut lancer le pool de transcription parallele
+        self.process = context.Process(target=_serve, args=(child_conn, values),
+                                       name="openwhisper-transcriber")
+        self.process.start()
+        child_conn.close()
+        self.send_lock = threading.Lock()
+        self.has_model = False
+        self.error = None  # Echec du chargement du modele (definitif pour ce processus)
+        self.crashed = False  # Fin inattendue : redemarre a la prochaine utilisation
+        self.retired = False  # Arrete volontairement (remplace ou inactif)
+        self.rss_mb = None
+
+    def send(self, *message) -> bool:
+        try:
+            with self.send_lock:
+                self.conn.send(message)
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def stop(self, timeout: float = TRANSCRIBER_PROCESS_STOP_TIMEOUT):
+        """Arret propre (transcriptions en cours terminees), force apres le delai"""
+        self.send("stop")
+        self.process.join(timeout)
+        if self.process.is_alive():
+            print(f"[Process] Processus {self.process.pid} ne repond pas, arret force")
+            self.process.terminate()
+            self.process.join()
+
+
+class TranscriberProcess:
+    """Meme interface que Transcriber pour l'application, inference dans un processus enfant
+
+    Un changement de modele demarre un nouveau processus ; l'ancien continue de
+    servir jusqu'a ce que le nouveau soit pret, puis s'arrete et rend toute sa
+    memoire au systeme. De meme, apres model_unload_delay secondes
+    d'inactivite, le processus est arrete et relance au prochain acquire().
+    La transcription continue (fenetres pendant l'enregistrement) reste
+    propre au mode dans le processus principal.
+    """
+
+    def __init__(self, settings):
+        self._settings = settings
+        self._context = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._jobs = {}  # job_id -> (worker, file des reponses, memoire partagee)
+        self._ready = threading.Event()
+        self._pending = None  # Processus en cours de chargement d'un nouveau modele
+        self._closed = False
+        self._stream_warned = False
+        self._users = 0  # Enregistrements/transcriptions en cours (empeche l'arret)
+        self._last_used = time.monotonic()
+        self._unload_timer = None
+        self.last_stats = None
+        self._worker = self._spawn(settings)
+        self._touch()
+
+    @staticmethod
+    def _key(settings) -> tuple:
+        return ModelPool.make_key(settings.whisper_model, settings.device, settings.compute_type)
+
+    def _spawn(self, settings) -> _Worker:
+        worker = _Worker(self._context, settings.get_all(), self._key(settings))
+        threading.Thread(target=self._reader, args=(worker,), daemon=True).start()
+        print(f"[Process] Transcription dans le processus {worker.process.pid} "
+              f"(modele '{settings.whisper_model}')")
+        return worker
+
+    def _reader(self, worker: _Worker):
+        """Recoit les messages d'un processus enfant jusqu'a sa fin"""
+        while True:
+            try:
+                message = worker.conn.recv()
+            except (EOFError, OSError):
+                break
+            kind = message[0]
+            if kind == "ready":
+                _, worker.has_model, worker.error, worker.rss_mb = message
+                self._on_ready(worker)
+            elif kind == "loading":
+                if worker is self._worker:
+                    self._ready.clear()
+            else:
+                self._dispatch(message)
+        self._on_exit(worker)
+
+    def _dispatch(self, message):
+        job_id = message[1]
+        final = message[0] != "segment"
+        with self._lock:
+            job = self._jobs.pop(job_id, None) if final else self._jobs.get(job_id)
+        if job is None:
+            return
+        if final:
+            self._release_shm(job[2])
+        job[1].put(message)
+
+    def _on_ready(self, worker: _Worker):
+        with self._lock:
+            if worker is self._pending:
+                self._pending = None
+                if not worker.has_model and self._worker.has_model:
+                    print(f"[Process] ERREUR chargement: {worker.error}, "
+                          f"conservation du modele '{self._worker.key[0]}'")
+                    retired = worker
+                else:
+                    retired, self._worker = self._worker, worker
+            elif worker is self._worker:
+                retired = None
+            else:
+                return
+        if retired is not None:
+            threading.Thread(target=self._retire, args=(retired,), daemon=True).start()
+        if worker is self._worker:
+            rss = f" ({worker.rss_mb:.0f} Mo)" if worker.rss_mb is not None else ""
+            print(f"[Process] Modele pret dans le processus {worker.process.pid}{rss}")
+            self._ready.set()
+
+    def _retire(self, worker: _Worker):
+        """Arrete un ancien processus : sa memoire est integralement rendue au systeme"""
+        worker.retired = True
+        worker.stop()
+        freed = f", ~{worker.rss_mb:.0f} Mo rendus au systeme" if worker.rss_mb is not None else ""
+        print(f"[Process] Processus {worker.process.pid} arrete{freed}")
+
+    def _on_exit(self, worker: _Worker):
+        """Fin d'un processus : debloque ses transcriptions, signale un plantage"""
+        with self._lock:
+            orphans = [job_id for job_id, job in self._jobs.items() if job[0] is worker]
+            jobs = [self._jobs.pop(job_id) for job_id in orphans]
+            crashed = (not self._closed and not worker.retired
+                       and worker in (self._worker, self._pending))
+            if worker is self._pending:
+                self._pending = None
+        for job_id, (_, replies, shm) in zip(orphans, jobs):
+            self._release_shm(shm)
+            replies.put(("error", job_id, "processus de transcription arrete"))
+        if crashed:
+            print(f"[Process] Processus {worker.process.pid} termine "
+                  f"(code {worker.process.exitcode}), redemarrage a la prochaine dictee")
+            # Pas une erreur de chargement : has_error() reste faux pour que le hotkey
+            # atteigne acquire(), qui relance le processus
+            worker.has_model = False
+            worker.crashed = True
+            if worker is self._worker:
+                self._ready.set()
+
+    @staticmethod
+    def _release_shm(shm):
+        shm.close()
+        shm.unlink()
+
+    def _current(self) -> _Worker:
+        """Processus actif, redemarre s'il s'est termine ou a ete arrete (appele sous _lock)"""
+        worker = self._worker
+        if (worker.retired or not worker.process.is_alive()) and not self._closed:
+            if worker.crashed:
+                print("[Process] Redemarrage du processus de transcription")
+            elif worker.retired:
+                print("[Process] Relance du processus de transcription")
+            self._ready.clear()
+            self._worker = self._spawn(self._settings)
+        return self._worker
+
+    # ── Arret apres inactivite ─────────────────────────
+
+    def _touch(self):
+        """Met a jour la date de derniere utilisation et replanifie l'arret"""
+        self._last_used = time.monotonic()
+        if self._unload_timer:
+            self._unload_timer.cancel()
+            self._unload_timer = None
+        delay = self._settings.model_unload_delay
+        if delay and delay > 0 and not self._closed:
+            self._unload_timer = threading.Timer(delay, self._unload_if_idle)
+            self._unload_timer.daemon = True
+            self._unload_timer.start()
+
+    def _unload_if_idle(self):
+        """Arrete le processus inactif : malloc_trim ne rend pas le tas d'un modele decharge"""
+        delay = self._settings.model_unload_delay
+        idle = time.monotonic() - self._last_used
+        with self._lock:
+            worker = self._worker
+            if self._closed or worker.retired or not worker.process.is_alive():
+                return
+            busy = (self._users > 0 or idle < delay or self._pending is not None
+                    or not self._ready.is_set()
+                    or any(job[0] is worker for job in self._jobs.values()))
+            if not busy:
+                worker.retired = True
+                worker.has_model = False
+                self._ready.clear()
+
+        if busy:
+            self._touch()
+            return
+        print(f"[Process] Inactif depuis {idle:.0f}s, arret du processus de transcription")
+        self._retire(worker)
+
+    def _request(self, kind: str, audio_data: np.ndarray, cancel: CancelToken = None):
+        """Envoie l'audio au processus enfant et produit ses messages jusqu'au dernier
+
+        L'annulation est transmise au processus enfant des la demande, sans
+        attendre le prochain message : sa reponse finale termine le generateur.
+        """
+        audio = np.ascontiguousarray(audio_data, dtype=np.float32).reshape(-1)
+        shm = shared_memory.SharedMemory(create=True, size=audio.nbytes)
+        view = np.ndarray(audio.shape, dtype=np.float32, buffer=shm.buf)
+        view[:] = audio
+        del view
+
+        job_id = next(self._ids)
+        replies = queue.Queue()
+        with self._lock:
+            worker = self._current()
+            self._jobs[job_id] = (worker, replies, shm)
+        if not worker.send("transcribe", job_id, kind, shm.name, len(audio)):
+            self._dispatch(("error", job_id, "processus de transcription injoignable"))
+
+        def on_cancel():
+            worker.send("cancel", job_id)
+
+        if cancel is not None:
+            cancel.add_callback(on_cancel)
+        finished = False
+        try:
+            while not finished:
+                message = replies.get()
+                finished = message[0] != "segment"
+                yield message
+        finally:
+            self._touch()
+            if cancel is not None:
+                cancel.remove_callback(on_cancel)
+            if not finished:
+                # Consommation interrompue : le processus enfant s'arrete au prochain segment,
+                # la memoire partagee est liberee a la reception de sa reponse finale
+                worker.send("cancel", job_id)
+
+    def _call(self, kind: str, audio_data: np.ndarray, cancel: CancelToken = None):
+        """Requete a resultat unique (brouillon, budget de latence)"""
+        for message in self._request(kind, audio_data, cancel):
+            if message[0] == "done":
+                self.last_stats = message[3]
+                return message[2]
+            if message[0] == "error":
+                print(f"[Process] Erreur transcription: {message[2]}")
+        return None
+
+    # ── Interface de Transcriber ───────────────────────
+
+    def iter_segments(self, audio_data: np.ndarray, cancel: CancelToken = None):
+        """Produit le texte de chaque segment des qu'il est decode par le processus enfant"""
+        if audio_data is None or len(audio_data) == 0:
+            return
+        for message in self._request("segments", audio_data, cancel):
+            if message[0] == "segment":
+                yield message[2]
+            elif message[0] == "done":
+                self.last_stats = message[3]
+            else:
+                print(f"[Process] Erreur transcription: {message[2]}")
+
+    def transcribe(self, audio_data: np.ndarray) -> str:
+        return " ".join(self.iter_segments(audio_data)).strip()
+
+    def transcribe_draft(self, audio_data: np.ndarray):
+        if audio_data is None or len(audio_data) == 0:
+            return None
+        return self._call("draft", audio_data)
+
+    def transcribe_within_budget(self, audio_data: np.ndarray, cancel: CancelToken = None) -> str:
+        if audio_data is None or len(audio_data) == 0:
+            return ""
+        return self._call("budget", audio_data, cancel) or ""
+
+    def start_stream(self):
+        """Transcription continue indisponible hors du processus principal"""
+        if not self._stream_warned:
+            print("[Process] Transcription continue desactivee en mode processus separe")
+            self._stream_warned = True
+        return None
+
+    def switch_model(self, settings) -> bool:
+        """Nouveau modele : nouveau processus, l'ancien sert jusqu'a ce qu'il soit pret"""
+        self._settings = settings
+        self._touch()
+        key = self._key(settings)
+        with self._lock:
+            if self._pending is not None and self._pending.key != key:
+                threading.Thread(target=self._retire, args=(self._pending,), daemon=True).start()
+                self._pending = None
+            if self._pending is not None and self._pending.key == key:
+                # Le processus en chargement remplacera l'actuel : il recoit les options
+                self._pending.send("settings", settings.get_all())
+                return False
+            if key == self._worker.key:
+                self._worker.send("settings", settings.get_all())
+                return False
+            if not self._worker.has_model:
+                self._ready.clear()
+            self._pending = self._spawn(settings)
+        return True
+
+    def acquire(self):
+        with self._lock:
+            self._users += 1
+            worker = self._current()
+        worker.send("acquire")
+
+    def release(self):
+        with self._lock:
+            self._users = max(0, self._users - 1)
+        self._worker.send("release")
+        self._touch()
+
+    def has_model(self) -> bool:
+        return self._worker.has_model
+
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    def wait_ready(self, timeout: float = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def has_error(self) -> bool:
+        return self._ready.is_set() and self._worker.error is not None
+
+    def get_error(self) -> str:
+        return self._worker.error
+
+    def shutdown(self):
+        """Arrete les processus enfants (fin de l'application)"""
+        with self._lock:
+            self._closed = True
+            workers = [w for w in (self._worker, self._pending) if w is not None]
+            self._pending = None
+        if self._unload_timer:
+            self._unload_timer.cancel()
+        for worker in workers:
+            worker.stop()
@@ -0,0 +1,102 @@
+"""File des dictees a transcrire, traitee par un thread dedie (hors du hotkey)"""
+import queue
+import threading
+import time
+from src.cancel import CancelToken
+
+
+class TranscriptionJob:
+    """Une dictee arretee, en attente de transcription et d'injection"""
+
+    def __init__(self, job_id: int, audio, duration: float, stream=None, noise_sample=None):
+        self.id = job_id
+        self.audio = audio
+        self.duration = duration
+        self.stream = stream  # Session de transcription continue (si activee)
+        self.noise_sample = noise_sample  # Reference pour la reduction de bruit
+        self.cancel_token = CancelToken()
+        self.enqueued_at = time.perf_counter()
+
+
+class TranscriptionQueue:
+    """File FIFO a un seul consommateur : les textes sont injectes dans l'ordre
+
+    submit() retourne immediatement : le hotkey est libre et l'enregistrement
+    suivant peut demarrer pendant que le precedent est decode. La profondeur
+    de la file et le temps d'attente de chaque dictee sont journalises.
+    """
+
+    def __init__(self, handler):
+        self._handler = handler
+        self._jobs = queue.Queue()
+        self._next_id = 0
+        self._pending = 0  # Dictees soumises et pas encore terminees
+        self._lock = threading.Lock()
+        self._current = None  # Dictee en cours de traitement
+        self._stats = {"jobs": 0, "total_wait": 0.0, "max_wait": 0.0, "max_depth": 0}
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+
+    @property
+    def depth(self) -> int:
+        """Dictees en attente ou en cours de traitement"""
+        return self._pending
+
+    def cancel_all(self) -> int:
+        """Annule la dictee en cours et celles en attente, retourne leur nombre"""
+        with self._jobs.mutex:
+            jobs = [job for job in self._jobs.queue if job is not None]
+        current = self._current
+        if current is not None:
+            jobs.insert(0, current)
+        cancelled = 0
+        for job in jobs:
+            if not job.cancel_token.is_set():
+                job.cancel_token.set()
+                cancelled += 1
+        return cancelled
+
+    def create_job(self, audio, duration: float, stream=None, noise_sample=None) -> TranscriptionJob:
+        with self._lock:
+            self._next_id += 1
+            return TranscriptionJob(self._next_id, audio, duration, stream, noise_sample)
+
+    def submit(self, job: TranscriptionJob) -> int:
+        with self._lock:
+            self._pending += 1
+            depth = self._pending
+            self._stats["max_depth"] = max(self._stats["max_depth"], depth)
+        job.enqueued_at = time.perf_counter()
+        self._jobs.put(job)
+        if depth > 1:
+            print(f"[Queue] Dictee #{job.id} en file ({depth - 1} avant elle)")
+        return depth
+
+    def _worker(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            self._current = job
+
+            wait = time.perf_counter() - job.enqueued_at
+            stats = self._stats
+            stats["jobs"] += 1
+            stats["total_wait"] += wait
+            stats["max_wait"] = max(stats["max_wait"], wait)
+            if wait > 0.05:
+                print(f"[Queue] Dictee #{job.id}: {wait:.2f}s d'attente "
+                      f"(moy {stats['total_wait'] / stats['jobs']:.2f}s, max {stats['max_wait']:.2f}s, "
+                      f"profondeur max {stats['max_depth']})")
+            try:
+                self._handler(job)
+            except Exception as e:
+                print(f"[Queue] Erreur dictee #{job.id}: {e}")
+            finally:
+                self._current = None
+                with self._lock:
+                    self._pending -= 1
+
+    def stop(self):
+        """Arrete le thread apres les dictees deja soumises"""
+        self._jobs.put(None)
@@ -3,9 +3,10 @@ import tkinter as tk
 import platform
 import time
 import threading
-import queue
 import numpy as np
 from typing import Optional, Tuple
+from src.config import LEVEL_BARS
+from src.level_meter import LevelMeter
 
 IS_WINDOWS = platform.system() == "Windows"
 IS_MACOS = platform.system() == "Darwin"
@@ -25,14 +26,15 @@ class RecordingOverlay:
     WIDTH = 70
     HEIGHT = 40
     CORNER_RADIUS = 10
-    NUM_BARS = 6
+    NUM_BARS = LEVEL_BARS
 
-    def __init__(self, saved_position: Optional[Tuple[int, int]] = None):
+    def __init__(self, saved_position: Optional[Tuple[int, int]] = None,
+                 level_meter: Optional[LevelMeter] = None):
         self._position = saved_position
         self._is_visible = False
         self._thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
-        self._audio_queue = queue.Queue()
+        self._level_meter = level_meter  # Niveaux publies par l'enregistreur
         self._final_position: Optional[Tuple[int, int]] = None
 
     def show(self):
@@ -44,13 +46,6 @@ class RecordingOverlay:
         self._stop_event.clear()
         self._final_position = None
 
-        # Vider la queue audio
-        while not self._audio_queue.empty():
-            try:
-                self._audio_queue.get_nowait()
-            except queue.Empty:
-                break
-
         self._thread = threading.Thread(target=self._run_overlay, daemon=True)
         self._thread.start()
 
@@ -68,18 +63,6 @@ class RecordingOverlay:
         self._is_visible = False
         return self._final_position
 
-    def update_waveform(self, audio_samples: np.ndarray):
-        """Met a jour les donnees de la waveform (thread-safe)"""
-        if audio_samples is None or len(audio_samples) == 0:
-            return
-
-        try:
-            # Limiter la taille de la queue
-            if self._audio_queue.qsize() < 10:
-                self._audio_queue.put_nowait(audio_samples.copy())
-        except queue.Full:
-            pass
-
     def _run_overlay(self):
         """Execute l'overlay dans son propre thread"""
         try:
@@ -147,6 +130,7 @@ class RecordingOverlay:
             waveform_y = 6
             waveform_height = self.HEIGHT - 12
             waveform_data = np.zeros(self.NUM_BARS)
+            last_seq = 0
 
             # Drag state
             drag_data = {"x": 0, "y": 0}
@@ -193,7 +177,7 @@ class RecordingOverlay:
 
             def update():
                 """Mise a jour periodique"""
-                nonlocal waveform_data
+                nonlocal waveform_data, last_seq
 
                 if self._stop_event.is_set():
                     # Sauvegarder la position avant de fermer
@@ -212,24 +196,13 @@ class RecordingOverlay:
                         pass
                     return
 
-                # Traiter les donnees audio
-                try:
-                    while True:
-                        samples = self._audio_queue.get_nowait()
-                        samples = samples.flatten()
-                        if len(samples) >= self.NUM_BARS:
-                            chunk_size = len(samples) // self.NUM_BARS
-                            new_bars = []
-                            for i in range(self.NUM_BARS):
-                                chunk = samples[i * chunk_size:(i + 1) * chunk_size]
-                                # Peak amplitude pour plus de reactivite
-                                amp = np.max(np.abs(chunk))
-                                new_bars.append(amp)
-                            # Amplification moderee
-                            new_bars = np.array(new_bars) * 80
-                            # Remplacement direct pour max reactivite
-                            waveform_data = new_bars
-                except queue.Empty:
+                # Derniers niveaux publies (rien a copier ni a depiler)
+                levels = self._level_meter.latest() if self._level_meter else None
+                if levels is not None and levels.seq != last_seq:
+                    last_seq = levels.seq
+                    # Amplification moderee, remplacement direct pour max reactivite
+                    waveform_data = levels.bars * 80
+                else:
                     # Decroissance rapide pour effet pulse
                     waveform_data = waveform_data * 0.7
 
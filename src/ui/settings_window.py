@@ -58,6 +58,11 @@ class SettingsWindow:
     ]
     DEVICES = ["cpu", "cuda", "auto"]
     COMPUTE_TYPES = ["int8", "float16", "int8_float16"]
+    PROFILES = {
+        "latency": ("Rapide", "Glouton, latence min."),
+        "balanced": ("Équilibré", "Beam search"),
+        "accuracy": ("Précis", "Repli complet"),
+    }
 
     def __init__(self, settings, on_save_callback: Optional[Callable] = None):
         self.settings = settings
@@ -141,6 +146,7 @@ class SettingsWindow:
             device_var = ctk.StringVar(value=self.settings.device)
             compute_var = ctk.StringVar(value=self.settings.compute_type)
             hotkey_var = ctk.StringVar(value=self.settings.hotkey)
+            profile_var = ctk.StringVar(value=self.settings.decoding_profile)
 
             # === SIDEBAR (gauche) ===
             sidebar = ctk.CTkFrame(
@@ -252,7 +258,7 @@ class SettingsWindow:
                 scroll_frame,
                 "Paramètres de performance",
                 "Configuration du matériel et de la précision",
-                lambda p: self._create_performance_controls(p, device_var, compute_var)
+                lambda p: self._create_performance_controls(p, device_var, compute_var, profile_var)
             )
 
             # Raccourci clavier
@@ -281,7 +287,8 @@ class SettingsWindow:
                     language_var.get(),
                     device_var.get(),
                     compute_var.get(),
-                    hotkey_var.get()
+                    hotkey_var.get(),
+                    profile_var.get()
                 )
                 self._is_open = False
                 window.destroy()
@@ -485,7 +492,7 @@ class SettingsWindow:
         )
         dropdown.pack(anchor="w")
 
-    def _create_performance_controls(self, parent, device_var, compute_var):
+    def _create_performance_controls(self, parent, device_var, compute_var, profile_var):
         """Crée les contrôles de performance (style macOS)"""
         # Device selector
         device_label = ctk.CTkLabel(
@@ -552,6 +559,62 @@ class SettingsWindow:
         )
         compute_dropdown.pack(anchor="w")
 
+        # Profil de decodage
+        profile_label = ctk.CTkLabel(
+            parent,
+            text="Profil de décodage",
+            font=ctk.CTkFont(family="SF Pro Text", size=12, weight="bold"),
+            text_color=self.TEXT_COLOR,
+            anchor="w"
+        )
+        profile_label.pack(fill="x", pady=(18, 8))
+
+        profile_frame = ctk.CTkFrame(parent, fg_color="transparent")
+        profile_frame.pack(fill="x")
+
+        for profile, (label, desc) in self.PROFILES.items():
+            is_selected = profile_var.get() == profile
+
+            btn = ctk.CTkButton(
+                profile_frame,
+                text=f"{label}\n{desc}",
+                width=140,
+                height=55,
+                font=ctk.CTkFont(family="SF Pro Text", size=12),
+                fg_color=self.ACCENT_COLOR if is_selected else self.BG_COLOR,
+                border_width=1,
+                border_color=self.ACCENT_COLOR if is_selected else self.BORDER_COLOR,
+                text_color="white" if is_selected else self.TEXT_COLOR,
+                hover_color=self.ACCENT_HOVER if is_selected else self.HOVER_BG,
+                corner_radius=8,
+                command=lambda p=profile: self._select_profile(profile_var, p, profile_frame)
+            )
+            btn.pack(side="left", padx=(0, 10))
+
+        hint = ctk.CTkLabel(
+            parent,
+            text="💡 Les threads CPU du profil s'appliquent au prochain chargement du modèle",
+            font=ctk.CTkFont(family="SF Pro Text", size=11),
+            text_color=self.TEXT_MUTED,
+            anchor="w"
+        )
+        hint.pack(anchor="w", pady=(8, 0))
+
+    def _select_profile(self, profile_var, profile, parent):
+        """Met à jour la sélection du profil de décodage"""
+        profile_var.set(profile)
+        selected_label, _ = self.PROFILES[profile]
+
+        for widget in parent.winfo_children():
+            if isinstance(widget, ctk.CTkButton):
+                is_selected = widget.cget("text").split("\n")[0] == selected_label
+                widget.configure(
+                    fg_color=self.ACCENT_COLOR if is_selected else self.BG_COLOR,
+                    border_color=self.ACCENT_COLOR if is_selected else self.BORDER_COLOR,
+                    text_color="white" if is_selected else self.TEXT_COLOR,
+                    hover_color=self.ACCENT_HOVER if is_selected else self.HOVER_BG
+                )
+
     def _select_device(self, device_var, device, parent):
         """Met à jour la sélection du device"""
         device_var.set(device)
@@ -604,7 +667,7 @@ class SettingsWindow:
         hint.pack(anchor="w", pady=(8, 0))
 
     def _save_settings(self, model: str, language_name: str, device: str,
-                       compute: str, hotkey: str):
+                       compute: str, hotkey: str, profile: str):
         """Sauvegarde les paramètres"""
         hotkey = hotkey.strip().lower()
 
@@ -629,11 +692,12 @@ class SettingsWindow:
         self.settings.set("device", device)
         self.settings.set("compute_type", compute)
         self.settings.set("hotkey", hotkey)
+        self.settings.set("decoding_profile", profile)
 
         # Sauvegarder
         self.settings.save()
 
-        print(f"[Settings] Sauvegarde: model={model}, lang={language_code}, device={device}")
+        print(f"[Settings] Sauvegarde: model={model}, lang={language_code}, device={device}, profile={profile}")
 
         # Appeler le callback si fourni
         if self.on_save_callback:
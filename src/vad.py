@@ -0,0 +1,176 @@
+"""Detection d'activite vocale cote client (avant le modele)"""
+from pathlib import Path
+import numpy as np
+from src.config import (
+    SAMPLE_RATE, VAD_FRAME_MS, VAD_MARGIN_DB, VAD_MIN_THRESHOLD_DB, VAD_MAX_FLOOR_DB,
+    VAD_PAD_MS, VAD_MIN_SPEECH_MS,
+)
+
+EPSILON = 1e-10
+
+
+class EnergyVAD:
+    """VAD par energie, alimentee bloc par bloc pendant l'enregistrement
+
+    feed() calcule l'energie de chaque trame de VAD_FRAME_MS (quelques
+    operations NumPy par bloc, appelable depuis le callback audio). A l'arret,
+    apply() decide trame par trame : seuil = bruit ambiant + VAD_MARGIN_DB.
+    Les silences de debut et de fin sont retires, les longues pauses sont
+    ramenees a 2 x VAD_PAD_MS et un enregistrement sans parole retourne None
+    sans que le modele soit sollicite.
+    """
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self.frame = int(sample_rate * VAD_FRAME_MS / 1000)
+        self.noise_floor_db = None  # Bruit ambiant calibre (dBFS)
+        self.saved_seconds = 0.0  # Audio epargne au modele depuis le lancement
+        self.last_stats = None
+        self.leading_silence = 0  # Echantillons sans parole avant le debut (profil de bruit)
+        self._remainder = np.zeros(0, dtype=np.float32)
+        self._levels = []  # Energie par trame (dBFS), un tableau par bloc
+
+    def reset(self):
+        """Nouvel enregistrement"""
+        self._remainder = np.zeros(0, dtype=np.float32)
+        self._levels = []
+
+    def _frame_levels(self, samples: np.ndarray) -> np.ndarray:
+        n = len(samples) // self.frame
+        frames = samples[:n * self.frame].reshape(n, self.frame)
+        power = np.einsum("ij,ij->i", frames, frames, dtype=np.float64) / self.frame
+        return (10.0 * np.log10(power + EPSILON)).astype(np.float32)
+
+    def feed(self, samples: np.ndarray):
+        """Ajoute un bloc mono (frames,) ou (frames, 1) float32"""
+        samples = samples.reshape(-1)
+        if len(self._remainder):
+            samples = np.concatenate((self._remainder, samples))
+        usable = len(samples) - len(samples) % self.frame
+        if usable:
+            self._levels.append(self._frame_levels(samples[:usable]))
+        self._remainder = samples[usable:].astype(np.float32, copy=True)
+
+    def calibrate(self, samples: np.ndarray) -> bool:
+        """Mesure le bruit ambiant sur un extrait sans parole (pre-roll, demarrage)"""
+        samples = np.asarray(samples, dtype=np.float32).reshape(-1)
+        if len(samples) < 4 * self.frame:
+            return False
+        levels = self._frame_levels(samples)
+        # Percentile bas : robuste a un debut de mot dans l'extrait
+        level = float(np.percentile(levels, 20))
+        if self.noise_floor_db is None:
+            self.noise_floor_db = level
+        else:
+            # Baisse immediate, hausse progressive (parole juste avant le hotkey)
+            self.noise_floor_db = min(level, 0.7 * self.noise_floor_db + 0.3 * level)
+        return True
+
+    def _threshold(self, levels: np.ndarray) -> float:
+        floor = self.noise_floor_db
+        if floor is None:
+            # Pas de calibration : les pauses de l'enregistrement servent de reference
+            floor = min(float(np.percentile(levels, 10)), VAD_MAX_FLOOR_DB)
+        return max(floor + VAD_MARGIN_DB, VAD_MIN_THRESHOLD_DB)
+
+    def _speech_frames(self, audio: np.ndarray) -> np.ndarray:
+        """Trames contenant de la parole (masque booleen)"""
+        levels = np.concatenate(self._levels) if self._levels else np.zeros(0, np.float32)
+        if len(levels) == 0:
+            return np.zeros(0, dtype=bool)
+        return levels > self._threshold(levels)
+
+    def apply(self, audio: np.ndarray):
+        """Retire les silences de `audio`, retourne None s'il n'y a pas de parole"""
+        duration = len(audio) / self.sample_rate
+        speech = self._speech_frames(audio)
+
+        # Ignorer les clics isoles : au moins VAD_MIN_SPEECH_MS de parole au total
+        min_frames = max(1, int(VAD_MIN_SPEECH_MS / VAD_FRAME_MS))
+        if int(speech.sum()) < min_frames:
+            self.leading_silence = len(audio)
+            self.saved_seconds += duration
+            self.last_stats = (duration, 0.0)
+            print(f"[VAD] Aucune parole detectee ({duration:.1f}s), modele non sollicite")
+            return None
+
+        # Marge autour de la parole : dilatation du masque de VAD_PAD_MS de chaque cote
+        pad = int(VAD_PAD_MS / VAD_FRAME_MS)
+        kernel = np.ones(2 * pad + 1, dtype=np.float32)
+        keep = np.convolve(speech.astype(np.float32), kernel, mode="same") > 0
+
+        # Plages d'echantillons conservees (la derniere trame incomplete suit la precedente).
+        # Pas de masque par echantillon : seules les plages gardees sont lues, un tampon
+        # deborde sur disque (np.memmap) n'est pas recharge en entier
+        n_frames = min(len(keep), -(-len(audio) // self.frame))
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], keep[:n_frames], [0])).astype(np.int8)))
+        starts = edges[0::2] * self.frame
+        ends = np.minimum(edges[1::2] * self.frame, len(audio))
+        if len(edges) and edges[-1] == n_frames:
+            ends[-1] = len(audio)
+
+        self.leading_silence = int(starts[0]) if len(starts) else 0
+        if len(starts) == 1 and starts[0] == 0 and ends[0] == len(audio):
+            self.last_stats = (duration, duration)
+            return audio
+
+        if isinstance(audio, np.memmap) and audio.filename:
+            trimmed = self._compact_to_file(audio, starts, ends)
+        else:
+            trimmed = np.empty(int((ends - starts).sum()), dtype=np.float32)
+            position = 0
+            for start, end in zip(starts, ends):
+                trimmed[position:position + end - start] = audio[start:end]
+                position += end - start
+        kept = len(trimmed) / self.sample_rate
+        self.saved_seconds += duration - kept
+        self.last_stats = (duration, kept)
+        print(f"[VAD] {duration:.1f}s -> {kept:.1f}s ({duration - kept:.1f}s de silence retires, "
+              f"{self.saved_seconds:.1f}s depuis le lancement)")
+        return trimmed
+
+    @staticmethod
+    def _compact_to_file(audio: np.memmap, starts: np.ndarray, ends: np.ndarray) -> np.memmap:
+        """Plages gardees d'un enregistrement deborde sur disque, ecrites a cote de lui
+
+        L'audio garde n'est pas recharge en memoire : la memoire residente reste
+        constante. Le fichier porte le prefixe des enregistrements longs et est
+        supprime avec eux.
+        """
+        source = Path(audio.filename)
+        path = source.with_name(f"{source.stem}-vad{source.suffix}")
+        with open(path, "wb") as f:
+            for start, end in zip(starts, ends):
+                audio[start:end].astype(np.float32, copy=False).tofile(f)
+        return np.memmap(path, dtype=np.float32, mode="r")
+
+
+class SileroVAD(EnergyVAD):
+    """Decision par le modele Silero embarque dans faster-whisper (plus precis)
+
+    L'energie reste calculee en flux (niveau, calibration) ; la decision finale
+    est prise sur le tampon complet a l'arret.
+    """
+
+    def _speech_frames(self, audio: np.ndarray) -> np.ndarray:
+        try:
+            from faster_whisper.vad import VadOptions, get_speech_timestamps
+        except Exception as e:
+            print(f"[VAD] Silero indisponible ({e}), repli sur l'energie")
+            return super()._speech_frames(audio)
+
+        options = VadOptions(min_silence_duration_ms=VAD_PAD_MS * 2, speech_pad_ms=0)
+        chunks = get_speech_timestamps(np.asarray(audio, dtype=np.float32), options)
+        speech = np.zeros(-(-len(audio) // self.frame), dtype=bool)
+        for chunk in chunks:
+            speech[chunk["start"] // self.frame:-(-chunk["end"] // self.frame)] = True
+        return speech
+
+
+def create_vad(mode: str):
+    """Instancie la VAD correspondant au mode ("off" -> None)"""
+    if mode == "energy":
+        return EnergyVAD()
+    if mode == "silero":
+        return SileroVAD()
+    return None
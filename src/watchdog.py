@@ -0,0 +1,143 @@
+"""Surveillance du flux de segments : detection des boucles de decodage"""
+import re
+import threading
+import zlib
+from collections import Counter, deque
+from src.config import (
+    WATCHDOG_MAX_COMPRESSION_RATIO, WATCHDOG_MAX_TOKENS_PER_SECOND,
+    WATCHDOG_NGRAM, WATCHDOG_MAX_NGRAM_REPEATS, WATCHDOG_MAX_SEGMENT_REPEATS, WATCHDOG_MAX_SKIPS,
+)
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"[^\w' ]", "", text.lower()).strip()
+
+
+def _compression_ratio(text: str) -> float:
+    data = text.encode("utf-8")
+    return len(data) / len(zlib.compress(data)) if data else 0.0
+
+
+class DecodingWatchdog:
+    """Ecarte les segments ou Whisper boucle sur la meme phrase
+
+    Une repetition n'est suspecte que si les horodatages n'avancent pas
+    (meme fenetre decodee plusieurs fois) : "oui. oui. oui." prononce reste
+    intact. Un segment identique a un segment recent sans avancer est
+    retenu ; si la repetition continue, les segments retenus sont ecartes et
+    le decodage reprend a la fenetre suivante. Sinon ils sont relaches
+    normalement. Le decodage n'est interrompu qu'apres max_skips segments
+    anormaux consecutifs.
+    """
+
+    HISTORY = 8  # Segments recents compares au nouveau segment
+    TIME_TOLERANCE = 0.01  # Secondes : en deca, l'horodatage n'avance pas
+
+    _aborts = 0
+    _skips = 0
+    _aborts_lock = threading.Lock()
+
+    def __init__(self, max_compression_ratio: float = WATCHDOG_MAX_COMPRESSION_RATIO,
+                 max_tokens_per_second: float = WATCHDOG_MAX_TOKENS_PER_SECOND,
+                 ngram: int = WATCHDOG_NGRAM,
+                 max_ngram_repeats: int = WATCHDOG_MAX_NGRAM_REPEATS,
+                 max_segment_repeats: int = WATCHDOG_MAX_SEGMENT_REPEATS,
+                 max_skips: int = WATCHDOG_MAX_SKIPS):
+        self.max_compression_ratio = max_compression_ratio
+        self.max_tokens_per_second = max_tokens_per_second
+        self.ngram = ngram
+        self.max_ngram_repeats = max_ngram_repeats
+        self.max_segment_repeats = max_segment_repeats
+        self.max_skips = max_skips
+
+    def check_segment(self, segment):
+        """Retourne la raison si le segment seul est anormal, None sinon"""
+        text = segment.text.strip()
+        if not text:
+            return None
+
+        ratio = getattr(segment, "compression_ratio", None)
+        if ratio is None:
+            ratio = _compression_ratio(text)
+        if ratio > self.max_compression_ratio:
+            return f"taux de compression {ratio:.1f}"
+
+        tokens = getattr(segment, "tokens", None)
+        if tokens:
+            duration = max(segment.end - segment.start, 1.0)
+            rate = len(tokens) / duration
+            if rate > self.max_tokens_per_second:
+                return f"{rate:.0f} tokens/s"
+
+        words = _normalize(text).split()
+        ngrams = Counter(tuple(words[i:i + self.ngram]) for i in range(len(words) - self.ngram + 1))
+        if ngrams:
+            gram, count = ngrams.most_common(1)[0]
+            if count >= self.max_ngram_repeats:
+                return f"n-gramme '{' '.join(gram)}' repete {count} fois"
+
+        return None
+
+    def _stalled(self, segment, last_end) -> bool:
+        """Le segment ne fait pas avancer le temps (fenetre decodee a nouveau)"""
+        if last_end is None:
+            return False
+        return (segment.end <= last_end + self.TIME_TOLERANCE
+                or segment.end - segment.start <= self.TIME_TOLERANCE)
+
+    def filter(self, segments):
+        """Produit les segments en ecartant les boucles, s'arrete si elles persistent"""
+        recent = deque(maxlen=self.HISTORY)
+        held = []
+        last_end = None  # Fin du dernier segment produit
+        skipped = 0  # Segments anormaux consecutifs
+        for segment in segments:
+            reason = self.check_segment(segment)
+            norm = _normalize(segment.text)
+
+            if reason is None and norm and norm in recent and self._stalled(segment, last_end):
+                if len(held) + 1 < self.max_segment_repeats:
+                    held.append(segment)
+                    continue
+                reason = f"segment repete {len(held) + 2} fois sans avancer"
+
+            if reason:
+                skipped += 1
+                if skipped >= self.max_skips:
+                    self._abort(reason, segment.start, len(held) + 1)
+                    if hasattr(segments, "close"):
+                        segments.close()
+                    return
+                self._skip(reason, segment.start, len(held) + 1)
+                held.clear()
+                continue
+
+            skipped = 0
+            for previous in held:
+                yield previous
+            held.clear()
+            recent.append(norm)
+            last_end = segment.end
+            yield segment
+
+        # Fin naturelle du decodage : les repetitions isolees sont legitimes
+        yield from held
+
+    def _skip(self, reason: str, at: float, dropped: int):
+        with DecodingWatchdog._aborts_lock:
+            DecodingWatchdog._skips += 1
+            total = DecodingWatchdog._skips
+        print(f"[Watchdog] Boucle a {at:.1f}s: {reason} ({dropped} segment(s) ecarte(s), "
+              f"decodage poursuivi, {total} depuis le demarrage)")
+
+    def _abort(self, reason: str, at: float, dropped: int):
+        with DecodingWatchdog._aborts_lock:
+            DecodingWatchdog._aborts += 1
+            total = DecodingWatchdog._aborts
+        print(f"[Watchdog] Decodage interrompu a {at:.1f}s: {reason} "
+              f"({dropped} segment(s) ecarte(s), {self.max_skips} anomalies consecutives, "
+              f"{total} interruption(s) depuis le demarrage)")
+
+    @classmethod
+    def abort_count(cls) -> int:
+        return cls._aborts
@@ -0,0 +1,61 @@
+"""Fixtures communes : faux faster-whisper et dossier de parametres isole"""
+import sys
+import textwrap
+import pytest
+
+ROOT_DIR = __file__.rsplit("tests", 1)[0]
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+# Un segment de 2 s par tranche de 2 s d'audio, texte "w<i>@<modele>"
+FAKE_FASTER_WHISPER = textwrap.dedent('''
+    import os
+    import time
+    from collections import namedtuple
+
+    Segment = namedtuple("Segment", "id seek start end text tokens temperature avg_logprob "
+                                    "compression_ratio no_speech_prob words")
+    Info = namedtuple("Info", "language duration duration_after_vad")
+    DELAY = float(os.environ.get("FAKE_WHISPER_DELAY", "0"))  # Duree de decodage d'un segment
+
+
+    class WhisperModel:
+        def __init__(self, name, device="cpu", compute_type="int8", cpu_threads=0,
+                     num_workers=1, **kwargs):
+            self.name = name
+            self.cpu_threads = cpu_threads
+
+        def transcribe(self, audio, **options):
+            duration = len(audio) / 16000
+
+            def generate():
+                t, i = 0.0, 0
+                while t + 2 <= duration + 1e-9:
+                    time.sleep(DELAY)
+                    yield Segment(i, 0, t, t + 2, f" w{i}@{self.name}", [1, 2, 3], 0.0, -0.1,
+                                  1.2, 0.01, None)
+                    t += 2
+                    i += 1
+            return generate(), Info("fr", duration, duration)
+''')
+
+
+@pytest.fixture
+def settings_dir(tmp_path, monkeypatch):
+    """Parametres lus et ecrits dans un dossier temporaire"""
+    for variable in ("XDG_CONFIG_HOME", "APPDATA"):
+        monkeypatch.setenv(variable, str(tmp_path / "config"))
+    monkeypatch.setenv("HOME", str(tmp_path))
+    return tmp_path / "config"
+
+
+@pytest.fixture
+def fake_whisper(tmp_path, monkeypatch):
+    """Module faster_whisper factice, visible aussi des processus enfants (spawn)"""
+    package = tmp_path / "fake_modules" / "faster_whisper"
+    package.mkdir(parents=True)
+    (package / "__init__.py").write_text(FAKE_FASTER_WHISPER)
+    monkeypatch.syspath_prepend(str(package.parent))
+    monkeypatch.delitem(sys.modules, "faster_whisper", raising=False)
+    import faster_whisper
+    return faster_whisper
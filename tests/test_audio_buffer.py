@@ -0,0 +1,44 @@
+import threading
+import numpy as np
+from src.audio_buffer import AudioRingBuffer, SpillingAudioBuffer
+from src.config import SAMPLE_RATE
+
+
+def test_spill_callback_only_wakes_writer(tmp_path, monkeypatch):
+    buffer = SpillingAudioBuffer(1.0, threshold_seconds=0.5, directory=tmp_path)
+    threads = threading.active_count()
+    created = []
+    monkeypatch.setattr(threading, "Thread", lambda *a, **k: created.append(a) or None)
+
+    block = np.linspace(-0.5, 0.5, 1600, dtype=np.float32)
+    for _ in range(20):  # 2 s : seuil franchi dans le "callback"
+        buffer.write(block)
+
+    # Ni thread ni tampon crees au passage du seuil
+    assert created == []
+    assert threading.active_count() == threads
+    monkeypatch.undo()
+
+    audio = buffer.view()
+    assert isinstance(audio, np.memmap)
+    assert len(audio) == 20 * 1600
+    np.testing.assert_array_equal(audio[:1600], block)
+    np.testing.assert_array_equal(audio[-1600:], block)
+
+
+def test_writer_stops_below_threshold(tmp_path):
+    buffer = SpillingAudioBuffer(1.0, threshold_seconds=10, directory=tmp_path)
+    buffer.write(np.zeros(SAMPLE_RATE // 2, dtype=np.float32))
+    assert len(buffer.view()) == SAMPLE_RATE // 2
+    buffer._writer.join(1)
+    assert not buffer._writer.is_alive()
+    assert not list(tmp_path.iterdir())
+
+
+def test_int16_storage_clips_out_of_range_samples():
+    block = np.array([1.05, -1.2, 0.5, 1.0, -1.0], dtype=np.float32)
+    for grow in (True, False):
+        buffer = AudioRingBuffer(1.0, dtype="int16", grow=grow)
+        buffer.write(block)
+        # Ecretage a pleine echelle au lieu d'un debordement de signe
+        np.testing.assert_allclose(buffer.view(), [1.0, -1.0, 0.5, 1.0, -1.0], atol=1e-4)
@@ -0,0 +1,24 @@
+import time
+import numpy as np
+from src.audio_recorder import AudioRecorder
+from src.audio_sources import SyntheticSource
+
+
+def test_preroll_reaches_audio_callback(settings_dir):
+    recorder = AudioRecorder(spill_threshold=0, vad_mode="off", blocksize=1600,
+                             source=SyntheticSource("speech"))
+    assert recorder.open_warm_stream()
+    try:
+        time.sleep(0.5)  # Pre-roll rempli
+        received = []
+        assert recorder.start(on_audio_callback=received.append)
+        time.sleep(0.3)
+        audio = recorder.stop(trim=False)
+    finally:
+        recorder.close_warm_stream()
+
+    # La session continue recoit exactement l'audio du tampon, pre-roll compris
+    assert audio is not None
+    fed = np.concatenate([block.reshape(-1) for block in received])
+    assert len(fed) == len(audio)
+    np.testing.assert_allclose(fed, audio, atol=1e-4)
@@ -0,0 +1,48 @@
+import threading
+import time
+import numpy as np
+from src.cancel import CancelToken
+from src.config import SAMPLE_RATE, PARALLEL_CHUNK_SECONDS
+from src.parallel_transcriber import ParallelTranscriber
+
+
+def test_callbacks_run_once_on_cancel():
+    token = CancelToken()
+    calls = []
+    token.add_callback(lambda: calls.append("a"))
+    removed = lambda: calls.append("removed")  # noqa: E731
+    token.add_callback(removed)
+    token.remove_callback(removed)
+
+    token.set()
+    token.set()
+    assert calls == ["a"]
+    assert token.requested_at is not None
+
+    # Jeton deja annule : appel immediat
+    token.add_callback(lambda: calls.append("late"))
+    assert calls == ["a", "late"]
+
+
+def test_cancel_stops_running_chunks(fake_whisper, monkeypatch):
+    monkeypatch.setenv("FAKE_WHISPER_DELAY", "0.5")
+    parallel = ParallelTranscriber(("tiny", "cpu", "int8", 0), "fr", 2)
+    audio = np.zeros(int(PARALLEL_CHUNK_SECONDS * 3 * SAMPLE_RATE), dtype=np.float32)
+
+    cancel = CancelToken()
+    processes = []
+    cancel.add_callback(lambda: processes.extend(parallel._executor._processes.values()))
+    threading.Timer(1.5, cancel.set).start()
+
+    start = time.perf_counter()
+    texts = list(parallel.iter_segments(audio, {}, watchdog=False, cancel=cancel))
+    elapsed = time.perf_counter() - start
+
+    # Un morceau dure 15 s : les processus sont arretes au lieu de finir leur morceau
+    assert texts == []
+    assert elapsed < 5
+    assert processes
+    for process in processes:
+        process.join(5)
+        assert not process.is_alive()
+    assert not parallel.matches(("tiny", "cpu", "int8", 0), "fr", 2)
@@ -0,0 +1,90 @@
+import threading
+import time
+import numpy as np
+from src.cancel import CancelToken
+from src.settings import Settings
+from src.transcriber import Transcriber
+
+AUDIO = np.zeros(16000 * 4, dtype=np.float32)  # Deux segments du faux modele
+
+
+def _budget_transcriber(budget=0.3):
+    settings = Settings()
+    settings.set("model_warmup", False)
+    settings.set("whisper_model", "base")
+    settings.set("latency_budget", budget)
+    settings.set("fallback_model", "tiny")
+    transcriber = Transcriber(settings)
+    assert transcriber.wait_ready(10)
+    deadline = time.monotonic() + 5
+    while transcriber.get_aux_model("tiny") is None:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    return transcriber
+
+
+def _slow(model, delay):
+    """Ralentit le decodage du modele : delay secondes avant chaque segment"""
+    transcribe = model.transcribe
+
+    def slow_transcribe(audio, **options):
+        segments, info = transcribe(audio, **options)
+
+        def generate():
+            for segment in segments:
+                time.sleep(delay)
+                yield segment
+        return generate(), info
+
+    model.transcribe = slow_transcribe
+
+
+def test_fast_main_model_wins(settings_dir, fake_whisper):
+    transcriber = _budget_transcriber()
+    try:
+        assert transcriber.transcribe_within_budget(AUDIO) == "w0@base w1@base"
+        assert transcriber._deadline_stats["fallbacks"] == 0
+    finally:
+        transcriber.shutdown()
+
+
+def test_fallback_wins_after_deadline(settings_dir, fake_whisper):
+    transcriber = _budget_transcriber()
+    try:
+        _slow(transcriber.model, 1.0)
+        start = time.perf_counter()
+        assert transcriber.transcribe_within_budget(AUDIO) == "w0@tiny w1@tiny"
+        assert time.perf_counter() - start < 1.5
+        assert transcriber._deadline_stats == {"dictations": 1, "fallbacks": 1}
+        # Le modele principal a depasse le budget : son RTF le reflete
+        assert transcriber._rtf["base"] * 4 >= 0.3
+
+        # Estimation au-dela du budget : repli direct, sans lancer le modele principal
+        transcriber._rtf["base"] = 1.0
+        start = time.perf_counter()
+        assert transcriber.transcribe_within_budget(AUDIO) == "w0@tiny w1@tiny"
+        assert time.perf_counter() - start < 0.5
+        assert transcriber._deadline_stats == {"dictations": 2, "fallbacks": 2}
+    finally:
+        transcriber.shutdown()
+
+
+def test_cancel_during_race_returns_nothing(settings_dir, fake_whisper):
+    transcriber = _budget_transcriber()
+    try:
+        _slow(transcriber.model, 0.5)
+        _slow(transcriber.get_aux_model("tiny"), 0.5)
+        cancel = CancelToken()
+        threading.Timer(0.4, cancel.set).start()
+
+        start = time.perf_counter()
+        assert transcriber.transcribe_within_budget(AUDIO, cancel) == ""
+        # Les deux modeles s'arretent au segment suivant au lieu de finir la dictee
+        assert time.perf_counter() - start < 1.5
+        # Le modele de repli n'est plus protege une fois son decodage arrete
+        deadline = time.monotonic() + 2
+        while transcriber._pool._pinned != {transcriber._key(): 1}:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+    finally:
+        transcriber.shutdown()
@@ -0,0 +1,98 @@
+import time
+import numpy as np
+from src.config import PARALLEL_MIN_DURATION, SAMPLE_RATE
+from src.model_pool import ModelPool, estimate_model_mb
+from src.settings import Settings
+from src.transcriber import Transcriber
+import src.transcriber as transcriber_module
+
+
+def test_reservation_counts_in_budget(fake_whisper):
+    pool = ModelPool(budget_mb=200)
+    main, aux = ModelPool.make_key("tiny", "cpu", "int8"), ModelPool.make_key("base", "cpu", "int8")
+    pool.get(main)
+    pool.get(aux)
+    assert pool.used_mb() == estimate_model_mb("tiny", "int8") + estimate_model_mb("base", "int8")
+
+    # Les copies des processus paralleles evincent le modele auxiliaire, pas le principal
+    pool.reserve("parallel", 100, keep=main)
+    assert main in pool and aux not in pool
+    assert pool.used_mb() == estimate_model_mb("tiny", "int8") + 100
+    pool.unreserve("parallel")
+    assert pool.used_mb() == estimate_model_mb("tiny", "int8")
+
+
+def test_parallel_workers_capped_by_memory(settings_dir, fake_whisper, monkeypatch):
+    settings = Settings()
+    settings.set("model_warmup", False)
+    settings.set("whisper_model", "small")
+    settings.set("compute_type", "int8")
+    settings.set("parallel_workers", 8)
+    settings.set("model_pool_budget_mb", 100000)
+    per_worker = estimate_model_mb("small", "int8")
+    # Assez de RAM disponible pour 3 copies seulement
+    monkeypatch.setattr(transcriber_module, "get_available_mb", lambda: 3.5 * per_worker / 0.8)
+
+    transcriber = Transcriber(settings)
+    try:
+        assert transcriber.wait_ready(10)
+        parallel = transcriber._parallel_for(PARALLEL_MIN_DURATION)
+        assert parallel.workers == 3
+        assert transcriber._pool.used_mb() == 4 * per_worker
+        assert transcriber._parallel_for(PARALLEL_MIN_DURATION) is parallel
+
+        transcriber._unload_delay = 0.01
+        transcriber._last_used = 0
+        transcriber._unload_if_idle()
+        assert transcriber._parallel is None and parallel._closed
+        assert transcriber._pool.used_mb() == 0
+    finally:
+        transcriber.shutdown()
+
+
+def test_parallel_disabled_without_memory(settings_dir, fake_whisper, monkeypatch):
+    settings = Settings()
+    settings.set("model_warmup", False)
+    settings.set("parallel_workers", 4)
+    monkeypatch.setattr(transcriber_module, "get_available_mb", lambda: 10)
+    transcriber = Transcriber(settings)
+    try:
+        assert transcriber.wait_ready(10)
+        assert transcriber._parallel_for(PARALLEL_MIN_DURATION) is None
+        audio = np.zeros(int(PARALLEL_MIN_DURATION * SAMPLE_RATE), dtype=np.float32)
+        assert len(list(transcriber.iter_segments(audio))) == PARALLEL_MIN_DURATION // 2
+    finally:
+        transcriber.shutdown()
+
+
+def test_aux_model_does_not_evict_active_main(settings_dir, fake_whisper):
+    settings = Settings()
+    settings.set("model_warmup", False)
+    settings.set("whisper_model", "base")
+    settings.set("compute_type", "int8")
+    settings.set("latency_budget", 5.0)
+    settings.set("fallback_model", "small")
+    # Place pour un seul des deux modeles
+    settings.set("model_pool_budget_mb", estimate_model_mb("small", "int8") + 10)
+
+    transcriber = Transcriber(settings)
+    try:
+        assert transcriber.wait_ready(10)
+        pool, main = transcriber._pool, transcriber._key()
+        aux = ModelPool.make_key("small", "cpu", "int8")
+        deadline = time.monotonic() + 5
+        while aux not in pool:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+        # Le modele principal reste dans le pool : memoire comptee et reutilisable sans rechargement
+        assert pool.peek(main) is transcriber.model
+        assert pool.used_mb() == estimate_model_mb("base", "int8") + estimate_model_mb("small", "int8")
+
+        # Une fois le principal decharge, il n'est plus protege
+        transcriber._unload_delay = 0.01
+        transcriber._last_used = 0
+        transcriber._unload_if_idle()
+        assert not pool._pinned
+    finally:
+        transcriber.shutdown()
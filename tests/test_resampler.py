@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from scipy.signal import resample_poly
+from src.resampler import StreamingResampler, downmix
+
+
+def _stream(resampler: StreamingResampler, signal: np.ndarray, seed: int = 0) -> np.ndarray:
+    """Traitement bloc par bloc, tailles de bloc irregulieres comme un peripherique"""
+    rng = np.random.default_rng(seed)
+    out, position = [], 0
+    while position < len(signal):
+        size = int(rng.integers(1, 2000))
+        out.append(resampler.process(signal[position:position + size]))
+        position += size
+    out.append(resampler.flush())
+    return np.concatenate(out)
+
+
+@pytest.mark.parametrize("rate", [48000, 44100, 22050, 8000])
+def test_matches_resample_poly(rate):
+    rng = np.random.default_rng(rate)
+    t = np.arange(rate * 2) / rate
+    signal = (0.3 * np.sin(2 * np.pi * 440 * t) + 0.05 * rng.standard_normal(len(t))).astype(np.float32)
+
+    resampler = StreamingResampler(rate)
+    expected = resample_poly(signal.astype(np.float64), resampler.up, resampler.down)
+    output = _stream(resampler, signal)
+
+    # Meme longueur et memes echantillons qu'un traitement d'un seul tenant
+    assert len(output) == len(expected)
+    np.testing.assert_allclose(output, expected, atol=1e-5)
+
+
+def test_native_rate_is_passthrough():
+    resampler = StreamingResampler(16000)
+    block = np.linspace(-1, 1, 512, dtype=np.float32)
+    assert resampler.process(block) is block
+    assert len(resampler.flush()) == 0
+
+
+def test_downmix_int16_stereo():
+    block = np.array([[32767, -32767], [16384, 16384]], dtype=np.int16)
+    np.testing.assert_allclose(downmix(block), [0.0, 0.5], atol=1e-4)
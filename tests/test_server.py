@@ -0,0 +1,168 @@
+import contextlib
+import socket
+import threading
+import time
+import numpy as np
+from src.server import ServerClient, TranscriptionServer, _read_message, _write_message
+
+
+class _StubTranscriber:
+    """Interface minimale utilisee par le serveur"""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    def is_ready(self):
+        return True
+
+    def has_model(self):
+        return True
+
+    def get_error(self):
+        return None
+
+    def wait_ready(self, timeout=None):
+        return True
+
+    def acquire(self):
+        pass
+
+    def release(self):
+        pass
+
+    def iter_segments(self, audio, cancel=None):
+        if self.fail:
+            raise RuntimeError("decodage impossible")
+        yield "bonjour"
+
+
+def _serve(transcriber, address):
+    server = TranscriptionServer(transcriber, address, workers=1, queue_size=1, model_name="stub")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_unexpected_error_is_reported_to_client(tmp_path, capsys):
+    address = f"unix:{tmp_path / 'srv.sock'}"
+    server = _serve(_StubTranscriber(fail=True), address)
+    try:
+        client = ServerClient(address)
+        assert client.wait_ready(5)
+        assert client.transcribe(np.zeros(16000, dtype=np.float32)) == ""
+        assert "[Server] Erreur: erreur interne: decodage impossible" in capsys.readouterr().out
+        # Le serveur continue de servir les requetes suivantes
+        server.transcriber.fail = False
+        assert client.transcribe(np.zeros(16000, dtype=np.float32)) == "bonjour"
+    finally:
+        server.shutdown()
+        client.shutdown()
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "delai depasse"
+        time.sleep(0.05)
+
+
+def test_error_cleared_when_server_comes_back(tmp_path):
+    address = f"unix:{tmp_path / 'srv.sock'}"
+    client = ServerClient(address)
+    try:
+        assert client.wait_ready(5)
+        assert client.has_error()
+
+        server = _serve(_StubTranscriber(), address)
+        try:
+            # Verification en arriere-plan : l'etat se met a jour sans bloquer l'appelant
+            _wait_for(lambda: not client.has_error())
+            assert client.transcribe(np.zeros(16000, dtype=np.float32)) == "bonjour"
+        finally:
+            server.shutdown()
+
+        # Serveur arrete : l'echec de connexion est signale
+        assert client.transcribe(np.zeros(16000, dtype=np.float32)) == ""
+        assert client.has_error()
+    finally:
+        client.shutdown()
+
+
+def test_client_waits_for_server_model_without_polling(tmp_path):
+    class LoadingTranscriber(_StubTranscriber):
+        loaded = threading.Event()
+
+        def wait_ready(self, timeout=None):
+            return self.loaded.wait(timeout)
+
+        def is_ready(self):
+            return self.loaded.is_set()
+
+    address = f"unix:{tmp_path / 'srv.sock'}"
+    transcriber = LoadingTranscriber()
+    server = _serve(transcriber, address)
+    client = ServerClient(address)
+    try:
+        assert not client.wait_ready(0.3)
+        transcriber.loaded.set()
+        assert client.wait_ready(5)
+        assert client.has_model() and not client.has_error()
+    finally:
+        server.shutdown()
+        client.shutdown()
+
+
+@contextlib.contextmanager
+def _connect(server):
+    with socket.socket(socket.AF_UNIX) as sock:
+        sock.settimeout(5)
+        sock.connect(server.address)
+        with sock.makefile("rwb") as stream:
+            yield sock, stream
+
+
+def test_oversized_header_rejected_before_reading(tmp_path):
+    address = f"unix:{tmp_path / 'srv.sock'}"
+    server = _serve(_StubTranscriber(), address)
+    try:
+        # Taux et canaux hors limites : refus sans attendre le corps annonce
+        with _connect(server) as (sock, stream):
+            _write_message(stream, {"command": "transcribe", "sample_rate": 192000,
+                                    "channels": 8, "length": 5 * 1024 ** 3})
+            assert "non supporte" in _read_message(stream)["error"]
+
+        # Corps interrompu : la place d'admission est rendue
+        with _connect(server) as (sock, stream):
+            _write_message(stream, {"command": "transcribe", "length": 32000})
+            stream.write(b"\0" * 100)
+            stream.flush()
+        deadline = time.monotonic() + 5
+        while server.status()["running"] + server.status()["queued"]:
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+
+        client = ServerClient(address)
+        assert client.transcribe(np.zeros(16000, dtype=np.float32)) == "bonjour"
+    finally:
+        server.shutdown()
+
+
+def test_has_error_does_not_block_on_probe(tmp_path):
+    address = f"unix:{tmp_path / 'srv.sock'}"
+    client = ServerClient(address)
+    assert client.wait_ready(5)
+
+    probing = threading.Event()
+    release = threading.Event()
+
+    def slow_status(wait=False):
+        probing.set()
+        release.wait(5)
+        raise ConnectionRefusedError("toujours injoignable")
+
+    client.status = slow_status
+    start = time.monotonic()
+    assert client.has_error()
+    assert client.has_error()
+    assert time.monotonic() - start < 0.5
+    assert probing.wait(1)
+    release.set()
@@ -0,0 +1,68 @@
+import time
+from collections import namedtuple
+import numpy as np
+from src.config import SAMPLE_RATE
+from src.transcriber import StreamingSession
+
+Segment = namedtuple("Segment", "start end text")
+
+
+class _PositionTranscriber:
+    """Un segment par 2 s ; le texte est la seconde absolue lue dans l'audio"""
+
+    def __init__(self):
+        self.calls = []
+
+    def _wait_model(self):
+        return True
+
+    def _decode(self, window, initial_prompt=None, **options):
+        self.calls.append((int(window[0]), initial_prompt, options))
+        seconds = len(window) // SAMPLE_RATE
+        return (Segment(t, t + 2, f" s{int(window[t * SAMPLE_RATE])}")
+                for t in range(0, seconds - 1, 2))
+
+
+def _recording(seconds: int) -> np.ndarray:
+    """Chaque echantillon vaut l'indice de sa seconde"""
+    return np.repeat(np.arange(seconds, dtype=np.float32), SAMPLE_RATE)
+
+
+def test_windows_commit_each_segment_once():
+    transcriber = _PositionTranscriber()
+    session = StreamingSession(transcriber, window=4, commit_margin=1)
+    audio = _recording(11)
+    for start in range(0, len(audio), SAMPLE_RATE):
+        session.feed(audio[start:start + SAMPLE_RATE])
+        time.sleep(0.05)
+
+    # Des fenetres intermediaires ont ete validees pendant l'enregistrement
+    intermediate = [call for call in transcriber.calls if call[2].get("without_timestamps") is False]
+    assert len(intermediate) >= 2
+    starts = [start for start, _, _ in intermediate]
+    assert starts == sorted(set(starts))
+
+    # Chevauchement sans doublon ni trou : chaque segment une seule fois, dans l'ordre
+    assert session.finish() == "s0 s2 s4 s6 s8"
+    # Chaque fenetre repart du dernier segment valide, avec le texte deja valide en contexte
+    for start, prompt, _ in transcriber.calls:
+        assert prompt == (" ".join(f"s{i}" for i in range(0, start, 2)) or None)
+
+
+def test_finish_without_intermediate_window():
+    transcriber = _PositionTranscriber()
+    session = StreamingSession(transcriber, window=30, commit_margin=1)
+    audio = _recording(5)
+    session.feed(audio)
+    assert session.finish(audio) == "s0 s2"
+    assert len(transcriber.calls) == 1 and transcriber.calls[0][1] is None
+
+
+def test_cancel_skips_tail():
+    transcriber = _PositionTranscriber()
+    session = StreamingSession(transcriber, window=30, commit_margin=1)
+    session.feed(_recording(5))
+    session.cancel()
+    session._thread.join(1)
+    assert not session._thread.is_alive()
+    assert transcriber.calls == []
@@ -0,0 +1,141 @@
+import threading
+import time
+import numpy as np
+from src.model_pool import ModelPool
+from src.settings import Settings
+from src.transcriber import Transcriber
+import src.transcriber as transcriber_module
+
+
+def _transcriber(**values):
+    settings = Settings()
+    settings.set("model_warmup", False)
+    for key, value in values.items():
+        settings.set(key, value)
+    transcriber = Transcriber(settings)
+    assert transcriber.wait_ready(10)
+    return settings, transcriber
+
+
+def test_keep_warm_timer_only_when_enabled(settings_dir, fake_whisper):
+    settings, transcriber = _transcriber(keep_warm=False)
+    try:
+        assert transcriber._keep_warm_timer is None
+
+        settings.set("keep_warm", True)
+        settings.set("keep_warm_interval", 1)
+        transcriber.switch_model(settings)
+        assert transcriber._keep_warm_timer is not None
+
+        warmed = threading.Event()
+        transcriber._warmup = lambda model: warmed.set()
+        transcriber._last_used = time.monotonic() - 5
+        assert warmed.wait(3)
+
+        settings.set("keep_warm", False)
+        transcriber.switch_model(settings)
+        assert transcriber._keep_warm_timer is None
+    finally:
+        transcriber.shutdown()
+
+
+def test_memory_relocked_after_each_load(settings_dir, fake_whisper, monkeypatch):
+    calls = []
+    monkeypatch.setattr(transcriber_module, "lock_resident_memory", lambda: calls.append("lock") or True)
+    monkeypatch.setattr(transcriber_module, "unlock_resident_memory", lambda: calls.append("unlock"))
+    settings, transcriber = _transcriber(lock_model_memory=True, whisper_model="tiny")
+    try:
+        assert calls == ["lock"]
+        settings.set("whisper_model", "base")
+        assert transcriber.switch_model(settings)
+        deadline = time.monotonic() + 5
+        while transcriber._model_name != "base" or len(calls) < 3:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        # Deverrouille avant le changement, reverrouille une fois le nouveau modele charge
+        assert calls == ["lock", "unlock", "lock"]
+    finally:
+        transcriber.shutdown()
+
+
+def test_thread_count_change_does_not_reload(settings_dir, fake_whisper):
+    from src.config import DECODING_PROFILES
+    profiles = [name for name in DECODING_PROFILES]
+    first = profiles[0]
+    other = next(name for name in profiles
+                 if DECODING_PROFILES[name]["cpu_threads"] != DECODING_PROFILES[first]["cpu_threads"])
+    settings, transcriber = _transcriber(decoding_profile=first, whisper_model="tiny")
+    try:
+        model = transcriber.model
+        settings.set("decoding_profile", other)
+        assert not transcriber.switch_model(settings)
+        assert transcriber.model is model
+
+        # Le nouveau nombre de threads s'applique au prochain chargement
+        settings.set("whisper_model", "base")
+        assert transcriber.switch_model(settings)
+        deadline = time.monotonic() + 5
+        while transcriber.model is model:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        assert transcriber.model.cpu_threads == DECODING_PROFILES[other]["cpu_threads"]
+    finally:
+        transcriber.shutdown()
+
+
+def test_profile_threads_apply_at_next_load(settings_dir, fake_whisper, capsys):
+    from src.config import DECODING_PROFILES
+    first = next(iter(DECODING_PROFILES))
+    other = next(name for name in DECODING_PROFILES
+                 if DECODING_PROFILES[name]["cpu_threads"] != DECODING_PROFILES[first]["cpu_threads"])
+    threads = DECODING_PROFILES[other]["cpu_threads"]
+    settings, transcriber = _transcriber(decoding_profile=first, whisper_model="tiny")
+    try:
+        # Modele en memoire : il garde ses threads, l'ecart est signale
+        settings.set("decoding_profile", other)
+        assert not transcriber.switch_model(settings)
+        assert transcriber.model.cpu_threads == DECODING_PROFILES[first]["cpu_threads"]
+        assert "s'appliqueront au prochain chargement" in capsys.readouterr().out
+
+        # Prochain chargement depuis le disque (apres dechargement) : threads du profil
+        transcriber._unload_delay = 0.01
+        transcriber._last_used = 0
+        transcriber._unload_if_idle()
+        transcriber.acquire()
+        assert transcriber.wait_ready(10)
+        assert transcriber.model.cpu_threads == threads
+        assert transcriber._pool.loaded_threads(transcriber._key()) == threads
+        transcriber.release()
+    finally:
+        transcriber.shutdown()
+
+
+def test_dictation_waits_for_model_loading(settings_dir, fake_whisper, monkeypatch):
+    loading = threading.Event()
+    load = ModelPool._load
+
+    def slow_load(pool, key, cpu_threads):
+        loading.wait(5)
+        return load(pool, key, cpu_threads)
+
+    monkeypatch.setattr(ModelPool, "_load", slow_load)
+    settings = Settings()
+    settings.set("model_warmup", False)
+    settings.set("whisper_model", "tiny")
+    transcriber = Transcriber(settings)
+    try:
+        assert not transcriber.is_ready()
+        result = []
+        audio = np.zeros(16000 * 2, dtype=np.float32)
+        job = threading.Thread(target=lambda: result.append(transcriber.transcribe(audio)))
+        job.start()
+
+        # Dictee arretee pendant le chargement : elle attend le modele au lieu d'etre perdue
+        job.join(0.3)
+        assert job.is_alive() and result == []
+        loading.set()
+        job.join(5)
+        assert result == ["w0@tiny"]
+    finally:
+        loading.set()
+        transcriber.shutdown()
@@ -0,0 +1,85 @@
+import time
+import numpy as np
+from src.settings import Settings
+from src.transcriber_process import TranscriberProcess
+
+
+def _wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "delai depasse"
+        time.sleep(0.05)
+
+
+def test_dictation_after_worker_crash(settings_dir, fake_whisper):
+    settings = Settings()
+    settings.set("model_warmup", False)
+    settings.set("whisper_model", "tiny")
+    transcriber = TranscriberProcess(settings)
+    try:
+        assert transcriber.wait_ready(30)
+        assert transcriber.has_model()
+        audio = np.zeros(16000 * 4, dtype=np.float32)
+        assert list(transcriber.iter_segments(audio)) == ["w0@tiny", "w1@tiny"]
+
+        crashed = transcriber._worker
+        crashed.process.kill()
+        _wait_for(lambda: crashed.crashed)
+
+        # Un plantage n'est pas une erreur de chargement : le hotkey n'est pas bloque
+        assert not transcriber.has_error()
+
+        # Appui suivant : acquire() relance le processus, la dictee est transcrite
+        transcriber.acquire()
+        assert transcriber._worker is not crashed
+        assert list(transcriber.iter_segments(audio)) == ["w0@tiny", "w1@tiny"]
+        assert transcriber.wait_ready(30) and transcriber.has_model()
+        transcriber.release()
+    finally:
+        transcriber.shutdown()
+
+
+def test_idle_unload_stops_worker_process(settings_dir, fake_whisper):
+    settings = Settings()
+    settings.set("model_warmup", False)
+    settings.set("whisper_model", "tiny")
+    settings.set("model_unload_delay", 1)
+    transcriber = TranscriberProcess(settings)
+    try:
+        assert transcriber.wait_ready(30)
+        idle = transcriber._worker
+        # Le processus est arrete : toute sa memoire est rendue au systeme
+        _wait_for(lambda: not idle.process.is_alive())
+        assert idle.retired and not idle.crashed
+        assert not transcriber.has_error()
+
+        transcriber.acquire()
+        assert transcriber._worker is not idle
+        audio = np.zeros(16000 * 2, dtype=np.float32)
+        assert list(transcriber.iter_segments(audio)) == ["w0@tiny"]
+        transcriber.release()
+    finally:
+        transcriber.shutdown()
+
+
+def test_settings_reach_pending_worker(settings_dir, fake_whisper):
+    settings = Settings()
+    settings.set("model_warmup", False)
+    settings.set("whisper_model", "tiny")
+    transcriber = TranscriberProcess(settings)
+    try:
+        settings.set("whisper_model", "base")
+        assert transcriber.switch_model(settings)
+        pending, active, sent = transcriber._pending, transcriber._worker, []
+        for worker in (pending, active):
+            send = worker.send
+            worker.send = lambda *message, worker=worker, send=send: (
+                sent.append((worker, message)) or send(*message))
+
+        # Meme modele que le processus en chargement : c'est lui qui recoit les options
+        settings.set("language", "en")
+        assert not transcriber.switch_model(settings)
+        assert [(worker, message[0]) for worker, message in sent] == [(pending, "settings")]
+        assert sent[0][1][1]["language"] == "en"
+    finally:
+        transcriber.shutdown()
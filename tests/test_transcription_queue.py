@@ -0,0 +1,57 @@
+import threading
+from src.transcription_queue import TranscriptionQueue
+
+
+def test_jobs_handled_in_submission_order():
+    handled = []
+    gate = threading.Event()
+
+    def handler(job):
+        gate.wait(5)
+        if job.audio == "boom":
+            raise RuntimeError("dictee invalide")
+        handled.append(job.audio)
+
+    jobs = TranscriptionQueue(handler)
+    for audio in ("un", "boom", "deux", "trois"):
+        jobs.submit(jobs.create_job(audio, 1.0))
+    assert jobs.depth == 4
+
+    gate.set()
+    jobs.stop()
+    jobs._thread.join(5)
+    # Une erreur n'interrompt pas la file ; l'ordre de soumission est conserve
+    assert handled == ["un", "deux", "trois"]
+    assert jobs.depth == 0
+
+
+def test_cancel_all_reaches_current_and_waiting_jobs():
+    started = threading.Event()
+    outcomes = []
+
+    def handler(job):
+        if job.audio == "en cours":
+            started.set()
+            # Dictee en cours : s'arrete des que l'annulation est demandee
+            outcomes.append((job.audio, job.cancel_token.wait(5)))
+        else:
+            outcomes.append((job.audio, job.cancel_token.is_set()))
+
+    jobs = TranscriptionQueue(handler)
+    first = jobs.create_job("en cours", 1.0)
+    waiting = jobs.create_job("en attente", 1.0)
+    jobs.submit(first)
+    jobs.submit(waiting)
+    assert started.wait(5)
+
+    assert jobs.cancel_all() == 2
+    assert jobs.cancel_all() == 0  # Deja annulees
+    jobs.stop()
+    jobs._thread.join(5)
+    assert outcomes == [("en cours", True), ("en attente", True)]
+    assert first.cancel_token.requested_at is not None
+
+    # Les dictees soumises ensuite ne sont pas touchees
+    later = jobs.create_job("apres", 1.0)
+    assert not later.cancel_token.is_set()
+    assert later.id > waiting.id
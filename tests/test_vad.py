@@ -0,0 +1,63 @@
+import numpy as np
+from src.config import SAMPLE_RATE, VAD_FRAME_MS, VAD_PAD_MS
+from src.vad import EnergyVAD
+
+
+def _speech_with_pauses(length: int) -> np.ndarray:
+    """Bruit faible, deux rafales de parole separees par une longue pause"""
+    rng = np.random.default_rng(0)
+    audio = (0.001 * rng.standard_normal(length)).astype(np.float32)
+    t = np.arange(length) / SAMPLE_RATE
+    tone = (0.2 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    for start, end in ((1.0, 2.0), (4.0, 5.5)):
+        audio[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)] += tone[:int((end - start) * SAMPLE_RATE)]
+    return audio
+
+
+def _reference(vad: EnergyVAD, audio: np.ndarray) -> np.ndarray:
+    """Ancien decoupage par masque par echantillon"""
+    speech = np.concatenate(vad._levels) > vad._threshold(np.concatenate(vad._levels))
+    pad = int(VAD_PAD_MS / VAD_FRAME_MS)
+    keep = np.convolve(speech.astype(np.float32), np.ones(2 * pad + 1), mode="same") > 0
+    n_frames = min(len(keep), -(-len(audio) // vad.frame))
+    mask = np.repeat(keep[:n_frames], vad.frame)[:len(audio)]
+    if len(mask) < len(audio):
+        mask = np.concatenate((mask, np.full(len(audio) - len(mask), keep[n_frames - 1])))
+    return audio[mask]
+
+
+def _fed_vad(audio: np.ndarray) -> EnergyVAD:
+    vad = EnergyVAD()
+    for start in range(0, len(audio), 1234):
+        vad.feed(audio[start:start + 1234])
+    return vad
+
+
+def test_trim_matches_sample_mask():
+    audio = _speech_with_pauses(int(6.5 * SAMPLE_RATE) + 77)
+    vad = _fed_vad(audio)
+    expected = _reference(vad, audio)
+    trimmed = vad.apply(audio)
+    np.testing.assert_array_equal(trimmed, expected)
+    assert len(trimmed) < len(audio)
+    assert vad.leading_silence > 0
+
+
+def test_spilled_buffer_is_sliced(tmp_path):
+    audio = _speech_with_pauses(int(6.5 * SAMPLE_RATE))
+    spilled = np.memmap(tmp_path / "recording-1.f32", dtype=np.float32, mode="w+", shape=audio.shape)
+    spilled[:] = audio
+    vad = _fed_vad(audio)
+    trimmed = vad.apply(spilled)
+    # Audio garde ecrit sur disque, pas recharge en memoire
+    assert isinstance(trimmed, np.memmap)
+    assert trimmed.filename != spilled.filename
+    np.testing.assert_array_equal(trimmed, _reference(_fed_vad(audio), audio))
+
+
+def test_continuous_speech_is_returned_without_copy(tmp_path):
+    t = np.arange(3 * SAMPLE_RATE) / SAMPLE_RATE
+    audio = (0.2 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    spilled = np.memmap(tmp_path / "recording-1.f32", dtype=np.float32, mode="w+", shape=audio.shape)
+    spilled[:] = audio
+    assert _fed_vad(audio).apply(spilled) is spilled
@@ -0,0 +1,42 @@
+from collections import namedtuple
+from src.watchdog import DecodingWatchdog
+
+Segment = namedtuple("Segment", "start end text")
+
+
+def _segments(*items):
+    for start, end, text in items:
+        yield Segment(start, end, text)
+
+
+def _texts(segments):
+    return [segment.text for segment in DecodingWatchdog().filter(segments)]
+
+
+def test_spoken_repeats_are_kept():
+    texts = _texts(_segments((0.0, 0.6, "oui."), (0.8, 1.4, "oui."), (1.6, 2.2, "oui."),
+                             (2.4, 3.0, "oui."), (3.5, 5.0, "c'est bien ca.")))
+    assert texts == ["oui.", "oui.", "oui.", "oui.", "c'est bien ca."]
+
+
+def test_stalled_repeats_skipped_and_decoding_resumes():
+    texts = _texts(_segments((0.0, 2.0, "Merci d'avoir regarde."),
+                             (0.0, 2.0, "Merci d'avoir regarde."),
+                             (0.0, 2.0, "Merci d'avoir regarde."),
+                             (30.0, 32.0, "La suite de la dictee.")))
+    assert texts == ["Merci d'avoir regarde.", "La suite de la dictee."]
+
+
+def test_persistent_loop_stops_decoding():
+    closed = []
+
+    def looping():
+        try:
+            yield Segment(0.0, 2.0, "bonjour")
+            while True:
+                yield Segment(0.0, 2.0, "bonjour")
+        finally:
+            closed.append(True)
+
+    assert _texts(looping()) == ["bonjour"]
+    assert closed == [True]